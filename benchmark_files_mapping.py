@@ -0,0 +1,178 @@
+"""Benchmark of source file discovery on a synthetic tree.
+
+Tree with given number of files is created in a temporary directory.
+Part of the tree is ignored by 'IGNORE_PATTERNS' ('__pycache__' folders,
+'.pyc' files and dot files). Walker of 'create_package.py' is compared
+with 'os.listdir' based walker which was used before. Time to the first
+file shows how soon following stages of packaging can start.
+
+Usage:
+    python benchmark_files_mapping.py --files 100000 --samples 5
+"""
+import os
+import re
+import time
+import argparse
+import tempfile
+import statistics
+import collections
+from typing import Callable, Dict, List, Pattern, Tuple
+
+import create_package
+
+FILES_PER_DIR: int = 100
+DIRS_PER_DIR: int = 10
+
+LEGACY_IGNORE_DIR_PATTERNS: List[Pattern] = [
+    re.compile(r"^\."),
+    re.compile("^__pycache__$"),
+]
+LEGACY_IGNORE_FILE_PATTERNS: List[Pattern] = [
+    re.compile(r"^\."),
+    re.compile(r"\.pyc$"),
+]
+
+
+def legacy_find_files_in_subdir(src_path: str) -> List[Tuple[str, str]]:
+    """Walker of previous versions using 'os.listdir' and 'os.path.isfile'.
+    """
+    output: List[Tuple[str, str]] = []
+    hierarchy_queue: collections.deque = collections.deque()
+    hierarchy_queue.append((src_path, []))
+    while hierarchy_queue:
+        dirpath, parents = hierarchy_queue.popleft()
+        for name in os.listdir(dirpath):
+            path: str = os.path.join(dirpath, name)
+            if os.path.isfile(path):
+                if not any(
+                    regex.search(name)
+                    for regex in LEGACY_IGNORE_FILE_PATTERNS
+                ):
+                    items: List[str] = list(parents)
+                    items.append(name)
+                    output.append((path, os.path.sep.join(items)))
+                continue
+
+            if not any(
+                regex.search(name)
+                for regex in LEGACY_IGNORE_DIR_PATTERNS
+            ):
+                items = list(parents)
+                items.append(name)
+                hierarchy_queue.append((path, items))
+    return output
+
+
+def create_tree(root: str, files_count: int) -> int:
+    """Create synthetic source tree.
+
+    Every tenth file is ignored by patterns.
+
+    Args:
+        root (str): Directory where tree is created.
+        files_count (int): Number of created files.
+
+    Returns:
+        int: Number of files which are not ignored.
+
+    """
+    expected = 0
+    dir_idx = 0
+    created = 0
+    while created < files_count:
+        # Nested directories, e.g. 'd3/d31/d312'
+        parts = []
+        value = dir_idx
+        while True:
+            parts.append(f"d{value}")
+            value //= DIRS_PER_DIR
+            if not value:
+                break
+        dirpath = os.path.join(root, *reversed(parts))
+        os.makedirs(dirpath, exist_ok=True)
+        for file_idx in range(min(FILES_PER_DIR, files_count - created)):
+            ignored = file_idx % 10 == 9
+            if not ignored:
+                filename = f"module_{file_idx}.py"
+                expected += 1
+            elif file_idx % 20 == 9:
+                filename = f".hidden_{file_idx}"
+            else:
+                os.makedirs(
+                    os.path.join(dirpath, "__pycache__"), exist_ok=True
+                )
+                filename = os.path.join(
+                    "__pycache__", f"module_{file_idx}.pyc"
+                )
+            with open(os.path.join(dirpath, filename), "wb"):
+                pass
+            created += 1
+        dir_idx += 1
+    return expected
+
+
+def _first_file(src_path: str) -> List[Tuple[str, str]]:
+    return [next(create_package.iter_files_in_subdir(src_path))]
+
+
+def measure(
+    func: Callable[[str], List[Tuple[str, str]]],
+    src_path: str,
+    samples: int,
+) -> Tuple[List[float], int]:
+    durations = []
+    count = 0
+    for _ in range(samples):
+        start = time.perf_counter()
+        count = len(func(src_path))
+        durations.append(time.perf_counter() - start)
+    return durations, count
+
+
+def main(files_count: int, samples: int):
+    with tempfile.TemporaryDirectory(prefix="ayon_ocio_bench") as tmp_dir:
+        start = time.perf_counter()
+        expected = create_tree(tmp_dir, files_count)
+        print(
+            f"Created {files_count} files in"
+            f" {time.perf_counter() - start:.2f}s,"
+            f" {expected} are not ignored"
+        )
+
+        walkers: Dict[str, Callable[[str], List[Tuple[str, str]]]] = {
+            "listdir (legacy)": legacy_find_files_in_subdir,
+            "scandir": create_package.find_files_in_subdir,
+            "scandir first file": _first_file,
+        }
+        # Warm up file system cache so walkers are compared equally
+        legacy_find_files_in_subdir(tmp_dir)
+        for label, func in walkers.items():
+            durations, count = measure(func, tmp_dir, samples)
+            if func is not _first_file and count != expected:
+                raise RuntimeError(
+                    f"Walker '{label}' found {count} files,"
+                    f" expected {expected}."
+                )
+            print(
+                f"{label:<20}"
+                f" median {statistics.median(durations) * 1000:9.2f} ms"
+                f"  min {min(durations) * 1000:9.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--files",
+        type=int,
+        default=100000,
+        help="Number of files in synthetic tree.",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=5,
+        help="Number of measured walks of each walker.",
+    )
+    args = parser.parse_args()
+    main(args.files, args.samples)
@@ -0,0 +1,187 @@
+"""Benchmark of legacy OCIO configs shipped exploded and as '.ocioz'.
+
+Legacy OCIO configs zip is downloaded the same way as by
+'create_package.py' and both layouts are written to client archives.
+Script compares file count, size of archive, time to extract it and time
+to load every config with PyOpenColorIO. Loading creates processor of
+each colorspace, so referenced LUT files are read. Load time is skipped
+when PyOpenColorIO 2.2+ is not available.
+
+Use '--target-dir' to extract to network storage, where per-file
+metadata operations are the most expensive, and '--ocio-zip' to use
+already downloaded configs zip.
+
+Usage:
+    python benchmark_only_client.py --samples 3 --target-dir /mnt/nfs/tmp
+"""
+import os
+import time
+import shutil
+import logging
+import zipfile
+import argparse
+import tempfile
+import statistics
+from typing import Callable, Dict, List, Optional
+
+import create_package
+
+log = logging.getLogger("benchmark_only_client")
+
+
+def get_ocio_zip_path() -> str:
+    """Download legacy OCIO configs zip if not downloaded yet."""
+    filepath = os.path.join(
+        create_package.DOWNLOADS_ROOT, create_package.OCIO_CONFIGS_FILENAME
+    )
+    os.makedirs(create_package.DOWNLOADS_ROOT, exist_ok=True)
+    checksum_cache = create_package.ChecksumCache()
+    try:
+        create_package.ensure_downloaded(
+            create_package.OCIO_CONFIGS_URL,
+            filepath,
+            create_package.OCIO_CONFIGS_CHECKSUM,
+            checksum_cache,
+            log,
+            create_package.get_download_cache(),
+        )
+    finally:
+        checksum_cache.save()
+    return filepath
+
+
+def create_client_archive(
+    ocio_zip_path: str, use_ocioz: bool, dst_path: str
+) -> int:
+    """Write legacy configs of one layout to client archive.
+
+    Returns:
+        int: Number of files in archive.
+
+    """
+    mapping = create_package._iter_ocio_zip_mapping(
+        ocio_zip_path, log, use_ocioz=use_ocioz
+    )
+    with create_package.ZipFileLongPaths(
+        dst_path, "w", zipfile.ZIP_DEFLATED
+    ) as zipf:
+        create_package.write_files_mapping(zipf, mapping)
+        return len(zipf.infolist())
+
+
+def _get_config_paths(root: str, use_ocioz: bool) -> List[str]:
+    ext = ".ocioz" if use_ocioz else ".ocio"
+    return sorted(
+        os.path.join(dirpath, filename)
+        for dirpath, _, filenames in os.walk(root)
+        for filename in filenames
+        if filename.endswith(ext)
+    )
+
+
+def load_configs(ocio, config_paths: List[str]):
+    """Load configs and create processor of each colorspace."""
+    ocio.ClearAllCaches()
+    for path in config_paths:
+        config = ocio.Config.CreateFromFile(path)
+        for colorspace in config.getColorSpaceNames():
+            try:
+                config.getProcessor(colorspace, ocio.ROLE_SCENE_LINEAR)
+            except ocio.Exception:
+                # Some legacy colorspaces have no transform to reference
+                pass
+
+
+def _measure(func: Callable[[], None], samples: int) -> List[float]:
+    durations = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def _format_durations(durations: List[float]) -> str:
+    return (
+        f"median {statistics.median(durations):7.3f}s"
+        f"  min {min(durations):7.3f}s"
+    )
+
+
+def _get_ocio():
+    try:
+        import PyOpenColorIO as ocio
+    except ImportError:
+        return None
+    major, minor = (int(part) for part in ocio.__version__.split(".")[:2])
+    if (major, minor) < (2, 2):
+        return None
+    return ocio
+
+
+def main(
+    samples: int,
+    target_dir: Optional[str],
+    ocio_zip_path: Optional[str] = None,
+):
+    if ocio_zip_path is None:
+        ocio_zip_path = get_ocio_zip_path()
+    ocio = _get_ocio()
+    if ocio is None:
+        print("PyOpenColorIO 2.2+ is not available, load time is skipped")
+
+    with tempfile.TemporaryDirectory(
+        prefix="ayon_ocio_bench", dir=target_dir
+    ) as tmp_dir:
+        for label, use_ocioz in (("exploded", False), ("ocioz", True)):
+            archive_path = os.path.join(tmp_dir, f"{label}.zip")
+            files_count = create_client_archive(
+                ocio_zip_path, use_ocioz, archive_path
+            )
+            extract_dir = os.path.join(tmp_dir, label)
+
+            def _extract():
+                if os.path.exists(extract_dir):
+                    shutil.rmtree(extract_dir)
+                with zipfile.ZipFile(archive_path) as zipf:
+                    zipf.extractall(extract_dir)
+
+            results: Dict[str, str] = {
+                "files": str(files_count),
+                "archive": create_package._format_size(
+                    os.path.getsize(archive_path)
+                ),
+                "extract": _format_durations(_measure(_extract, samples)),
+            }
+            if ocio is not None:
+                config_paths = _get_config_paths(extract_dir, use_ocioz)
+                results["load"] = _format_durations(_measure(
+                    lambda: load_configs(ocio, config_paths), samples
+                ))
+
+            print(f"{label}:")
+            for key, value in results.items():
+                print(f"    {key:<8} {value}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=3,
+        help="Number of measured extractions and loads of each layout.",
+    )
+    parser.add_argument(
+        "--target-dir",
+        default=None,
+        help="Directory where archives are extracted, e.g. on NFS share.",
+    )
+    parser.add_argument(
+        "--ocio-zip",
+        default=None,
+        help="Path to legacy OCIO configs zip, downloaded if not set.",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    main(args.samples, args.target_dir, args.ocio_zip)
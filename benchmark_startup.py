@@ -0,0 +1,75 @@
+"""Benchmark of addon import and environment resolution.
+
+Each sample runs in a new Python process, so import of addon is measured
+without modules cached in 'sys.modules'. Client code is imported from
+'client' folder of this repository and 'ayon_core' must be importable,
+e.g. run the script with Python of AYON launcher.
+
+Usage:
+    python benchmark_startup.py --samples 20
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List
+
+CURRENT_ROOT: str = os.path.dirname(os.path.abspath(__file__))
+CLIENT_ROOT: str = os.path.join(CURRENT_ROOT, "client")
+
+SAMPLE_SCRIPT: str = """
+import json
+import time
+
+start = time.perf_counter()
+import ayon_ocio
+imported = time.perf_counter()
+addon = ayon_ocio.OCIODistAddon()
+addon.get_global_environments()
+resolved = time.perf_counter()
+addon.get_global_environments()
+memoized = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "first_resolve": resolved - imported,
+    "memoized_resolve": memoized - resolved,
+}))
+"""
+
+
+def run_sample() -> Dict[str, float]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (CLIENT_ROOT, env.get("PYTHONPATH")) if path
+    )
+    output = subprocess.check_output(
+        [sys.executable, "-c", SAMPLE_SCRIPT], env=env
+    )
+    return json.loads(output.decode("utf-8").strip().splitlines()[-1])
+
+
+def main(samples: int):
+    results: Dict[str, List[float]] = {}
+    for _ in range(samples):
+        for key, value in run_sample().items():
+            results.setdefault(key, []).append(value)
+
+    for key, values in results.items():
+        print(
+            f"{key:<18} median {statistics.median(values) * 1000:8.3f} ms"
+            f"  min {min(values) * 1000:8.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=20,
+        help="Number of measured processes.",
+    )
+    args = parser.parse_args()
+    main(args.samples)
@@ -1,13 +1,46 @@
 from __future__ import annotations
 
-import os
+import importlib
+from typing import Any, Optional
 
 from ayon_core.addon import AYONAddon
 
 from .version import __version__
 
-CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
-CONFIG_ROOT = os.path.join(CURRENT_DIR, "configs")
+# Attributes imported from submodules on first access, so import of addon
+#   does not load submodules or touch filesystem
+_LAZY_ATTRIBUTES = {
+    "CURRENT_DIR": ".distribution",
+    "CONFIG_ROOT": ".distribution",
+    "resolve_config_path": ".distribution",
+
+    "get_configs_catalog": ".catalog",
+    "get_configs": ".catalog",
+    "find_config": ".catalog",
+    "get_config_info": ".catalog",
+    "has_colorspace": ".catalog",
+
+    "OCIOConfig": ".config",
+    "load_config": ".config",
+
+    "is_config_install_healthy": ".integrity",
+    "verify_config_install": ".integrity",
+    "maintain_config_install": ".integrity",
+}
+# Values resolved once per process
+_process_cache: dict[str, Any] = {}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(
+            f"module '{__name__}' has no attribute '{name}'"
+        )
+    module = importlib.import_module(module_name, __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
 
 
 class OCIODistAddon(AYONAddon):
@@ -22,23 +55,87 @@ class OCIODistAddon(AYONAddon):
     version = __version__
 
     def get_global_environments(self) -> dict[str, str]:
-        return {
-            "BUILTIN_OCIO_ROOT": self.get_ocio_config_dir()
-        }
+        """Environments of addon, resolved only once per process.
+
+        Returns:
+            dict[str, str]: Environment variables.
+        """
+        environments = _process_cache.get("environments")
+        if environments is None:
+            environments = {
+                "BUILTIN_OCIO_ROOT": self.get_ocio_config_dir()
+            }
+            _process_cache["environments"] = environments
+        return dict(environments)
 
     @classmethod
     def get_ocio_config_dir(cls) -> str:
-        """Get OCIO config dir and download then if are not available.
+        """Get OCIO config dir.
+
+        Nothing is downloaded or installed, configs are installed when they
+        are requested with 'get_ocio_config_path', paths resolved from
+        templates using 'BUILTIN_OCIO_ROOT' are installed with
+        'resolve_config_path'. Only stamps of installed bundles are
+        checked. Maintenance runs in background thread if needed, it
+        removes outdated bundles, reinstalls broken bundles and installs
+        bundles defined by 'AYON_OCIO_PREFETCH_BUNDLES'.
 
         Returns:
             str: Path to OCIO config directory.
         """
 
-        return os.path.join(
-            CONFIG_ROOT,
-            "OpenColorIOConfigs"
-        )
+        config_dir = _process_cache.get("config_dir")
+        if config_dir is None:
+            from .distribution import CONFIGS_DIR
+            from .integrity import (
+                needs_config_maintenance,
+                start_config_maintenance,
+            )
+
+            if needs_config_maintenance():
+                start_config_maintenance()
+            config_dir = CONFIGS_DIR
+            _process_cache["config_dir"] = config_dir
+        return config_dir
+
+    @classmethod
+    def get_ocio_config_path(cls, config_subpath: str) -> str:
+        """Get path to OCIO config and download it if is not available.
+
+        Args:
+            config_subpath (str): Path relative to OCIO config directory,
+                e.g. 'aces_1.3/studio-config.ocio'.
+
+        Returns:
+            str: Path to OCIO config.
+        """
+
+        from .distribution import get_config_path
+
+        return get_config_path(config_subpath)
+
+
+def get_ocio_config_path(config_subpath: Optional[str] = None) -> str:
+    if config_subpath is None:
+        return OCIODistAddon.get_ocio_config_dir()
+    return OCIODistAddon.get_ocio_config_path(config_subpath)
+
+
+__all__ = (
+    "OCIODistAddon",
+    "get_ocio_config_path",
+    "resolve_config_path",
+
+    "get_configs_catalog",
+    "get_configs",
+    "find_config",
+    "get_config_info",
+    "has_colorspace",
 
+    "OCIOConfig",
+    "load_config",
 
-def get_ocio_config_path() -> str:
-    return OCIODistAddon.get_ocio_config_dir()
+    "is_config_install_healthy",
+    "verify_config_install",
+    "maintain_config_install",
+)
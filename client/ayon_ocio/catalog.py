@@ -0,0 +1,167 @@
+"""Query catalog of OCIO configs distributed with the addon.
+
+Catalog is generated when addon package is created and contains path,
+OCIO profile version, ACES version, colorspaces, roles and views of
+displays of each config. Queries do not read config files, so they don't
+trigger installation of config bundles.
+"""
+from __future__ import annotations
+
+import os
+import json
+from typing import Any, Optional
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIGS_CATALOG_PATH = os.path.join(CURRENT_DIR, "configs_catalog.json")
+
+_catalog_cache: dict[str, Any] = {}
+
+
+def _version_to_tuple(version: Optional[str]) -> tuple[int, ...]:
+    if not version:
+        return ()
+    output = []
+    for part in str(version).split("."):
+        if not part.isdigit():
+            break
+        output.append(int(part))
+    return tuple(output)
+
+
+def _version_matches(version: Optional[str], requested: str) -> bool:
+    """Requested version matches version or its prefix.
+
+    Version '1.3' is matched by '1' and '1.3' but not by '1.30'.
+    """
+    requested_parts = _version_to_tuple(requested)
+    if not requested_parts:
+        return False
+    return _version_to_tuple(version)[:len(requested_parts)] == (
+        requested_parts
+    )
+
+
+def get_configs_catalog() -> dict[str, Any]:
+    """Catalog of OCIO configs.
+
+    Catalog is loaded only once per process.
+
+    Returns:
+        dict[str, Any]: Catalog data, catalog without configs is returned
+            if client code does not contain catalog.
+
+    """
+    catalog = _catalog_cache.get("catalog")
+    if catalog is None:
+        catalog = {"version": 1, "configs": []}
+        if os.path.exists(CONFIGS_CATALOG_PATH):
+            with open(CONFIGS_CATALOG_PATH, "r") as stream:
+                catalog = json.load(stream)
+        _catalog_cache["catalog"] = catalog
+    return catalog
+
+
+def get_configs(
+    aces_version: Optional[str] = None,
+    ocio_version: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """Get catalog entries of configs matching versions.
+
+    Args:
+        aces_version (Optional[str]): ACES version or its prefix e.g. '1.3'
+            or '1'.
+        ocio_version (Optional[str]): OCIO profile version or its prefix
+            e.g. '2.1' or '2'.
+
+    Returns:
+        list[dict[str, Any]]: Catalog entries of matching configs.
+
+    """
+    output = []
+    for config in get_configs_catalog()["configs"]:
+        if aces_version is not None and not _version_matches(
+            config["aces_version"], aces_version
+        ):
+            continue
+        if ocio_version is not None and not _version_matches(
+            config["ocio_profile_version"], ocio_version
+        ):
+            continue
+        output.append(config)
+    return output
+
+
+def find_config(
+    aces_version: Optional[str] = None,
+    ocio_version: Optional[str] = None,
+) -> Optional[dict[str, Any]]:
+    """Find config with highest versions matching requested versions.
+
+    Args:
+        aces_version (Optional[str]): ACES version or its prefix.
+        ocio_version (Optional[str]): OCIO profile version or its prefix.
+
+    Returns:
+        Optional[dict[str, Any]]: Catalog entry of config or None if none
+            matches.
+
+    """
+    configs = get_configs(aces_version, ocio_version)
+    if not configs:
+        return None
+    return max(
+        configs,
+        key=lambda config: (
+            _version_to_tuple(config["aces_version"]),
+            _version_to_tuple(config["ocio_profile_version"]),
+            config["path"],
+        )
+    )
+
+
+def get_config_info(config_subpath: str) -> Optional[dict[str, Any]]:
+    """Get catalog entry of config.
+
+    Args:
+        config_subpath (str): Path relative to configs dir, e.g.
+            'aces_1.3/studio-config.ocio'.
+
+    Returns:
+        Optional[dict[str, Any]]: Catalog entry or None if config is not
+            in catalog.
+
+    """
+    config_subpath = config_subpath.replace("\\", "/").strip("/")
+    for config in get_configs_catalog()["configs"]:
+        if config["path"] == config_subpath:
+            return config
+    return None
+
+
+def has_colorspace(
+    colorspace: str, config_subpath: Optional[str] = None
+) -> bool:
+    """Check if colorspace or role is available in config.
+
+    Args:
+        colorspace (str): Colorspace name or role.
+        config_subpath (Optional[str]): Path of config relative to configs
+            dir. Any config is checked if not set.
+
+    Returns:
+        bool: Colorspace is available.
+
+    """
+    if config_subpath is None:
+        configs = get_configs_catalog()["configs"]
+    else:
+        config = get_config_info(config_subpath)
+        configs = [config] if config is not None else []
+
+    for config in configs:
+        if (
+            colorspace in config["colorspaces"]
+            or colorspace in config["roles"]
+        ):
+            return True
+    return False
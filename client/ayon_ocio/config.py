@@ -0,0 +1,735 @@
+"""Parsed model of OCIO config with indexed lookups.
+
+Configs are parsed without OCIO or YAML modules. Only subset of YAML
+written by OCIO is supported, which covers block and flow collections,
+tags, quoted scalars and block scalars.
+
+Lookups of colorspaces by name, alias or role and of views of displays
+are case insensitive, same as in OCIO. Parsed configs are cached in
+memory and on disk keyed by path, size and modification time of config
+file, so a config is parsed only once until it changes.
+"""
+from __future__ import annotations
+
+import os
+import re
+import pickle
+import hashlib
+import zipfile
+import tempfile
+from typing import Any, Optional
+
+ADDON_NAME = "ayon_ocio"
+# Environment variable to override directory of parsed configs cache
+CONFIG_CACHE_ENV = "AYON_OCIO_CONFIG_CACHE_ROOT"
+# Version of cached data, change when 'OCIOConfig' changes
+CONFIG_CACHE_VERSION = 1
+OCIOZ_CONFIG_NAME = "config.ocio"
+# Display colorspace of view replaced by name of display
+USE_DISPLAY_NAME = "<USE_DISPLAY_NAME>"
+COLORSPACE_TRANSFORM_KEYS = (
+    "to_reference",
+    "from_reference",
+    "to_scene_reference",
+    "from_scene_reference",
+    "to_display_reference",
+    "from_display_reference",
+)
+_YAML_TAG_REGEX = re.compile(r"^!<(?P<tag>[^>]+)>\s*(?P<value>.*)$")
+_YAML_BLOCK_SCALAR_REGEX = re.compile(r"(?:^|:\s+|^-\s+)([|>])[-+]?$")
+
+# Parsed configs by path, size and modification time of file
+_configs_cache: dict[tuple[str, int, int], OCIOConfig] = {}
+
+
+class _YAMLLine:
+    def __init__(self, indent: int, text: str, block: Optional[str]):
+        self.indent = indent
+        self.text = text
+        self.block = block
+
+
+def _strip_comment(line: str) -> str:
+    quote = None
+    for idx, char in enumerate(line):
+        if quote is not None:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "#" and (idx == 0 or line[idx - 1] in " \t"):
+            return line[:idx]
+    return line
+
+
+def _get_flow_depth(text: str) -> int:
+    depth = 0
+    quote = None
+    for char in text:
+        if quote is not None:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+    return depth
+
+
+def _get_yaml_lines(content: str) -> list[_YAMLLine]:
+    """Split content to logical lines.
+
+    Comments and empty lines are removed, flow collections split to
+        multiple lines are joined and block scalars are collected
+        to their line.
+    """
+    raw_lines = content.splitlines()
+    output = []
+    idx = 0
+    while idx < len(raw_lines):
+        line = _strip_comment(raw_lines[idx]).rstrip()
+        idx += 1
+        text = line.strip()
+        if not text or text == "---":
+            continue
+        indent = len(line) - len(line.lstrip(" "))
+
+        block = None
+        match = _YAML_BLOCK_SCALAR_REGEX.search(text)
+        if match is not None:
+            text = text[:match.start(1)].rstrip()
+            block_lines = []
+            while idx < len(raw_lines):
+                block_line = raw_lines[idx]
+                if (
+                    block_line.strip()
+                    and len(block_line) - len(block_line.lstrip(" "))
+                    <= indent
+                ):
+                    break
+                block_lines.append(block_line)
+                idx += 1
+            while block_lines and not block_lines[-1].strip():
+                block_lines.pop()
+            block_indent = min(
+                (
+                    len(block_line) - len(block_line.lstrip(" "))
+                    for block_line in block_lines
+                    if block_line.strip()
+                ),
+                default=0
+            )
+            separator = "\n" if match.group(1) == "|" else " "
+            block = separator.join(
+                block_line[block_indent:] for block_line in block_lines
+            )
+
+        else:
+            while _get_flow_depth(text) > 0 and idx < len(raw_lines):
+                text += " " + _strip_comment(raw_lines[idx]).strip()
+                idx += 1
+
+        output.append(_YAMLLine(indent, text, block))
+    return output
+
+
+def _is_sequence_item(text: str) -> bool:
+    return text == "-" or text.startswith("- ")
+
+
+def _parse_quoted(text: str, pos: int) -> tuple[str, int]:
+    quote = text[pos]
+    pos += 1
+    chars = []
+    while pos < len(text):
+        char = text[pos]
+        if quote == '"' and char == "\\" and pos + 1 < len(text):
+            escaped = text[pos + 1]
+            chars.append({"n": "\n", "t": "\t"}.get(escaped, escaped))
+            pos += 2
+            continue
+        if char == quote:
+            if quote == "'" and text[pos + 1:pos + 2] == "'":
+                chars.append("'")
+                pos += 2
+                continue
+            return "".join(chars), pos + 1
+        chars.append(char)
+        pos += 1
+    return "".join(chars), pos
+
+
+def _skip_spaces(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos] in " \t":
+        pos += 1
+    return pos
+
+
+def _parse_flow_value(
+    text: str, pos: int, stop_chars: str
+) -> tuple[Any, int]:
+    pos = _skip_spaces(text, pos)
+    if pos >= len(text):
+        return None, pos
+
+    if text.startswith("!<", pos):
+        end = text.index(">", pos)
+        tag = text[pos + 2:end]
+        value, pos = _parse_flow_value(text, end + 1, stop_chars)
+        return _set_tag(value, tag), pos
+
+    char = text[pos]
+    if char == "[":
+        items = []
+        pos = _skip_spaces(text, pos + 1)
+        while pos < len(text) and text[pos] != "]":
+            value, pos = _parse_flow_value(text, pos, ",]")
+            items.append(value)
+            pos = _skip_spaces(text, pos)
+            if pos < len(text) and text[pos] == ",":
+                pos = _skip_spaces(text, pos + 1)
+        return items, pos + 1
+
+    if char == "{":
+        mapping = {}
+        pos = _skip_spaces(text, pos + 1)
+        while pos < len(text) and text[pos] != "}":
+            key, pos = _parse_flow_value(text, pos, ":,}")
+            pos = _skip_spaces(text, pos)
+            value = None
+            if pos < len(text) and text[pos] == ":":
+                value, pos = _parse_flow_value(text, pos + 1, ",}")
+            mapping[key] = value
+            pos = _skip_spaces(text, pos)
+            if pos < len(text) and text[pos] == ",":
+                pos = _skip_spaces(text, pos + 1)
+        return mapping, pos + 1
+
+    if char in "\"'":
+        return _parse_quoted(text, pos)
+
+    end = pos
+    while end < len(text) and text[end] not in stop_chars:
+        end += 1
+    return text[pos:end].strip(), end
+
+
+def _parse_scalar(text: str) -> Any:
+    if text[:1] in "[{\"'!":
+        return _parse_flow_value(text, 0, "")[0]
+    return text
+
+
+def _set_tag(value: Any, tag: str) -> dict[str, Any]:
+    if value is None:
+        value = {}
+    if not isinstance(value, dict):
+        value = {"_value": value}
+    value["_type"] = tag
+    return value
+
+
+def _split_key(text: str) -> Optional[tuple[str, str]]:
+    """Split mapping line to key and value."""
+    if text[:1] in "\"'":
+        key, pos = _parse_quoted(text, 0)
+        rest = text[pos:].lstrip()
+        if not rest.startswith(":"):
+            return None
+        return key, rest[1:].strip()
+
+    if text[:1] in "[{!":
+        return None
+    for match in re.finditer(":", text):
+        end = match.end()
+        if end == len(text) or text[end] in " \t":
+            return text[:match.start()].strip(), text[end:].strip()
+    return None
+
+
+def _parse_node_value(
+    lines: list[_YAMLLine],
+    idx: int,
+    parent_indent: int,
+    text: str,
+    block: Optional[str],
+) -> tuple[Any, int]:
+    """Parse value of mapping key or sequence item."""
+    if block is not None:
+        return block, idx
+
+    tag = None
+    match = _YAML_TAG_REGEX.match(text)
+    if match is not None:
+        tag = match.group("tag")
+        text = match.group("value")
+
+    if text:
+        value = _parse_scalar(text)
+    elif idx < len(lines) and (
+        lines[idx].indent > parent_indent
+        or (
+            lines[idx].indent == parent_indent
+            and _is_sequence_item(lines[idx].text)
+        )
+    ):
+        value, idx = _parse_yaml_block(lines, idx, lines[idx].indent)
+    else:
+        value = None
+
+    if tag is not None:
+        value = _set_tag(value, tag)
+    return value, idx
+
+
+def _parse_yaml_block(
+    lines: list[_YAMLLine], idx: int, indent: int
+) -> tuple[Any, int]:
+    if _is_sequence_item(lines[idx].text):
+        items = []
+        while (
+            idx < len(lines)
+            and lines[idx].indent == indent
+            and _is_sequence_item(lines[idx].text)
+        ):
+            line = lines[idx]
+            text = line.text[1:].strip()
+            if _split_key(text) is not None:
+                # Mapping starting on line of sequence item
+                item_indent = indent + len(line.text) - len(text)
+                lines[idx] = _YAMLLine(item_indent, text, line.block)
+                value, idx = _parse_yaml_block(lines, idx, item_indent)
+            else:
+                value, idx = _parse_node_value(
+                    lines, idx + 1, indent, text, line.block
+                )
+            items.append(value)
+        return items, idx
+
+    mapping = {}
+    while idx < len(lines) and lines[idx].indent == indent:
+        line = lines[idx]
+        if _is_sequence_item(line.text):
+            break
+        key_value = _split_key(line.text)
+        if key_value is None:
+            idx += 1
+            continue
+        key, text = key_value
+        mapping[key], idx = _parse_node_value(
+            lines, idx + 1, indent, text, line.block
+        )
+    return mapping, idx
+
+
+def parse_ocio_yaml(content: str) -> dict[str, Any]:
+    """Parse OCIO config content to data.
+
+    Scalars are not converted and are returned as strings. Tagged nodes
+        are dictionaries with tag name under '_type' key, value of tagged
+        node which is not mapping is under '_value' key.
+
+    Args:
+        content (str): Content of '.ocio' file.
+
+    Returns:
+        dict[str, Any]: Parsed config data.
+
+    """
+    lines = _get_yaml_lines(content)
+    if not lines:
+        return {}
+    data, _ = _parse_yaml_block(lines, 0, lines[0].indent)
+    if not isinstance(data, dict):
+        raise RuntimeError("OCIO config does not contain mapping.")
+    return data
+
+
+def _as_list(value: Any) -> list[Any]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return [value]
+
+
+class OCIOConfig:
+    """Parsed OCIO config with indexed lookups.
+
+    Colorspaces are dictionaries with 'name', 'aliases', 'family',
+        'categories', 'encoding', 'is_data', 'description',
+        'reference_space' ('scene' or 'display'), 'is_active' and
+        'transforms' with parsed transforms of colorspace.
+
+    Args:
+        data (dict[str, Any]): Parsed config data.
+        path (Optional[str]): Path to config file.
+
+    """
+    def __init__(self, data: dict[str, Any], path: Optional[str] = None):
+        self.path = path
+        self.profile_version: Optional[str] = (
+            str(data["ocio_profile_version"])
+            if data.get("ocio_profile_version") is not None
+            else None
+        )
+        self.name: Optional[str] = data.get("name")
+        self.roles: dict[str, str] = dict(data.get("roles") or {})
+        self.colorspaces: dict[str, dict[str, Any]] = {}
+        self.view_transforms: dict[str, dict[str, Any]] = {}
+        self.displays: dict[str, dict[str, dict[str, Any]]] = {}
+        self.active_displays: list[str] = _as_list(
+            data.get("active_displays")
+        )
+        self.active_views: list[str] = _as_list(data.get("active_views"))
+        self.inactive_colorspaces: list[str] = _as_list(
+            data.get("inactive_colorspaces")
+        )
+        self.looks: list[str] = [
+            look["name"]
+            for look in data.get("looks") or []
+            if isinstance(look, dict) and look.get("name")
+        ]
+
+        reference_spaces = {
+            "colorspaces": "scene",
+            "display_colorspaces": "display",
+        }
+        # Keep order of sections in config
+        for key, items in data.items():
+            reference_space = reference_spaces.get(key)
+            if reference_space is None:
+                continue
+            for item in items or []:
+                if isinstance(item, dict) and item.get("name"):
+                    colorspace = self._create_colorspace(
+                        item, reference_space
+                    )
+                    colorspace["is_active"] = (
+                        colorspace["name"] not in self.inactive_colorspaces
+                    )
+                    self.colorspaces[colorspace["name"]] = colorspace
+
+        for item in data.get("view_transforms") or []:
+            if isinstance(item, dict) and item.get("name"):
+                self.view_transforms[item["name"]] = {
+                    "name": item["name"],
+                    "family": item.get("family") or "",
+                    "categories": _as_list(item.get("categories")),
+                    "description": item.get("description") or "",
+                    "transforms": {
+                        key: item[key]
+                        for key in COLORSPACE_TRANSFORM_KEYS
+                        if key in item
+                    },
+                }
+
+        shared_views = {
+            item["name"]: item
+            for item in data.get("shared_views") or []
+            if isinstance(item, dict) and item.get("name")
+        }
+        for display, items in (data.get("displays") or {}).items():
+            views = {}
+            for item in items or []:
+                if not isinstance(item, dict):
+                    continue
+                if item.get("_type") == "Views":
+                    view_items = [
+                        shared_views[name]
+                        for name in _as_list(item.get("_value"))
+                        if name in shared_views
+                    ]
+                else:
+                    view_items = [item]
+                for view_item in view_items:
+                    view = self._create_view(view_item, display)
+                    if view["name"]:
+                        views[view["name"]] = view
+            self.displays[display] = views
+
+        self._build_indexes()
+
+    @staticmethod
+    def _create_colorspace(
+        item: dict[str, Any], reference_space: str
+    ) -> dict[str, Any]:
+        return {
+            "name": item["name"],
+            "aliases": _as_list(item.get("aliases")),
+            "family": item.get("family") or "",
+            "categories": _as_list(item.get("categories")),
+            "encoding": item.get("encoding") or "",
+            "is_data": str(item.get("isdata", "")).lower() == "true",
+            "description": item.get("description") or "",
+            "reference_space": reference_space,
+            "transforms": {
+                key: item[key]
+                for key in COLORSPACE_TRANSFORM_KEYS
+                if key in item
+            },
+        }
+
+    @staticmethod
+    def _create_view(item: dict[str, Any], display: str) -> dict[str, Any]:
+        display_colorspace = item.get("display_colorspace")
+        if display_colorspace == USE_DISPLAY_NAME:
+            display_colorspace = display
+        return {
+            "name": item.get("name"),
+            "colorspace": item.get("colorspace"),
+            "view_transform": item.get("view_transform"),
+            "display_colorspace": display_colorspace,
+            "looks": item.get("looks"),
+            "rule": item.get("rule"),
+            "description": item.get("description") or "",
+        }
+
+    def _build_indexes(self):
+        self._colorspace_names: dict[str, str] = {}
+        self._roles_index: dict[str, str] = {}
+        self._family_index: dict[str, list[str]] = {}
+        self._category_index: dict[str, list[str]] = {}
+        self._displays_index: dict[str, str] = {
+            display.lower(): display
+            for display in self.displays
+        }
+        for name, colorspace in self.colorspaces.items():
+            self._colorspace_names[name.lower()] = name
+            for alias in colorspace["aliases"]:
+                self._colorspace_names.setdefault(alias.lower(), name)
+            self._family_index.setdefault(
+                colorspace["family"].lower(), []
+            ).append(name)
+            for category in colorspace["categories"]:
+                self._category_index.setdefault(
+                    category.lower(), []
+                ).append(name)
+
+        for role, colorspace_name in self.roles.items():
+            self._roles_index[role.lower()] = colorspace_name
+
+    def get_colorspace_name(self, name: str) -> Optional[str]:
+        """Resolve colorspace name, alias or role to colorspace name.
+
+        Args:
+            name (str): Colorspace name, alias or role.
+
+        Returns:
+            Optional[str]: Colorspace name or None if not found.
+
+        """
+        key = name.lower()
+        colorspace_name = self._colorspace_names.get(key)
+        if colorspace_name is None:
+            role_colorspace = self._roles_index.get(key)
+            if role_colorspace is not None:
+                colorspace_name = self._colorspace_names.get(
+                    role_colorspace.lower()
+                )
+        return colorspace_name
+
+    def get_colorspace(self, name: str) -> Optional[dict[str, Any]]:
+        """Get colorspace by name, alias or role.
+
+        Args:
+            name (str): Colorspace name, alias or role.
+
+        Returns:
+            Optional[dict[str, Any]]: Colorspace or None if not found.
+
+        """
+        colorspace_name = self.get_colorspace_name(name)
+        if colorspace_name is None:
+            return None
+        return self.colorspaces[colorspace_name]
+
+    def has_colorspace(self, name: str) -> bool:
+        return self.get_colorspace_name(name) is not None
+
+    def get_role_colorspace(self, role: str) -> Optional[str]:
+        """Get name of colorspace of role.
+
+        Args:
+            role (str): Role name.
+
+        Returns:
+            Optional[str]: Colorspace name or None if role is not defined.
+
+        """
+        colorspace_name = self._roles_index.get(role.lower())
+        if colorspace_name is None:
+            return None
+        return self._colorspace_names.get(
+            colorspace_name.lower(), colorspace_name
+        )
+
+    def get_colorspaces(
+        self,
+        family: Optional[str] = None,
+        category: Optional[str] = None,
+        include_inactive: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Get colorspaces filtered by family and category.
+
+        Args:
+            family (Optional[str]): Family of colorspaces.
+            category (Optional[str]): Category of colorspaces.
+            include_inactive (bool): Include colorspaces listed
+                in 'inactive_colorspaces' of config.
+
+        Returns:
+            list[dict[str, Any]]: Colorspaces in order of config.
+
+        """
+        names = None
+        if family is not None:
+            names = set(self._family_index.get(family.lower(), []))
+        if category is not None:
+            category_names = set(
+                self._category_index.get(category.lower(), [])
+            )
+            names = (
+                category_names if names is None else names & category_names
+            )
+        return [
+            colorspace
+            for name, colorspace in self.colorspaces.items()
+            if (names is None or name in names)
+            and (include_inactive or colorspace["is_active"])
+        ]
+
+    def get_displays(self) -> list[str]:
+        return list(self.displays)
+
+    def get_views(self, display: str) -> list[str]:
+        display = self._displays_index.get(display.lower(), display)
+        return list(self.displays.get(display) or {})
+
+    def get_view(self, display: str, view: str) -> Optional[dict[str, Any]]:
+        """Get view of display with its colorspace or view transform.
+
+        Args:
+            display (str): Display name.
+            view (str): View name.
+
+        Returns:
+            Optional[dict[str, Any]]: View with 'colorspace',
+                'view_transform', 'display_colorspace' and 'looks'
+                or None if not found.
+
+        """
+        display = self._displays_index.get(display.lower(), display)
+        views = self.displays.get(display) or {}
+        view_lower = view.lower()
+        for name, view_data in views.items():
+            if name.lower() == view_lower:
+                return view_data
+        return None
+
+    def get_view_transform(self, name: str) -> Optional[dict[str, Any]]:
+        return self.view_transforms.get(name)
+
+
+def get_config_cache_dir() -> str:
+    """Directory where parsed configs are cached.
+
+    Returns:
+        str: Path to configs cache.
+
+    """
+    cache_dir = os.getenv(CONFIG_CACHE_ENV)
+    if cache_dir:
+        return cache_dir
+
+    try:
+        from ayon_core.lib import get_launcher_local_dir
+
+        return get_launcher_local_dir("addons", ADDON_NAME, "configs_cache")
+
+    except ImportError:
+        from ayon_core.lib import get_ayon_appdirs
+
+        return get_ayon_appdirs("addons", ADDON_NAME, "configs_cache")
+
+
+def _read_config_content(path: str) -> str:
+    if path.lower().endswith(".ocioz"):
+        with zipfile.ZipFile(path) as zipf:
+            content = zipf.read(OCIOZ_CONFIG_NAME)
+    else:
+        with open(path, "rb") as stream:
+            content = stream.read()
+    return content.decode("utf-8", errors="replace")
+
+
+def _get_cache_path(key: tuple[str, int, int]) -> str:
+    checksum = hashlib.sha256(
+        f"{CONFIG_CACHE_VERSION}:{key[0]}:{key[1]}:{key[2]}".encode()
+    ).hexdigest()
+    return os.path.join(get_config_cache_dir(), f"{checksum}.pickle")
+
+
+def _load_cached_config(cache_path: str) -> Optional[OCIOConfig]:
+    try:
+        with open(cache_path, "rb") as stream:
+            config = pickle.load(stream)
+    except Exception:
+        return None
+    if not isinstance(config, OCIOConfig):
+        return None
+    return config
+
+
+def _save_cached_config(cache_path: str, config: OCIOConfig):
+    cache_dir = os.path.dirname(cache_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as stream:
+            pickle.dump(config, stream, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_config(path: str, use_cache: bool = True) -> OCIOConfig:
+    """Load OCIO config.
+
+    Config is parsed only once per process and parsed config is cached
+        on disk for other processes. Cache is invalidated when size
+        or modification time of config changes.
+
+    Args:
+        path (str): Path to '.ocio' or '.ocioz' file.
+        use_cache (bool): Use cache of parsed configs.
+
+    Returns:
+        OCIOConfig: Parsed config.
+
+    """
+    path = os.path.abspath(path)
+    if not use_cache:
+        return OCIOConfig(parse_ocio_yaml(_read_config_content(path)), path)
+
+    file_stat = os.stat(path)
+    key = (path, file_stat.st_size, file_stat.st_mtime_ns)
+    config = _configs_cache.get(key)
+    if config is not None:
+        return config
+
+    cache_path = _get_cache_path(key)
+    config = _load_cached_config(cache_path)
+    if config is None:
+        config = OCIOConfig(parse_ocio_yaml(_read_config_content(path)), path)
+        try:
+            _save_cached_config(cache_path, config)
+        except OSError:
+            pass
+    _configs_cache[key] = config
+    return config
@@ -0,0 +1,894 @@
+"""Installation of OCIO config bundles.
+
+Config bundles are not part of client code. Each bundle is a separate
+private file of the addon on server, listed in 'configs_index.json' with
+its checksum. Bundle is installed to configs folder of client code the
+first time a config from the bundle is requested, paths resolved from
+templates using configs dir are installed with 'resolve_config_path'.
+Bundles defined by environment variable can be prefetched.
+
+Downloaded archives are kept in a store shared by all versions of the
+addon, so a new version of the addon does not download bundles that did
+not change. Size of the store is capped and least recently used archives
+are evicted. Installed configs are extracted copies with their own cap,
+least recently used bundles are removed from configs folder. Installed
+bundles are also removed with the addon version or when their bundle is
+not in index anymore. Installation is guarded by
+operating system file locks so multiple processes can request configs at
+the same time. Bundle is extracted to temporary directory next to installed
+configs and verified before it replaces installed files, so readers never
+see half-written bundle.
+"""
+from __future__ import annotations
+
+import os
+import time
+import gzip
+import json
+import shutil
+import hashlib
+import zipfile
+import tempfile
+from typing import Any, Iterable, Optional
+
+from ayon_core.lib import Logger
+
+if os.name == "nt":
+    import msvcrt
+    fcntl = None
+else:
+    import fcntl
+    msvcrt = None
+
+from .version import __version__
+
+ADDON_NAME = "ayon_ocio"
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_ROOT = os.path.join(CURRENT_DIR, "configs")
+CONFIGS_DIR = os.path.join(CONFIG_ROOT, "OpenColorIOConfigs")
+CONFIGS_INDEX_PATH = os.path.join(CURRENT_DIR, "configs_index.json")
+# Checksums of installed bundles
+BUNDLE_STAMPS_DIR = os.path.join(CONFIG_ROOT, ".bundles")
+# Stamps of verified installed bundles
+VERIFIED_STAMPS_DIR = os.path.join(CONFIG_ROOT, ".verified")
+# Bundle of files directly in configs folder
+CONFIGS_ROOT_BUNDLE = "_root"
+# Environment variable to override directory of bundles store
+BUNDLES_STORE_ENV = "AYON_OCIO_BUNDLES_ROOT"
+# Environment variable with maximum size of archives in bundles store
+#   e.g. '2G'
+STORE_MAX_SIZE_ENV = "AYON_OCIO_BUNDLES_MAX_SIZE"
+DEFAULT_STORE_MAX_SIZE = 2 * 1024 ** 3
+# Environment variable with maximum size of installed configs e.g. '2G'
+CONFIGS_MAX_SIZE_ENV = "AYON_OCIO_CONFIGS_MAX_SIZE"
+DEFAULT_CONFIGS_MAX_SIZE = 2 * 1024 ** 3
+# Environment variable with comma separated bundles installed before
+#   a config from them is requested, '*' installs all bundles
+PREFETCH_BUNDLES_ENV = "AYON_OCIO_PREFETCH_BUNDLES"
+HASH_CHUNK_SIZE = 1024 * 1024
+# Suffix of partially downloaded archives, resumed by next download
+DOWNLOAD_PART_SUFFIX = ".part"
+# Suffix of temporary directories where bundles are extracted
+TMP_SUFFIX = ".tmp"
+DOWNLOAD_TIMEOUT = 60.0
+LOCK_TIMEOUT = 900.0
+LOCK_POLL_INTERVAL = 0.1
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+log = Logger.get_logger(__name__)
+# Bundles verified as installed in this process
+_installed_bundles: set[str] = set()
+# Bundles disabled in settings by project name
+_disabled_bundles_cache: dict[Optional[str], set[str]] = {}
+
+
+class FileLock:
+    """Lock shared between processes based on operating system file lock.
+
+    Lock is held by open file handle, so operating system releases it when
+        process holding the lock crashes. Lock file itself is never removed,
+        removing it would allow two processes to lock different files.
+
+    Args:
+        path (str): Path to lock file.
+        timeout (float): Maximum time to wait for the lock in seconds.
+
+    """
+    def __init__(self, path: str, timeout: float = LOCK_TIMEOUT):
+        self.path = path
+        self._timeout = timeout
+        self._stream = None
+
+    def _try_lock(self) -> bool:
+        try:
+            if msvcrt is not None:
+                self._stream.seek(0)
+                msvcrt.locking(self._stream.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(
+                    self._stream.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB
+                )
+        except OSError:
+            return False
+        return True
+
+    def acquire(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._stream = open(self.path, "a+b")
+        start = time.time()
+        while not self._try_lock():
+            if time.time() - start > self._timeout:
+                self._stream.close()
+                self._stream = None
+                raise RuntimeError(
+                    f"Timed out waiting for lock '{self.path}'."
+                )
+            time.sleep(LOCK_POLL_INTERVAL)
+
+    def release(self):
+        if self._stream is None:
+            return
+        try:
+            if msvcrt is not None:
+                self._stream.seek(0)
+                msvcrt.locking(self._stream.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._stream.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._stream.close()
+            self._stream = None
+
+    def __enter__(self) -> FileLock:
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+def get_configs_index() -> Optional[dict[str, Any]]:
+    """Index of config bundles distributed with client code.
+
+    Returns:
+        Optional[dict[str, Any]]: Index data or None if client code
+            contains configs directly, e.g. in development.
+
+    """
+    if not os.path.exists(CONFIGS_INDEX_PATH):
+        return None
+    with open(CONFIGS_INDEX_PATH, "r") as stream:
+        return json.load(stream)
+
+
+def get_disabled_bundles(project_name: Optional[str] = None) -> set[str]:
+    """Bundles disabled in addon settings.
+
+    Project settings of current project are used if project name is not
+        passed, studio settings are used if there is no project.
+
+    Args:
+        project_name (Optional[str]): Project name.
+
+    Returns:
+        set[str]: Names of disabled bundles.
+
+    """
+    if project_name is None:
+        project_name = os.getenv("AYON_PROJECT_NAME") or None
+
+    disabled = _disabled_bundles_cache.get(project_name)
+    if disabled is not None:
+        return disabled
+
+    from ayon_core.settings import get_project_settings, get_studio_settings
+
+    try:
+        if project_name:
+            settings = get_project_settings(project_name)
+        else:
+            settings = get_studio_settings()
+    except Exception:
+        log.warning(
+            "Failed to get settings of OCIO config bundles.", exc_info=True
+        )
+        return set()
+
+    addon_settings = settings.get(ADDON_NAME) or {}
+    disabled = {
+        bundle["name"]
+        for bundle in addon_settings.get("bundles", [])
+        if not bundle["enabled"]
+    }
+    _disabled_bundles_cache[project_name] = disabled
+    return disabled
+
+
+def get_config_bundle_name(config_subpath: str) -> str:
+    """Name of bundle which contains config.
+
+    Args:
+        config_subpath (str): Path relative to configs dir, e.g.
+            'aces_1.3/studio-config.ocio'.
+
+    Returns:
+        str: Bundle name.
+
+    """
+    parts = config_subpath.replace("\\", "/").strip("/").split("/")
+    if len(parts) < 2:
+        return CONFIGS_ROOT_BUNDLE
+    return parts[0]
+
+
+def get_bundles_store_dir() -> str:
+    """Directory where bundle archives are downloaded and extracted.
+
+    Returns:
+        str: Path to bundles store.
+
+    """
+    store_dir = os.getenv(BUNDLES_STORE_ENV)
+    if store_dir:
+        return store_dir
+
+    try:
+        from ayon_core.lib import get_launcher_local_dir
+
+        return get_launcher_local_dir("addons", ADDON_NAME, "bundles")
+
+    except ImportError:
+        from ayon_core.lib import get_ayon_appdirs
+
+        return get_ayon_appdirs("addons", ADDON_NAME, "bundles")
+
+
+def _get_size_from_env(env_name: str, default: int) -> int:
+    value = os.getenv(env_name, "").strip().upper()
+    if not value:
+        return default
+    unit = value[-1] if value[-1] in SIZE_UNITS else ""
+    number = value[:-1] if unit else value
+    try:
+        return int(float(number) * SIZE_UNITS[unit])
+    except ValueError:
+        log.warning(
+            f"Invalid value '{value}' of '{env_name}', using default size."
+        )
+        return default
+
+
+def get_store_max_size() -> int:
+    """Maximum size of bundles store in bytes.
+
+    Returns:
+        int: Maximum size defined by environment variable or default.
+
+    """
+    return _get_size_from_env(STORE_MAX_SIZE_ENV, DEFAULT_STORE_MAX_SIZE)
+
+
+def get_configs_max_size() -> int:
+    """Maximum size of installed configs in bytes.
+
+    Returns:
+        int: Maximum size defined by environment variable or default.
+
+    """
+    return _get_size_from_env(CONFIGS_MAX_SIZE_ENV, DEFAULT_CONFIGS_MAX_SIZE)
+
+
+def _calculate_checksum(filepath: str) -> str:
+    hash_obj = hashlib.sha256()
+    with open(filepath, "rb") as stream:
+        for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b""):
+            hash_obj.update(chunk)
+    return hash_obj.hexdigest()
+
+
+def _remove_path(path: str):
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def _get_bundle_url(bundle: str) -> str:
+    import ayon_api
+
+    con = ayon_api.get_server_api_connection()
+    return (
+        f"{con.get_rest_url()}/addons/{ADDON_NAME}/{__version__}"
+        f"/bundles/{bundle}"
+    )
+
+
+def _download_bundle_variant(
+    bundle: str, variant: dict[str, Any], encoding: Optional[str], dst: str
+) -> bool:
+    """Download archive variant from bundles endpoint of server addon.
+
+    Partially downloaded file is resumed with range request. 'If-Range'
+        makes sure server sends whole variant if its content changed.
+
+    Args:
+        bundle (str): Bundle name.
+        variant (dict[str, Any]): Filename, sha256 and size of variant.
+        encoding (Optional[str]): Content encoding of variant, None for
+            the archive itself.
+        dst (str): Path to partially downloaded file.
+
+    Returns:
+        bool: Variant was downloaded, False if server does not provide
+            bundles endpoint.
+
+    """
+    import ayon_api
+    import requests
+
+    con = ayon_api.get_server_api_connection()
+    url = _get_bundle_url(bundle)
+    etag = f'"{variant["sha256"]}"'
+    for _ in range(2):
+        offset = os.path.getsize(dst) if os.path.exists(dst) else 0
+        if offset == variant["size"]:
+            return True
+        headers = dict(con.get_headers())
+        headers["Accept-Encoding"] = encoding or "identity"
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = etag
+
+        with requests.get(
+            url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT
+        ) as response:
+            if response.status_code == 404:
+                return False
+            if response.status_code == 416:
+                # Partial file is bigger than variant, start over
+                os.remove(dst)
+                continue
+            response.raise_for_status()
+            if response.headers.get("ETag") != etag:
+                raise RuntimeError(
+                    f"Server sent unexpected content of bundle '{bundle}'."
+                )
+
+            mode = "ab" if response.status_code == 206 else "wb"
+            with open(dst, mode) as stream:
+                # Content encoding is part of variant, it is decoded after
+                #   whole variant is verified
+                for chunk in response.raw.stream(
+                    HASH_CHUNK_SIZE, decode_content=False
+                ):
+                    stream.write(chunk)
+        return True
+
+    raise RuntimeError(f"Failed to download bundle '{bundle}'.")
+
+
+def _download_bundle_archive(
+    bundle: str, bundle_info: dict[str, Any], archives_dir: str
+) -> str:
+    """Download bundle archive to temporary file in archives directory.
+
+    Gzip variant of archive is preferred if package contains it.
+
+    Args:
+        bundle (str): Bundle name.
+        bundle_info (dict[str, Any]): Bundle information from index.
+        archives_dir (str): Directory of archives in bundles store.
+
+    Returns:
+        str: Path to downloaded archive, checksum is not verified.
+
+    """
+    encoding = None
+    variant = bundle_info
+    gzip_variant = (bundle_info.get("encodings") or {}).get("gzip")
+    if gzip_variant is not None:
+        encoding = "gzip"
+        variant = gzip_variant
+
+    part_path = os.path.join(
+        archives_dir, f"{variant['sha256']}{DOWNLOAD_PART_SUFFIX}"
+    )
+    if not _download_bundle_variant(bundle, variant, encoding, part_path):
+        import ayon_api
+
+        # Server addon without bundles endpoint
+        tmp_dir = tempfile.mkdtemp(dir=archives_dir)
+        try:
+            filepath = ayon_api.download_addon_private_file(
+                ADDON_NAME, __version__, bundle_info["filename"], tmp_dir
+            )
+            os.replace(filepath, part_path)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return part_path
+
+    variant_checksum = _calculate_checksum(part_path)
+    if variant_checksum != variant["sha256"]:
+        os.remove(part_path)
+        raise RuntimeError(
+            f"Checksum of '{variant['filename']}' does not match."
+            f" Expected '{variant['sha256']}', got '{variant_checksum}'."
+        )
+
+    if encoding is None:
+        return part_path
+
+    archive_path = os.path.join(
+        archives_dir, f"{bundle_info['sha256']}{DOWNLOAD_PART_SUFFIX}"
+    )
+    with gzip.open(part_path, "rb") as src_stream:
+        with open(archive_path, "wb") as dst_stream:
+            shutil.copyfileobj(src_stream, dst_stream, HASH_CHUNK_SIZE)
+    os.remove(part_path)
+    return archive_path
+
+
+def _get_bundle_archive(
+    store_dir: str, bundle: str, bundle_info: dict[str, Any]
+) -> str:
+    """Get path to downloaded bundle archive, download it if needed.
+
+    Args:
+        store_dir (str): Bundles store directory.
+        bundle (str): Bundle name.
+        bundle_info (dict[str, Any]): Bundle information from index.
+
+    Returns:
+        str: Path to verified bundle archive.
+
+    """
+    checksum = bundle_info["sha256"]
+    archives_dir = os.path.join(store_dir, "archives")
+    archive_path = os.path.join(archives_dir, f"{checksum}.zip")
+    if (
+        os.path.exists(archive_path)
+        and _calculate_checksum(archive_path) == checksum
+    ):
+        return archive_path
+
+    os.makedirs(archives_dir, exist_ok=True)
+    log.info(f"Downloading OCIO configs '{bundle_info['filename']}'")
+    filepath = _download_bundle_archive(bundle, bundle_info, archives_dir)
+    filepath_checksum = _calculate_checksum(filepath)
+    if filepath_checksum != checksum:
+        os.remove(filepath)
+        raise RuntimeError(
+            f"Checksum of '{bundle_info['filename']}' does not match."
+            f" Expected '{checksum}', got '{filepath_checksum}'."
+        )
+    os.replace(filepath, archive_path)
+    return archive_path
+
+
+def _evict_store_bundles(store_dir: str, keep_checksum: str):
+    """Remove least recently used archives until store fits max size.
+
+    Store contains only downloaded archives, installed configs are
+        extracted copies, so removed archive frees its whole size. Last use
+        is the modification time of archive.
+
+    Args:
+        store_dir (str): Bundles store directory.
+        keep_checksum (str): Checksum of archive which is never evicted.
+
+    """
+    archives_dir = os.path.join(store_dir, "archives")
+    if not os.path.isdir(archives_dir):
+        return
+
+    entries = []
+    total_size = 0
+    for entry in os.scandir(archives_dir):
+        if not entry.is_file():
+            continue
+        stat = entry.stat()
+        total_size += stat.st_size
+        checksum = os.path.splitext(entry.name)[0]
+        entries.append((stat.st_mtime, checksum, entry.path, stat.st_size))
+
+    max_size = get_store_max_size()
+    for _, checksum, path, size in sorted(entries):
+        if total_size <= max_size:
+            break
+        if checksum == keep_checksum:
+            continue
+        log.debug(f"Evicting OCIO configs archive '{path}'")
+        _remove_path(path)
+        total_size -= size
+
+
+def _remove_bundle_stamps(bundle: str):
+    for stamps_dir in (BUNDLE_STAMPS_DIR, VERIFIED_STAMPS_DIR):
+        stamp_path = os.path.join(stamps_dir, bundle)
+        if os.path.exists(stamp_path):
+            os.remove(stamp_path)
+
+
+def _remove_installed_bundle(bundle: str):
+    """Remove stamps and folder of installed bundle.
+
+    Folder is renamed before it is removed, so it disappears from configs
+        dir at once.
+
+    """
+    _remove_bundle_stamps(bundle)
+    bundle_dir = os.path.join(CONFIGS_DIR, bundle)
+    if bundle == CONFIGS_ROOT_BUNDLE or not os.path.isdir(bundle_dir):
+        return
+    removed_dir = tempfile.mkdtemp(
+        prefix=f".{bundle}.", suffix=TMP_SUFFIX, dir=CONFIGS_DIR
+    )
+    try:
+        os.replace(bundle_dir, os.path.join(removed_dir, bundle))
+    finally:
+        shutil.rmtree(removed_dir, ignore_errors=True)
+
+
+def _get_bundle_stamp(bundle: str) -> Optional[dict[str, Any]]:
+    """Stamp of installed bundle with its checksum and installed size.
+
+    Modification time of stamp is the last use of installed bundle.
+
+    """
+    stamp_path = os.path.join(BUNDLE_STAMPS_DIR, bundle)
+    try:
+        with open(stamp_path, "r") as stream:
+            return json.load(stream)
+    except (OSError, ValueError):
+        return None
+
+
+def _get_installed_checksum(bundle: str) -> Optional[str]:
+    stamp = _get_bundle_stamp(bundle)
+    if stamp is None:
+        return None
+    return stamp.get("sha256")
+
+
+def _mark_bundle_used(bundle: str):
+    try:
+        os.utime(os.path.join(BUNDLE_STAMPS_DIR, bundle))
+    except OSError:
+        pass
+
+
+def _evict_installed_bundles(keep_bundles: Iterable[str]):
+    """Remove least recently used bundles until configs fit max size.
+
+    Must be called with lock of configs dir. Bundle of files directly in
+        configs dir is never evicted.
+
+    Args:
+        keep_bundles (Iterable[str]): Bundles which are never evicted,
+            e.g. bundles used by current process.
+
+    """
+    if not os.path.isdir(BUNDLE_STAMPS_DIR):
+        return
+
+    keep_bundles = set(keep_bundles)
+    keep_bundles.add(CONFIGS_ROOT_BUNDLE)
+    entries = []
+    total_size = 0
+    for entry in os.scandir(BUNDLE_STAMPS_DIR):
+        stamp = _get_bundle_stamp(entry.name)
+        if stamp is None:
+            continue
+        size = stamp.get("size", 0)
+        total_size += size
+        if entry.name not in keep_bundles:
+            entries.append((entry.stat().st_mtime, entry.name, size))
+
+    max_size = get_configs_max_size()
+    for _, bundle, size in sorted(entries):
+        if total_size <= max_size:
+            break
+        log.debug(f"Evicting installed OCIO configs bundle '{bundle}'")
+        _remove_installed_bundle(bundle)
+        total_size -= size
+
+
+def _remove_stale_extractions():
+    """Remove temporary directories left by interrupted installs."""
+    if not os.path.isdir(CONFIGS_DIR):
+        return
+    for entry in os.scandir(CONFIGS_DIR):
+        if entry.name.startswith(".") and entry.name.endswith(TMP_SUFFIX):
+            _remove_path(entry.path)
+
+
+def _verify_extracted_bundle(
+    bundle: str, bundle_info: dict[str, Any], extract_dir: str
+) -> Optional[dict[str, Any]]:
+    """Verify extracted files of bundle against configs manifest.
+
+    Args:
+        bundle (str): Bundle name.
+        bundle_info (dict[str, Any]): Bundle information from index.
+        extract_dir (str): Directory where bundle archive was extracted.
+
+    Returns:
+        Optional[dict[str, Any]]: Bundle information from manifest, None
+            if manifest does not contain the bundle.
+
+    Raises:
+        RuntimeError: Extracted files do not match manifest.
+
+    """
+    from .integrity import get_configs_manifest, get_invalid_bundle_files
+
+    manifest = get_configs_manifest()
+    if manifest is None:
+        return None
+    bundle_manifest = manifest["bundles"].get(bundle)
+    if (
+        bundle_manifest is None
+        or bundle_manifest["sha256"] != bundle_info["sha256"]
+    ):
+        return None
+
+    invalid = get_invalid_bundle_files(bundle_manifest, extract_dir)
+    if invalid:
+        raise RuntimeError(
+            f"Extracted OCIO configs bundle '{bundle}' does not match"
+            f" manifest, invalid files: {', '.join(invalid[:10])}"
+        )
+    return bundle_manifest
+
+
+def _swap_installed_bundle(bundle: str, extract_dir: str):
+    """Move extracted bundle to configs dir.
+
+    Bundle folder replaces installed folder with two renames, installed
+        folder is moved to extract dir and removed with it. Files of root
+        bundle are replaced one by one.
+
+    Args:
+        bundle (str): Bundle name.
+        extract_dir (str): Directory where bundle archive was extracted.
+
+    """
+    if bundle == CONFIGS_ROOT_BUNDLE:
+        for entry in os.scandir(extract_dir):
+            if entry.is_file():
+                os.replace(entry.path, os.path.join(CONFIGS_DIR, entry.name))
+        return
+
+    src_path = os.path.join(extract_dir, bundle)
+    dst_path = os.path.join(CONFIGS_DIR, bundle)
+    if not os.path.isdir(src_path):
+        return
+    if os.path.exists(dst_path):
+        os.replace(dst_path, os.path.join(extract_dir, f".{bundle}.old"))
+    os.replace(src_path, dst_path)
+
+
+def install_config_bundle(bundle: str, bundle_info: dict[str, Any]):
+    """Install config bundle to configs folder of client code.
+
+    Files are extracted from verified archive in bundles store to temporary
+        directory next to installed configs. Extracted files are verified
+        against configs manifest before they replace installed files, so
+        installed bundle is never half-written. Archive is marked as used
+        and least recently used archives are evicted from the store.
+
+    Args:
+        bundle (str): Bundle name.
+        bundle_info (dict[str, Any]): Bundle information from index.
+
+    Raises:
+        RuntimeError: Extracted files do not match manifest.
+
+    """
+    checksum = bundle_info["sha256"]
+    store_dir = get_bundles_store_dir()
+    with FileLock(os.path.join(store_dir, ".lock")):
+        archive_path = _get_bundle_archive(store_dir, bundle, bundle_info)
+        os.makedirs(CONFIGS_DIR, exist_ok=True)
+        _remove_stale_extractions()
+        extract_dir = tempfile.mkdtemp(
+            prefix=f".{bundle}.", suffix=TMP_SUFFIX, dir=CONFIGS_DIR
+        )
+        try:
+            with zipfile.ZipFile(archive_path) as zipf:
+                zipf.extractall(extract_dir)
+                size = sum(info.file_size for info in zipf.infolist())
+            bundle_manifest = _verify_extracted_bundle(
+                bundle, bundle_info, extract_dir
+            )
+            _remove_bundle_stamps(bundle)
+            _swap_installed_bundle(bundle, extract_dir)
+        finally:
+            shutil.rmtree(extract_dir, ignore_errors=True)
+
+        # Mark archive as used
+        os.utime(archive_path)
+        _evict_store_bundles(store_dir, checksum)
+
+    os.makedirs(BUNDLE_STAMPS_DIR, exist_ok=True)
+    with open(os.path.join(BUNDLE_STAMPS_DIR, bundle), "w") as stream:
+        json.dump({"sha256": checksum, "size": size}, stream)
+
+    if bundle_manifest is not None:
+        from .integrity import stamp_verified_bundle
+
+        stamp_verified_bundle(bundle, bundle_manifest)
+
+
+def ensure_config_bundles(bundles: Optional[Iterable[str]] = None):
+    """Make sure config bundles are installed.
+
+    Bundles with different checksum than in index are installed again.
+        Bundles disabled in settings are not installed. Nothing happens if
+        client code does not have configs index. Least recently used
+        bundles are evicted when installed configs exceed max size, except
+        bundles used by current process.
+
+    Args:
+        bundles (Optional[Iterable[str]]): Names of bundles to install,
+            all enabled bundles from index are installed if not set.
+            Bundles which are not in index are ignored.
+
+    Raises:
+        RuntimeError: Requested bundle is disabled in settings.
+
+    """
+    if bundles is not None:
+        bundles = set(bundles) - _installed_bundles
+        if not bundles:
+            return
+
+    index = get_configs_index()
+    if index is None:
+        return
+
+    bundles_info: dict[str, dict[str, Any]] = index["bundles"]
+    disabled = get_disabled_bundles()
+    if bundles is None:
+        bundles = set(bundles_info) - disabled
+
+    disabled_requested = disabled.intersection(bundles)
+    if disabled_requested:
+        raise RuntimeError(
+            "OCIO config bundles are disabled in settings: "
+            + ", ".join(sorted(disabled_requested))
+        )
+
+    missing = []
+    for bundle in sorted(bundles):
+        bundle_info = bundles_info.get(bundle)
+        if bundle_info is None:
+            continue
+        if _get_installed_checksum(bundle) == bundle_info["sha256"]:
+            _mark_bundle_used(bundle)
+            _installed_bundles.add(bundle)
+        else:
+            missing.append(bundle)
+
+    if not missing:
+        return
+
+    with FileLock(os.path.join(CONFIG_ROOT, ".lock")):
+        for bundle in missing:
+            bundle_info = bundles_info[bundle]
+            # Other process could install the bundle meanwhile
+            if _get_installed_checksum(bundle) != bundle_info["sha256"]:
+                install_config_bundle(bundle, bundle_info)
+            _installed_bundles.add(bundle)
+        _evict_installed_bundles(_installed_bundles)
+
+
+def reinstall_config_bundles(bundles: Iterable[str]):
+    """Install config bundles again, e.g. when installed files are broken.
+
+    Args:
+        bundles (Iterable[str]): Names of bundles to install.
+
+    """
+    index = get_configs_index()
+    if index is None:
+        return
+
+    with FileLock(os.path.join(CONFIG_ROOT, ".lock")):
+        for bundle in bundles:
+            bundle_info = index["bundles"].get(bundle)
+            if bundle_info is None:
+                continue
+            log.info(f"Reinstalling OCIO configs bundle '{bundle}'")
+            install_config_bundle(bundle, bundle_info)
+            _installed_bundles.add(bundle)
+
+
+def remove_outdated_bundles():
+    """Remove installed bundles which are not in configs index."""
+    index = get_configs_index()
+    if index is None or not os.path.isdir(BUNDLE_STAMPS_DIR):
+        return
+
+    with FileLock(os.path.join(CONFIG_ROOT, ".lock")):
+        for bundle in os.listdir(BUNDLE_STAMPS_DIR):
+            if bundle not in index["bundles"]:
+                _remove_installed_bundle(bundle)
+
+
+def prefetch_config_bundles():
+    """Install bundles defined by prefetch environment variable.
+
+    Other bundles are installed when a config from them is requested.
+
+    """
+    value = os.getenv(PREFETCH_BUNDLES_ENV, "").strip()
+    if not value:
+        return
+
+    if value == "*":
+        ensure_config_bundles()
+        return
+    ensure_config_bundles(
+        bundle.strip()
+        for bundle in value.split(",")
+        if bundle.strip()
+    )
+
+
+def get_config_path(config_subpath: str) -> str:
+    """Get path to config file or folder, install its bundle if needed.
+
+    Path to '.ocioz' archive is returned for '.ocio' config which is
+        shipped as archive.
+
+    Args:
+        config_subpath (str): Path relative to configs dir, e.g.
+            'aces_1.3/studio-config.ocio'.
+
+    Returns:
+        str: Path to config.
+
+    """
+    bundle = get_config_bundle_name(config_subpath)
+    ensure_config_bundles([bundle])
+    path = os.path.join(CONFIGS_DIR, os.path.normpath(config_subpath))
+    if not os.path.exists(path) and bundle in _installed_bundles:
+        # Bundle could be evicted by other process
+        _installed_bundles.discard(bundle)
+        ensure_config_bundles([bundle])
+
+    if path.endswith(".ocio") and not os.path.exists(path):
+        # Config could be shipped as '.ocioz' archive
+        ocioz_path = f"{path}z"
+        if os.path.exists(ocioz_path):
+            return ocioz_path
+    return path
+
+
+def resolve_config_path(path: str) -> str:
+    """Get path to config resolved from template using configs dir.
+
+    Templates using 'BUILTIN_OCIO_ROOT' point to configs which are not
+        installed until they are requested. Bundle of config is installed
+        if path is in configs dir, other paths are returned unchanged.
+
+    Args:
+        path (str): Path to config, e.g. formatted template
+            '{BUILTIN_OCIO_ROOT}/aces_1.3/studio-config.ocio'. Template
+            which is not formatted yet is accepted too.
+
+    Returns:
+        str: Path to config.
+
+    """
+    path = path.replace("{BUILTIN_OCIO_ROOT}", CONFIGS_DIR)
+    try:
+        config_subpath = os.path.relpath(
+            os.path.abspath(path), os.path.abspath(CONFIGS_DIR)
+        )
+    except ValueError:
+        # Path on different drive
+        return path
+    if config_subpath.split(os.sep)[0] in (os.curdir, os.pardir):
+        return path
+    return get_config_path(config_subpath)
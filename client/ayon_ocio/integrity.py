@@ -0,0 +1,388 @@
+"""Verification of installed config bundles.
+
+Client code contains manifest with size and CRC-32 of each file of config
+bundles. Files of installed bundles are hashed in parallel threads.
+
+Verified bundle gets a stamp with modification times of its directories,
+files directly in configs dir are stamped with their own size and
+modification time. Bundle with valid stamp is not hashed again, so check
+of intact install costs only a few 'stat' calls. Files added, removed or
+replaced in bundle change modification time of their directory and
+invalidate the stamp, changes of file content in place are found only by
+full verification.
+"""
+from __future__ import annotations
+
+import os
+import json
+import zlib
+import threading
+import concurrent.futures
+from typing import Any, Iterable, Optional
+
+from .distribution import (
+    CURRENT_DIR,
+    CONFIGS_DIR,
+    BUNDLE_STAMPS_DIR,
+    VERIFIED_STAMPS_DIR,
+    PREFETCH_BUNDLES_ENV,
+    log,
+    _get_installed_checksum,
+    get_configs_index,
+    prefetch_config_bundles,
+    reinstall_config_bundles,
+    remove_outdated_bundles,
+)
+
+CONFIGS_MANIFEST_PATH = os.path.join(CURRENT_DIR, "configs_manifest.json")
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_manifest_cache: dict[str, Any] = {}
+_maintenance_threads: dict[str, threading.Thread] = {}
+
+
+def get_configs_manifest() -> Optional[dict[str, Any]]:
+    """Manifest of files of config bundles.
+
+    Manifest is loaded only once per process.
+
+    Returns:
+        Optional[dict[str, Any]]: Manifest data or None if client code
+            does not contain manifest.
+
+    """
+    if "manifest" not in _manifest_cache:
+        manifest = None
+        if os.path.exists(CONFIGS_MANIFEST_PATH):
+            with open(CONFIGS_MANIFEST_PATH, "r") as stream:
+                manifest = json.load(stream)
+        _manifest_cache["manifest"] = manifest
+    return _manifest_cache["manifest"]
+
+
+def _calculate_crc(filepath: str) -> str:
+    crc = 0
+    with open(filepath, "rb") as stream:
+        for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+    return f"{crc:08x}"
+
+
+def _is_file_valid(root: str, subpath: str, size: int, crc: str) -> bool:
+    filepath = os.path.join(root, os.path.normpath(subpath))
+    try:
+        if os.path.getsize(filepath) != size:
+            return False
+        return _calculate_crc(filepath) == crc
+    except OSError:
+        return False
+
+
+def _get_stamp_stats(subpaths: Iterable[str]) -> Optional[dict[str, Any]]:
+    """Stats of files invalidating stamp of verified bundle.
+
+    Modification time of each directory of files is used. Files directly
+        in configs dir use their own size and modification time, because
+        configs dir changes with every installed bundle.
+
+    Returns:
+        Optional[dict[str, Any]]: Modification time of each directory or
+            size and modification time of root file, by path relative to
+            configs dir. None if a directory or root file is missing.
+
+    """
+    paths = set()
+    root_files = set()
+    for subpath in subpaths:
+        subpath = subpath.replace("\\", "/")
+        dirname = os.path.dirname(subpath)
+        if dirname:
+            paths.add(dirname)
+        else:
+            paths.add(subpath)
+            root_files.add(subpath)
+
+    output = {}
+    for path in sorted(paths):
+        try:
+            path_stat = os.stat(
+                os.path.join(CONFIGS_DIR, os.path.normpath(path))
+            )
+        except OSError:
+            return None
+        if path in root_files:
+            output[path] = [path_stat.st_size, path_stat.st_mtime_ns]
+        else:
+            output[path] = path_stat.st_mtime_ns
+    return output
+
+
+def _get_verified_stamp(bundle: str) -> Optional[dict[str, Any]]:
+    stamp_path = os.path.join(VERIFIED_STAMPS_DIR, bundle)
+    try:
+        with open(stamp_path, "r") as stream:
+            return json.load(stream)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_verified_stamp(bundle: str, data: dict[str, Any]):
+    os.makedirs(VERIFIED_STAMPS_DIR, exist_ok=True)
+    stamp_path = os.path.join(VERIFIED_STAMPS_DIR, bundle)
+    tmp_path = f"{stamp_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as stream:
+        json.dump(data, stream)
+    os.replace(tmp_path, stamp_path)
+
+
+def get_invalid_bundle_files(
+    bundle_manifest: dict[str, Any],
+    root: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> list[str]:
+    """Hash files of bundle and compare them with manifest.
+
+    Args:
+        bundle_manifest (dict[str, Any]): Bundle information from manifest.
+        root (Optional[str]): Directory with files of bundle, e.g.
+            temporary directory where bundle was extracted. Configs dir
+            is used if not set.
+        max_workers (Optional[int]): Number of threads hashing files.
+
+    Returns:
+        list[str]: Paths of invalid or missing files relative to root.
+
+    """
+    if root is None:
+        root = CONFIGS_DIR
+    files: dict[str, list[Any]] = bundle_manifest["files"]
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        results = executor.map(
+            lambda item: _is_file_valid(root, item[0], *item[1]),
+            files.items()
+        )
+        return [
+            subpath
+            for subpath, is_valid in zip(files, results)
+            if not is_valid
+        ]
+
+
+def stamp_verified_bundle(bundle: str, bundle_manifest: dict[str, Any]):
+    """Mark installed bundle as verified.
+
+    Used when files were verified before they were moved to configs dir.
+
+    Args:
+        bundle (str): Bundle name.
+        bundle_manifest (dict[str, Any]): Bundle information from manifest.
+
+    """
+    stamp_stats = _get_stamp_stats(bundle_manifest["files"])
+    if stamp_stats is None:
+        return
+    try:
+        _write_verified_stamp(bundle, {
+            "sha256": bundle_manifest["sha256"],
+            "stats": stamp_stats,
+        })
+    except OSError:
+        pass
+
+
+def verify_config_bundle(
+    bundle: str,
+    bundle_manifest: dict[str, Any],
+    max_workers: Optional[int] = None,
+    use_stamp: bool = True,
+) -> list[str]:
+    """Verify files of installed config bundle.
+
+    Args:
+        bundle (str): Bundle name.
+        bundle_manifest (dict[str, Any]): Bundle information from manifest.
+        max_workers (Optional[int]): Number of threads hashing files.
+        use_stamp (bool): Skip hashing if stamp of previous verification
+            is valid.
+
+    Returns:
+        list[str]: Paths of invalid or missing files relative to configs
+            dir.
+
+    """
+    files: dict[str, list[Any]] = bundle_manifest["files"]
+    # Modification times are taken before hashing, so changes during
+    #   verification invalidate the stamp
+    stamp_stats = _get_stamp_stats(files)
+    if use_stamp and stamp_stats is not None:
+        stamp = _get_verified_stamp(bundle)
+        if (
+            stamp is not None
+            and stamp.get("sha256") == bundle_manifest["sha256"]
+            and stamp.get("stats") == stamp_stats
+        ):
+            return []
+
+    invalid = get_invalid_bundle_files(
+        bundle_manifest, max_workers=max_workers
+    )
+    if not invalid and stamp_stats is not None:
+        try:
+            _write_verified_stamp(bundle, {
+                "sha256": bundle_manifest["sha256"],
+                "stats": stamp_stats,
+            })
+        except OSError:
+            pass
+    return invalid
+
+
+def verify_config_install(
+    max_workers: Optional[int] = None,
+    use_stamp: bool = True,
+) -> dict[str, list[str]]:
+    """Verify all installed config bundles.
+
+    Only bundles installed with checksum from manifest are verified,
+        bundles which are not installed are installed lazily.
+
+    Args:
+        max_workers (Optional[int]): Number of threads hashing files.
+        use_stamp (bool): Skip hashing of bundles with valid stamp.
+
+    Returns:
+        dict[str, list[str]]: Invalid files by bundle name, empty if
+            install is healthy.
+
+    """
+    manifest = get_configs_manifest()
+    if manifest is None:
+        return {}
+
+    output = {}
+    for bundle, bundle_manifest in manifest["bundles"].items():
+        if _get_installed_checksum(bundle) != bundle_manifest["sha256"]:
+            continue
+        invalid = verify_config_bundle(
+            bundle, bundle_manifest, max_workers, use_stamp
+        )
+        if invalid:
+            output[bundle] = invalid
+    return output
+
+
+def is_config_install_healthy(use_stamp: bool = True) -> bool:
+    """Check if installed config bundles are intact.
+
+    Args:
+        use_stamp (bool): Skip hashing of bundles with valid stamp.
+
+    Returns:
+        bool: All installed bundles are intact.
+
+    """
+    return not verify_config_install(use_stamp=use_stamp)
+
+
+def needs_config_maintenance() -> bool:
+    """Check stamps of installed bundles without hashing files.
+
+    Returns:
+        bool: Outdated bundles are installed, stamp of an installed bundle
+            is not valid or bundles should be prefetched.
+
+    """
+    if os.getenv(PREFETCH_BUNDLES_ENV, "").strip():
+        return True
+
+    index = get_configs_index()
+    if index is None or not os.path.isdir(BUNDLE_STAMPS_DIR):
+        return False
+
+    if any(
+        bundle not in index["bundles"]
+        for bundle in os.listdir(BUNDLE_STAMPS_DIR)
+    ):
+        return True
+
+    manifest = get_configs_manifest()
+    if manifest is None:
+        return False
+
+    for bundle, bundle_manifest in manifest["bundles"].items():
+        if _get_installed_checksum(bundle) != bundle_manifest["sha256"]:
+            continue
+        stamp = _get_verified_stamp(bundle)
+        if (
+            stamp is None
+            or stamp.get("sha256") != bundle_manifest["sha256"]
+            or stamp.get("stats") != _get_stamp_stats(
+                bundle_manifest["files"]
+            )
+        ):
+            return True
+    return False
+
+
+def repair_config_install() -> list[str]:
+    """Verify installed config bundles and reinstall broken bundles.
+
+    Returns:
+        list[str]: Names of reinstalled bundles.
+
+    """
+    broken = verify_config_install()
+    if not broken:
+        return []
+
+    for bundle, invalid in broken.items():
+        log.warning(
+            f"OCIO configs bundle '{bundle}' is broken,"
+            f" invalid files: {', '.join(invalid[:10])}"
+        )
+    reinstall_config_bundles(broken)
+    return list(broken)
+
+
+def maintain_config_install() -> list[str]:
+    """Remove outdated bundles and reinstall broken installed bundles.
+
+    Bundles defined by prefetch environment variable are installed.
+
+    Returns:
+        list[str]: Names of reinstalled bundles.
+
+    """
+    remove_outdated_bundles()
+    reinstalled = repair_config_install()
+    prefetch_config_bundles()
+    return reinstalled
+
+
+def _maintain_config_install():
+    try:
+        maintain_config_install()
+    except Exception:
+        log.warning("Maintenance of OCIO configs failed.", exc_info=True)
+
+
+def start_config_maintenance() -> threading.Thread:
+    """Run 'maintain_config_install' in background thread.
+
+    Maintenance is started only once per process, so downloads and
+        installs do not slow down resolving of configs dir.
+
+    Returns:
+        threading.Thread: Daemon thread running maintenance.
+
+    """
+    thread = _maintenance_threads.get("thread")
+    if thread is None:
+        thread = threading.Thread(
+            target=_maintain_config_install,
+            name="ayon_ocio_maintenance",
+            daemon=True,
+        )
+        _maintenance_threads["thread"] = thread
+        thread.start()
+    return thread
@@ -0,0 +1,595 @@
+"""Load LUT files distributed with OCIO configs to NumPy arrays.
+
+Supported formats are '.spi1d', '.spi3d', '.cube' and '.csp'. Numeric
+data of LUTs are parsed at once by NumPy instead of line by line.
+
+Parsed LUTs are cached as '.npy' files keyed by sha256 of the LUT file
+content and are loaded back memory mapped, so processes on the same
+machine share single copy of each LUT in page cache.
+
+3D LUT tables are indexed by red, green and blue in this order.
+"""
+from __future__ import annotations
+
+import os
+import re
+import json
+import hashlib
+import tempfile
+from typing import Any, Callable, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ADDON_NAME = "ayon_ocio"
+# Environment variable to override directory of parsed LUTs cache
+LUT_CACHE_ENV = "AYON_OCIO_LUT_CACHE_ROOT"
+# Version of cached data, change when format of cache changes
+LUT_CACHE_VERSION = 2
+_CUBE_COMMENT_REGEX = re.compile(r"#[^\n]*")
+
+# Parsed LUTs by path, size and modification time of file
+_luts_cache: dict[tuple[str, int, int], Union[LUT1D, LUT3D]] = {}
+
+
+class LUT1D:
+    """1D LUT with table for each channel.
+
+    Args:
+        table (np.ndarray): Table with shape (size, 3).
+        domain_min (np.ndarray): Input value mapped to first entry
+            of each channel.
+        domain_max (np.ndarray): Input value mapped to last entry
+            of each channel.
+
+    """
+    dimensions = 1
+
+    def __init__(
+        self,
+        table: np.ndarray,
+        domain_min: np.ndarray,
+        domain_max: np.ndarray,
+    ):
+        self.table = table
+        self.domain_min = domain_min
+        self.domain_max = domain_max
+
+    @property
+    def size(self) -> int:
+        return self.table.shape[0]
+
+    def to_data(self) -> dict[str, Any]:
+        return {
+            "domain_min": self.domain_min.tolist(),
+            "domain_max": self.domain_max.tolist(),
+        }
+
+    @classmethod
+    def from_data(cls, table: np.ndarray, data: dict[str, Any]) -> LUT1D:
+        return cls(
+            table,
+            np.asarray(data["domain_min"], dtype=np.float32),
+            np.asarray(data["domain_max"], dtype=np.float32),
+        )
+
+
+class LUT3D:
+    """3D LUT with optional per channel shaper.
+
+    Shaper maps input values to domain of the cube, it is defined
+        by input and output points of each channel.
+
+    Args:
+        table (np.ndarray): Table with shape (size, size, size, 3)
+            indexed by red, green and blue.
+        domain_min (np.ndarray): Input value mapped to first entry
+            of each axis.
+        domain_max (np.ndarray): Input value mapped to last entry
+            of each axis.
+        shaper (Optional[list[tuple[np.ndarray, np.ndarray]]]): Input
+            and output points of shaper of each channel.
+
+    """
+    dimensions = 3
+
+    def __init__(
+        self,
+        table: np.ndarray,
+        domain_min: np.ndarray,
+        domain_max: np.ndarray,
+        shaper: Optional[list[tuple[np.ndarray, np.ndarray]]] = None,
+    ):
+        self.table = table
+        self.domain_min = domain_min
+        self.domain_max = domain_max
+        self.shaper = shaper
+
+    @property
+    def size(self) -> int:
+        return self.table.shape[0]
+
+    def to_data(self) -> dict[str, Any]:
+        shaper = None
+        if self.shaper is not None:
+            shaper = [
+                [points_in.tolist(), points_out.tolist()]
+                for points_in, points_out in self.shaper
+            ]
+        return {
+            "domain_min": self.domain_min.tolist(),
+            "domain_max": self.domain_max.tolist(),
+            "shaper": shaper,
+        }
+
+    @classmethod
+    def from_data(cls, table: np.ndarray, data: dict[str, Any]) -> LUT3D:
+        shaper = None
+        if data.get("shaper") is not None:
+            shaper = [
+                (
+                    np.asarray(points_in, dtype=np.float32),
+                    np.asarray(points_out, dtype=np.float32),
+                )
+                for points_in, points_out in data["shaper"]
+            ]
+        return cls(
+            table,
+            np.asarray(data["domain_min"], dtype=np.float32),
+            np.asarray(data["domain_max"], dtype=np.float32),
+            shaper,
+        )
+
+
+def _ensure_numpy():
+    if np is None:
+        raise RuntimeError("Loading of LUTs requires 'numpy' module.")
+
+
+def _parse_values(content: str) -> np.ndarray:
+    """Parse whitespace separated numbers at once.
+
+    Parsing stops at first invalid value, so callers validate number
+        of parsed values.
+    """
+    content = content.strip()
+    if not content:
+        return np.empty(0, dtype=np.float32)
+    return np.fromstring(content, dtype=np.float32, sep=" ")
+
+
+def _split_header(
+    content: str, is_data_line: Callable[[str], bool]
+) -> tuple[list[str], str]:
+    """Split content to header lines and data following them."""
+    header = []
+    offset = 0
+    for line in content.splitlines(keepends=True):
+        stripped = line.strip()
+        if stripped and is_data_line(stripped):
+            break
+        if stripped:
+            header.append(stripped)
+        offset += len(line)
+    return header, content[offset:]
+
+
+def _is_number_line(line: str) -> bool:
+    return line[0].isdigit() or line[0] in "-+."
+
+
+def _get_domain(value: float) -> np.ndarray:
+    return np.full(3, value, dtype=np.float32)
+
+
+def parse_spi1d(content: str) -> LUT1D:
+    """Parse Sony Pictures Imageworks 1D LUT.
+
+    Args:
+        content (str): Content of '.spi1d' file.
+
+    Returns:
+        LUT1D: Parsed LUT.
+
+    """
+    header_text, _, data = content.partition("{")
+    data, _, _ = data.partition("}")
+    domain = (0.0, 1.0)
+    size = None
+    components = 1
+    for line in header_text.splitlines():
+        parts = line.split()
+        if not parts:
+            continue
+        key = parts[0].lower()
+        if key == "from":
+            domain = (float(parts[1]), float(parts[2]))
+        elif key == "length":
+            size = int(parts[1])
+        elif key == "components":
+            components = int(parts[1])
+
+    if components not in (1, 3):
+        raise RuntimeError(
+            f"Unsupported number of components {components} of spi1d LUT."
+        )
+    values = _parse_values(data)
+    if size is None:
+        size = values.size // components
+    if values.size != size * components:
+        raise RuntimeError(
+            f"Expected {size * components} values in spi1d LUT"
+            f" but got {values.size}."
+        )
+
+    table = values.reshape(size, components)
+    if components == 1:
+        table = np.repeat(table, 3, axis=1)
+    return LUT1D(table, _get_domain(domain[0]), _get_domain(domain[1]))
+
+
+def parse_spi3d(content: str) -> LUT3D:
+    """Parse Sony Pictures Imageworks 3D LUT.
+
+    Each data line contains indexes of red, green and blue followed by
+        output value.
+
+    Args:
+        content (str): Content of '.spi3d' file.
+
+    Returns:
+        LUT3D: Parsed LUT.
+
+    """
+    lines = content.lstrip().split("\n", 3)
+    if len(lines) < 4 or not lines[0].strip().upper().startswith("SPILUT"):
+        raise RuntimeError("Invalid spi3d LUT header.")
+    sizes = [int(value) for value in lines[2].split()]
+    if len(sizes) != 3:
+        raise RuntimeError("Invalid spi3d LUT size.")
+
+    values = _parse_values(lines[3])
+    if values.size != sizes[0] * sizes[1] * sizes[2] * 6:
+        raise RuntimeError("Invalid number of values in spi3d LUT.")
+    values = values.reshape(-1, 6)
+    indexes = values[:, :3].astype(np.intp)
+    table = np.zeros((*sizes, 3), dtype=np.float32)
+    table[indexes[:, 0], indexes[:, 1], indexes[:, 2]] = values[:, 3:]
+    return LUT3D(table, _get_domain(0.0), _get_domain(1.0))
+
+
+def parse_cube(content: str) -> Union[LUT1D, LUT3D]:
+    """Parse Resolve or Iridas '.cube' LUT.
+
+    Red changes fastest in data of 3D LUT.
+
+    Args:
+        content (str): Content of '.cube' file.
+
+    Returns:
+        Union[LUT1D, LUT3D]: Parsed LUT.
+
+    """
+    header, data = _split_header(content, _is_number_line)
+    size_1d = size_3d = None
+    domain_min = _get_domain(0.0)
+    domain_max = _get_domain(1.0)
+    for line in header:
+        parts = line.split()
+        key = parts[0].upper()
+        if key == "LUT_1D_SIZE":
+            size_1d = int(parts[1])
+        elif key == "LUT_3D_SIZE":
+            size_3d = int(parts[1])
+        elif key == "DOMAIN_MIN":
+            domain_min = np.asarray(parts[1:4], dtype=np.float32)
+        elif key == "DOMAIN_MAX":
+            domain_max = np.asarray(parts[1:4], dtype=np.float32)
+        elif key == "LUT_1D_INPUT_RANGE":
+            domain_min = _get_domain(float(parts[1]))
+            domain_max = _get_domain(float(parts[2]))
+        elif key == "LUT_3D_INPUT_RANGE":
+            domain_min = _get_domain(float(parts[1]))
+            domain_max = _get_domain(float(parts[2]))
+
+    if "#" in data:
+        data = _CUBE_COMMENT_REGEX.sub("", data)
+    values = _parse_values(data)
+    if size_3d is not None:
+        if values.size != size_3d ** 3 * 3:
+            raise RuntimeError(
+                f"Expected {size_3d ** 3 * 3} values in cube LUT"
+                f" but got {values.size}."
+            )
+        table = values.reshape(size_3d, size_3d, size_3d, 3)
+        # Data are ordered blue, green, red with red changing fastest
+        table = np.ascontiguousarray(table.transpose(2, 1, 0, 3))
+        return LUT3D(table, domain_min, domain_max)
+
+    if size_1d is None:
+        raise RuntimeError("Cube LUT does not define size.")
+    if values.size != size_1d * 3:
+        raise RuntimeError(
+            f"Expected {size_1d * 3} values in cube LUT"
+            f" but got {values.size}."
+        )
+    return LUT1D(values.reshape(size_1d, 3), domain_min, domain_max)
+
+
+def interpolate_prelut(
+    values: np.ndarray, points_in: np.ndarray, points_out: np.ndarray
+) -> np.ndarray:
+    """Interpolate csp prelut with cubic Hermite spline, as OCIO does.
+
+    Tangents of inner points are slopes between their neighbors, tangents
+        of end points mirror tangent of the other end of their segment.
+        Prelut with two points is linear. Values are clamped to prelut
+        domain.
+
+    Args:
+        values (np.ndarray): Input values.
+        points_in (np.ndarray): Increasing input points of prelut.
+        points_out (np.ndarray): Output points of prelut.
+
+    Returns:
+        np.ndarray: Interpolated values.
+
+    """
+    points_in = np.asarray(points_in, dtype=np.float64)
+    points_out = np.asarray(points_out, dtype=np.float64)
+    count = points_in.size
+    if count < 3:
+        return np.interp(values, points_in, points_out).astype(values.dtype)
+
+    widths = np.diff(points_in)
+    deltas = np.diff(points_out)
+    slopes = np.zeros(count)
+    slopes[1:-1] = (
+        (points_out[2:] - points_out[:-2]) / (points_in[2:] - points_in[:-2])
+    )
+    # Tangents of segment start and end scaled to segment width
+    tangents_start = slopes[:-1] * widths
+    tangents_end = slopes[1:] * widths
+    tangents_start[0] = 2.0 * deltas[0] - tangents_end[0]
+    tangents_end[-1] = 2.0 * deltas[-1] - tangents_start[-1]
+
+    clamped = np.clip(values, points_in[0], points_in[-1])
+    indexes = np.clip(
+        np.searchsorted(points_in, clamped, side="right") - 1, 0, count - 2
+    )
+    t = (clamped - points_in[indexes]) / widths[indexes]
+    t2 = t * t
+    t3 = t2 * t
+    output = (
+        (2.0 * t3 - 3.0 * t2 + 1.0) * points_out[indexes]
+        + (t3 - 2.0 * t2 + t) * tangents_start[indexes]
+        + (3.0 * t2 - 2.0 * t3) * points_out[indexes + 1]
+        + (t3 - t2) * tangents_end[indexes]
+    )
+    return output.astype(values.dtype)
+
+
+def parse_csp(content: str) -> Union[LUT1D, LUT3D]:
+    """Parse Cinespace '.csp' LUT.
+
+    Prelut of each channel is used as shaper of 3D LUT and is applied
+        to table of 1D LUT.
+
+    Args:
+        content (str): Content of '.csp' file.
+
+    Returns:
+        Union[LUT1D, LUT3D]: Parsed LUT.
+
+    """
+    lines = content.lstrip().splitlines()
+    if len(lines) < 2 or lines[0].strip() != "CSPLUTV100":
+        raise RuntimeError("Invalid csp LUT header.")
+    lut_type = lines[1].strip().upper()
+    if lut_type not in ("1D", "3D"):
+        raise RuntimeError(f"Unsupported csp LUT type '{lut_type}'.")
+
+    data_lines = []
+    in_metadata = False
+    for line in lines[2:]:
+        stripped = line.strip()
+        if stripped == "BEGIN METADATA":
+            in_metadata = True
+        elif stripped == "END METADATA":
+            in_metadata = False
+        elif not in_metadata:
+            data_lines.append(line)
+
+    values = _parse_values("\n".join(data_lines))
+    offset = 0
+    shaper = []
+    try:
+        for _ in range(3):
+            count = int(values[offset])
+            offset += 1
+            points_in = values[offset:offset + count]
+            offset += count
+            points_out = values[offset:offset + count]
+            offset += count
+            if points_out.size != count:
+                raise IndexError
+            shaper.append((points_in.copy(), points_out.copy()))
+
+        if lut_type == "1D":
+            size = int(values[offset])
+            offset += 1
+            sizes = (size, )
+        else:
+            sizes = tuple(int(value) for value in values[offset:offset + 3])
+            offset += 3
+    except IndexError:
+        raise RuntimeError("Invalid csp LUT prelut data.")
+
+    count = int(np.prod(sizes)) * 3
+    table = values[offset:offset + count]
+    if table.size != count:
+        raise RuntimeError(
+            f"Expected {count} values in csp LUT but got {table.size}."
+        )
+
+    if lut_type == "1D":
+        table = table.reshape(sizes[0], 3)
+        # Bake prelut to table so LUT has uniform domain
+        domain_min = np.asarray(
+            [points_in[0] for points_in, _ in shaper], dtype=np.float32
+        )
+        domain_max = np.asarray(
+            [points_in[-1] for points_in, _ in shaper], dtype=np.float32
+        )
+        positions = np.linspace(0.0, 1.0, sizes[0], dtype=np.float32)
+        baked = np.empty_like(table)
+        for channel, (points_in, points_out) in enumerate(shaper):
+            samples = domain_min[channel] + positions * (
+                domain_max[channel] - domain_min[channel]
+            )
+            shaped = interpolate_prelut(samples, points_in, points_out)
+            baked[:, channel] = np.interp(
+                shaped, positions, table[:, channel]
+            )
+        return LUT1D(baked, domain_min, domain_max)
+
+    table = table.reshape(sizes[2], sizes[1], sizes[0], 3)
+    table = np.ascontiguousarray(table.transpose(2, 1, 0, 3))
+    return LUT3D(table, _get_domain(0.0), _get_domain(1.0), shaper)
+
+
+LUT_PARSERS: dict[str, Callable[[str], Union[LUT1D, LUT3D]]] = {
+    ".spi1d": parse_spi1d,
+    ".spi3d": parse_spi3d,
+    ".cube": parse_cube,
+    ".csp": parse_csp,
+}
+
+
+def get_lut_cache_dir() -> str:
+    """Directory where parsed LUTs are cached.
+
+    Returns:
+        str: Path to LUTs cache.
+
+    """
+    cache_dir = os.getenv(LUT_CACHE_ENV)
+    if cache_dir:
+        return cache_dir
+
+    try:
+        from ayon_core.lib import get_launcher_local_dir
+
+        return get_launcher_local_dir("addons", ADDON_NAME, "luts")
+
+    except ImportError:
+        from ayon_core.lib import get_ayon_appdirs
+
+        return get_ayon_appdirs("addons", ADDON_NAME, "luts")
+
+
+def _calculate_checksum(content: bytes) -> str:
+    checksum = hashlib.sha256()
+    checksum.update(f"{LUT_CACHE_VERSION}:".encode())
+    checksum.update(content)
+    return checksum.hexdigest()
+
+
+def _load_cached_lut(
+    cache_dir: str, checksum: str
+) -> Optional[Union[LUT1D, LUT3D]]:
+    table_path = os.path.join(cache_dir, f"{checksum}.npy")
+    data_path = os.path.join(cache_dir, f"{checksum}.json")
+    try:
+        with open(data_path, "r") as stream:
+            data = json.load(stream)
+        table = np.load(table_path, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+    lut_cls = LUT3D if data["dimensions"] == 3 else LUT1D
+    return lut_cls.from_data(table, data)
+
+
+def _write_atomic(path: str, write_func: Callable[[Any], None], mode: str):
+    dirpath = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=dirpath, suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as stream:
+            write_func(stream)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _save_cached_lut(
+    cache_dir: str, checksum: str, lut: Union[LUT1D, LUT3D]
+) -> Union[LUT1D, LUT3D]:
+    """Store LUT to cache and return LUT with memory mapped table."""
+    os.makedirs(cache_dir, exist_ok=True)
+    table_path = os.path.join(cache_dir, f"{checksum}.npy")
+    data_path = os.path.join(cache_dir, f"{checksum}.json")
+    data = lut.to_data()
+    data["dimensions"] = lut.dimensions
+    table = np.ascontiguousarray(lut.table, dtype=np.float32)
+    # Table is written first so existing metadata always mean
+    #   complete table
+    _write_atomic(
+        table_path, lambda stream: np.save(stream, table), "wb"
+    )
+    _write_atomic(
+        data_path, lambda stream: json.dump(data, stream), "w"
+    )
+    return _load_cached_lut(cache_dir, checksum) or lut
+
+
+def load_lut(
+    path: str, use_cache: bool = True
+) -> Union[LUT1D, LUT3D]:
+    """Load LUT file.
+
+    LUT is parsed only once per process and parsed data are cached
+        on disk so other processes load them memory mapped.
+
+    Args:
+        path (str): Path to '.spi1d', '.spi3d', '.cube' or '.csp' file.
+        use_cache (bool): Use cache of parsed LUTs.
+
+    Returns:
+        Union[LUT1D, LUT3D]: Loaded LUT, tables loaded from cache are
+            read-only.
+
+    """
+    _ensure_numpy()
+    ext = os.path.splitext(path)[1].lower()
+    parser = LUT_PARSERS.get(ext)
+    if parser is None:
+        raise RuntimeError(f"Unsupported LUT format '{ext}' of '{path}'.")
+
+    path = os.path.abspath(path)
+    file_stat = os.stat(path)
+    key = (path, file_stat.st_size, file_stat.st_mtime_ns)
+    lut = _luts_cache.get(key)
+    if lut is not None and use_cache:
+        return lut
+
+    with open(path, "rb") as stream:
+        content = stream.read()
+
+    if not use_cache:
+        return parser(content.decode("utf-8", errors="replace"))
+
+    cache_dir = get_lut_cache_dir()
+    checksum = _calculate_checksum(content)
+    lut = _load_cached_lut(cache_dir, checksum)
+    if lut is None:
+        lut = parser(content.decode("utf-8", errors="replace"))
+        try:
+            lut = _save_cached_lut(cache_dir, checksum, lut)
+        except OSError:
+            pass
+    _luts_cache[key] = lut
+    return lut
@@ -0,0 +1,512 @@
+"""Apply color transforms to image arrays with NumPy.
+
+Transforms process whole arrays of RGB pixels instead of single pixels.
+LUTs are loaded with 'load_lut' so their tables are shared between
+processes through memory mapped cache.
+
+Images are processed in chunks of pixels so memory used by temporary
+arrays is bounded independently of image resolution, and frames can be
+processed in parallel with a thread or process pool. NumPy releases GIL
+in array operations so threads are used by default.
+"""
+from __future__ import annotations
+
+import os
+import math
+import concurrent.futures
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .lut import LUT1D, LUT3D, interpolate_prelut, load_lut
+
+# Number of pixels processed at once
+DEFAULT_CHUNK_SIZE = 256 * 1024
+# Interpolation of 3D LUTs, names used by OCIO are supported
+INTERPOLATION_TETRAHEDRAL = "tetrahedral"
+INTERPOLATION_TRILINEAR = "trilinear"
+INTERPOLATION_ALIASES = {
+    "best": INTERPOLATION_TETRAHEDRAL,
+    "default": INTERPOLATION_TETRAHEDRAL,
+    "linear": INTERPOLATION_TRILINEAR,
+    INTERPOLATION_TETRAHEDRAL: INTERPOLATION_TETRAHEDRAL,
+    INTERPOLATION_TRILINEAR: INTERPOLATION_TRILINEAR,
+}
+# Smallest value passed to logarithm, same as OCIO uses
+LOG_MIN_VALUE = 1.17549435e-38
+
+
+def _ensure_numpy():
+    if np is None:
+        raise RuntimeError("Color transforms require 'numpy' module.")
+
+
+def _normalize_to_domain(
+    pixels: np.ndarray,
+    domain_min: np.ndarray,
+    domain_max: np.ndarray,
+    size: int,
+) -> np.ndarray:
+    """Convert values to fractional indexes of LUT entries."""
+    scale = (size - 1) / (domain_max - domain_min)
+    positions = (pixels - domain_min) * scale
+    return np.clip(positions, 0.0, size - 1, out=positions)
+
+
+def _split_positions(
+    positions: np.ndarray, size: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Split fractional indexes to lower index and fraction."""
+    indexes = np.minimum(positions.astype(np.intp), size - 2)
+    fractions = positions - indexes
+    return indexes, fractions
+
+
+def apply_lut1d(pixels: np.ndarray, lut: LUT1D) -> np.ndarray:
+    """Apply 1D LUT with linear interpolation.
+
+    Args:
+        pixels (np.ndarray): Pixels with shape (count, 3).
+        lut (LUT1D): LUT to apply.
+
+    Returns:
+        np.ndarray: Transformed pixels.
+
+    """
+    positions = _normalize_to_domain(
+        pixels, lut.domain_min, lut.domain_max, lut.size
+    )
+    indexes, fractions = _split_positions(positions, lut.size)
+    channels = np.arange(3)
+    low = lut.table[indexes, channels]
+    high = lut.table[indexes + 1, channels]
+    return low + (high - low) * fractions
+
+
+def _apply_shaper(
+    pixels: np.ndarray,
+    shaper: list[tuple[np.ndarray, np.ndarray]],
+) -> np.ndarray:
+    output = np.empty_like(pixels)
+    for channel, (points_in, points_out) in enumerate(shaper):
+        output[:, channel] = interpolate_prelut(
+            pixels[:, channel], points_in, points_out
+        )
+    return output
+
+
+def apply_lut3d(
+    pixels: np.ndarray,
+    lut: LUT3D,
+    interpolation: str = INTERPOLATION_TETRAHEDRAL,
+) -> np.ndarray:
+    """Apply 3D LUT with tetrahedral or trilinear interpolation.
+
+    Args:
+        pixels (np.ndarray): Pixels with shape (count, 3).
+        lut (LUT3D): LUT to apply.
+        interpolation (str): 'tetrahedral' or 'trilinear'.
+
+    Returns:
+        np.ndarray: Transformed pixels.
+
+    """
+    interpolation_name = INTERPOLATION_ALIASES.get(interpolation)
+    if interpolation_name is None:
+        raise RuntimeError(
+            f"Unsupported 3D LUT interpolation '{interpolation}'."
+        )
+
+    if lut.shaper is not None:
+        pixels = _apply_shaper(pixels, lut.shaper)
+
+    size = lut.size
+    table = lut.table.reshape(-1, 3)
+    positions = _normalize_to_domain(
+        pixels, lut.domain_min, lut.domain_max, size
+    )
+    indexes, fractions = _split_positions(positions, size)
+    # Strides of red, green and blue in flattened table
+    strides = np.array([size * size, size, 1], dtype=np.intp)
+    base = indexes @ strides
+
+    if interpolation_name == INTERPOLATION_TRILINEAR:
+        output = np.zeros_like(pixels)
+        for corner in range(8):
+            offsets = np.array(
+                [(corner >> 2) & 1, (corner >> 1) & 1, corner & 1]
+            )
+            weights = np.prod(
+                np.where(offsets, fractions, 1.0 - fractions),
+                axis=1,
+                keepdims=True,
+            )
+            output += table[base + offsets @ strides] * weights
+        return output
+
+    # Tetrahedral interpolation walks from lower corner to upper corner
+    #   of cube along axes ordered by descending fraction
+    order = np.argsort(-fractions, axis=1, kind="stable")
+    sorted_fractions = np.take_along_axis(fractions, order, axis=1)
+    first = base + strides[order[:, 0]]
+    second = first + strides[order[:, 1]]
+    last = base + strides.sum()
+
+    fraction_a = sorted_fractions[:, 0:1]
+    fraction_b = sorted_fractions[:, 1:2]
+    fraction_c = sorted_fractions[:, 2:3]
+    return (
+        table[base] * (1.0 - fraction_a)
+        + table[first] * (fraction_a - fraction_b)
+        + table[second] * (fraction_b - fraction_c)
+        + table[last] * fraction_c
+    )
+
+
+class Transform:
+    """Base of color transforms.
+
+    Transform is applied to pixels with shape (count, 3).
+
+    Args:
+        inverse (bool): Apply inverse of the transform.
+
+    """
+    def __init__(self, inverse: bool = False):
+        self.inverse = inverse
+
+    def apply(self, pixels: np.ndarray) -> np.ndarray:
+        return self._apply(pixels, self.inverse)
+
+    def _apply(self, pixels: np.ndarray, inverse: bool) -> np.ndarray:
+        if inverse:
+            return self._apply_inverse(pixels)
+        return self._apply_forward(pixels)
+
+    def _apply_forward(self, pixels: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def _apply_inverse(self, pixels: np.ndarray) -> np.ndarray:
+        raise RuntimeError(
+            f"Inverse of {self.__class__.__name__} is not supported."
+        )
+
+
+class GroupTransform(Transform):
+    """Transforms applied in order, inverse applies them in reverse.
+
+    Args:
+        transforms (Iterable[Transform]): Transforms to apply.
+        inverse (bool): Apply inverse of the transform.
+
+    """
+    def __init__(
+        self, transforms: Iterable[Transform], inverse: bool = False
+    ):
+        super().__init__(inverse)
+        self.transforms = list(transforms)
+
+    def _apply_forward(self, pixels: np.ndarray) -> np.ndarray:
+        for transform in self.transforms:
+            pixels = transform.apply(pixels)
+        return pixels
+
+    def _apply_inverse(self, pixels: np.ndarray) -> np.ndarray:
+        for transform in reversed(self.transforms):
+            pixels = transform._apply(pixels, not transform.inverse)
+        return pixels
+
+
+class MatrixTransform(Transform):
+    """Matrix with offset, alpha part of 4x4 matrix is ignored.
+
+    Args:
+        matrix (Iterable[float]): 3x3 or 4x4 matrix, nested or flat.
+        offset (Optional[Iterable[float]]): Offset added after matrix.
+        inverse (bool): Apply inverse of the transform.
+
+    """
+    def __init__(
+        self,
+        matrix: Iterable[float],
+        offset: Optional[Iterable[float]] = None,
+        inverse: bool = False,
+    ):
+        _ensure_numpy()
+        super().__init__(inverse)
+        matrix = np.asarray(matrix, dtype=np.float64).reshape(-1)
+        side = int(math.isqrt(matrix.size))
+        if side * side != matrix.size or side not in (3, 4):
+            raise RuntimeError("Matrix must have 9 or 16 values.")
+        self.matrix = matrix.reshape(side, side)[:3, :3]
+        if offset is None:
+            offset = np.zeros(3)
+        self.offset = np.asarray(offset, dtype=np.float64)[:3]
+
+    def _apply_forward(self, pixels: np.ndarray) -> np.ndarray:
+        output = pixels @ self.matrix.T.astype(pixels.dtype)
+        output += self.offset.astype(pixels.dtype)
+        return output
+
+    def _apply_inverse(self, pixels: np.ndarray) -> np.ndarray:
+        matrix = np.linalg.inv(self.matrix)
+        output = pixels - self.offset.astype(pixels.dtype)
+        return output @ matrix.T.astype(pixels.dtype)
+
+
+class LogTransform(Transform):
+    """Logarithm with affine parts on both sides, as OCIO LogAffine.
+
+    Forward direction converts linear values to logarithmic
+        'log_side_slope * log(lin_side_slope * x + lin_side_offset)
+        + log_side_offset'. Parameters are scalars or per channel values.
+
+    Args:
+        base (float): Base of logarithm.
+        log_side_slope (Union[float, Iterable[float]]): Log side slope.
+        log_side_offset (Union[float, Iterable[float]]): Log side offset.
+        lin_side_slope (Union[float, Iterable[float]]): Linear side slope.
+        lin_side_offset (Union[float, Iterable[float]]): Linear side
+            offset.
+        inverse (bool): Apply inverse of the transform.
+
+    """
+    def __init__(
+        self,
+        base: float = 2.0,
+        log_side_slope: Union[float, Iterable[float]] = 1.0,
+        log_side_offset: Union[float, Iterable[float]] = 0.0,
+        lin_side_slope: Union[float, Iterable[float]] = 1.0,
+        lin_side_offset: Union[float, Iterable[float]] = 0.0,
+        inverse: bool = False,
+    ):
+        _ensure_numpy()
+        super().__init__(inverse)
+        self.base = float(base)
+        self.log_side_slope = np.asarray(log_side_slope, dtype=np.float32)
+        self.log_side_offset = np.asarray(log_side_offset, dtype=np.float32)
+        self.lin_side_slope = np.asarray(lin_side_slope, dtype=np.float32)
+        self.lin_side_offset = np.asarray(lin_side_offset, dtype=np.float32)
+
+    def _apply_forward(self, pixels: np.ndarray) -> np.ndarray:
+        output = pixels * self.lin_side_slope + self.lin_side_offset
+        np.maximum(output, LOG_MIN_VALUE, out=output)
+        np.log(output, out=output)
+        output *= self.log_side_slope / np.float32(math.log(self.base))
+        output += self.log_side_offset
+        return output
+
+    def _apply_inverse(self, pixels: np.ndarray) -> np.ndarray:
+        output = (pixels - self.log_side_offset) / self.log_side_slope
+        output *= np.float32(math.log(self.base))
+        np.exp(output, out=output)
+        output -= self.lin_side_offset
+        output /= self.lin_side_slope
+        return output
+
+
+class LUTTransform(Transform):
+    """Apply 1D or 3D LUT.
+
+    LUT defined by path is loaded lazily with 'load_lut' and is not
+        pickled, so the transform can be sent to worker processes which
+        load the LUT from memory mapped cache.
+
+    Args:
+        lut (Union[str, LUT1D, LUT3D]): Path to LUT file or loaded LUT.
+        interpolation (str): Interpolation of 3D LUT.
+        inverse (bool): Apply inverse of the transform, supported
+            only for monotonic 1D LUTs.
+
+    """
+    def __init__(
+        self,
+        lut: Union[str, LUT1D, LUT3D],
+        interpolation: str = INTERPOLATION_TETRAHEDRAL,
+        inverse: bool = False,
+    ):
+        super().__init__(inverse)
+        self.path: Optional[str] = None
+        self._lut: Optional[Union[LUT1D, LUT3D]] = None
+        if isinstance(lut, str):
+            self.path = lut
+        else:
+            self._lut = lut
+        self.interpolation = interpolation
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        if self.path is not None:
+            state["_lut"] = None
+        return state
+
+    @property
+    def lut(self) -> Union[LUT1D, LUT3D]:
+        if self._lut is None:
+            self._lut = load_lut(self.path)
+        return self._lut
+
+    def _apply_forward(self, pixels: np.ndarray) -> np.ndarray:
+        lut = self.lut
+        if lut.dimensions == 3:
+            return apply_lut3d(pixels, lut, self.interpolation)
+        return apply_lut1d(pixels, lut)
+
+    def _apply_inverse(self, pixels: np.ndarray) -> np.ndarray:
+        lut = self.lut
+        if lut.dimensions == 3:
+            return super()._apply_inverse(pixels)
+
+        output = np.empty_like(pixels)
+        positions = np.linspace(
+            lut.domain_min, lut.domain_max, lut.size, dtype=np.float32
+        )
+        for channel in range(3):
+            values = lut.table[:, channel]
+            domain = positions[:, channel]
+            if values[0] > values[-1]:
+                values = values[::-1]
+                domain = domain[::-1]
+            # Flat ends are inverted to the input closest to the rest
+            #   of LUT, as OCIO does
+            if values[0] < values[-1]:
+                start = np.count_nonzero(values <= values[0]) - 1
+                end = (
+                    values.size - np.count_nonzero(values >= values[-1]) + 1
+                )
+                values = values[start:end]
+                domain = domain[start:end]
+            output[:, channel] = np.interp(
+                pixels[:, channel], values, domain
+            )
+        return output
+
+
+def apply_transform(
+    image: np.ndarray,
+    transform: Transform,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: int = 1,
+) -> np.ndarray:
+    """Apply transform to image.
+
+    Image is processed in chunks of pixels so temporary arrays have
+        bounded size. Channels after the first three, e.g. alpha, are
+        copied unchanged.
+
+    Args:
+        image (np.ndarray): Image with RGB in last axis, e.g. with shape
+            (height, width, channels).
+        transform (Transform): Transform to apply.
+        chunk_size (int): Number of pixels processed at once.
+        max_workers (int): Number of threads processing chunks.
+
+    Returns:
+        np.ndarray: New float32 image with the same shape.
+
+    """
+    _ensure_numpy()
+    if image.shape[-1] < 3:
+        raise RuntimeError("Image must have at least 3 channels.")
+
+    output = np.array(image, dtype=np.float32, copy=True, order="C")
+    pixels = output.reshape(-1, output.shape[-1])
+
+    def _process_chunk(start: int):
+        chunk = pixels[start:start + chunk_size, :3]
+        chunk[...] = transform.apply(np.ascontiguousarray(chunk))
+
+    starts = range(0, pixels.shape[0], chunk_size)
+    if max_workers <= 1:
+        for start in starts:
+            _process_chunk(start)
+        return output
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        for future in [
+            executor.submit(_process_chunk, start)
+            for start in starts
+        ]:
+            future.result()
+    return output
+
+
+def _process_frame(
+    frame: Any,
+    transform: Transform,
+    load_func: Callable[[Any], np.ndarray],
+    save_func: Callable[[Any, np.ndarray], None],
+    chunk_size: int,
+) -> Any:
+    image = load_func(frame)
+    save_func(frame, apply_transform(image, transform, chunk_size))
+    return frame
+
+
+def process_frames(
+    frames: Iterable[Any],
+    transform: Transform,
+    load_func: Callable[[Any], np.ndarray],
+    save_func: Callable[[Any, np.ndarray], None],
+    max_workers: Optional[int] = None,
+    use_processes: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Any]:
+    """Apply transform to frames in parallel.
+
+    Only limited number of frames is processed at once, so memory is
+        bounded also for long sequences. Functions and transform must be
+        picklable when processes are used.
+
+    Args:
+        frames (Iterable[Any]): Frames identifiers, e.g. file paths.
+        transform (Transform): Transform to apply.
+        load_func (Callable[[Any], np.ndarray]): Load image of frame.
+        save_func (Callable[[Any, np.ndarray], None]): Save transformed
+            image of frame.
+        max_workers (Optional[int]): Number of workers, number of CPUs
+            is used if not set.
+        use_processes (bool): Use process pool instead of thread pool.
+        chunk_size (int): Number of pixels processed at once.
+
+    Yields:
+        Any: Processed frames in order of completion.
+
+    """
+    _ensure_numpy()
+    if not max_workers:
+        max_workers = os.cpu_count() or 1
+
+    executor_cls = concurrent.futures.ThreadPoolExecutor
+    if use_processes:
+        executor_cls = concurrent.futures.ProcessPoolExecutor
+
+    max_pending = max_workers * 2
+    frames_iter = iter(frames)
+    with executor_cls(max_workers) as executor:
+        pending = set()
+        while True:
+            for frame in frames_iter:
+                pending.add(executor.submit(
+                    _process_frame,
+                    frame,
+                    transform,
+                    load_func,
+                    save_func,
+                    chunk_size,
+                ))
+                if len(pending) >= max_pending:
+                    break
+
+            if not pending:
+                break
+
+            done, pending = concurrent.futures.wait(
+                pending,
+                return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                yield future.result()
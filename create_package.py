@@ -13,9 +13,9 @@ Format of package folder:
 ADDON_REPO/package/{addon name}/{addon version}
 
 You can specify `--output_dir` in arguments to change output directory where
-package will be created. Existing package directory will always be purged if
-already present! This could be used to create package directly in server folder
-if available.
+package will be created. Existing package directory will always be synchronized
+with package content and other files in it are removed! This could be used
+to create package directly in server folder if available.
 
 Package contains server side files directly,
 client side code zipped in `private` subfolder.
@@ -25,20 +25,51 @@ import os
 import sys
 import re
 import io
+import json
+import time
+import zlib
+import stat
+import struct
+import tempfile
 import shutil
 import platform
 import argparse
 import logging
 import collections
+import gzip
 import zipfile
+import fnmatch
+import posixpath
 import hashlib
+import threading
 import subprocess
+import importlib.util
+import http.client
+import urllib.error
 import urllib.request
-from typing import Optional, Iterable, Pattern, Union, List, Tuple
+import concurrent.futures
+from typing import (
+    Optional,
+    Iterable,
+    Iterator,
+    Pattern,
+    Union,
+    List,
+    Tuple,
+    Dict,
+    Any,
+    BinaryIO,
+    Set,
+)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 import package
 
-FileMapping = Tuple[Union[str, io.BytesIO], str]
+FileMapping = Tuple[Union[str, BinaryIO, "ZipMember"], str]
 ADDON_NAME: str = package.name
 ADDON_VERSION: str = package.version
 ADDON_CLIENT_DIR: str = package.client_dir
@@ -53,36 +84,129 @@ PRIVATE_ROOT: str = os.path.join(CURRENT_ROOT, "private")
 PUBLIC_ROOT: str = os.path.join(CURRENT_ROOT, "public")
 CLIENT_ROOT: str = os.path.join(CURRENT_ROOT, "client")
 CONFIGS_FOLDER_NAME: str = "OpenColorIOConfigs"
+# Client code is in client zip, each config bundle (folder in configs
+#   folder) is in separate archive listed in configs index
+CLIENT_ZIP_FILENAME: str = "client.zip"
+CONFIGS_ZIP_TEMPLATE: str = "configs_{bundle}.zip"
+CONFIGS_INDEX_FILENAME: str = "configs_index.json"
+CONFIGS_INDEX_VERSION: int = 1
+# Bundle of files directly in configs folder
+CONFIGS_ROOT_BUNDLE: str = "_root"
+# Name of config file in root of '.ocioz' archive
+OCIOZ_CONFIG_NAME: str = "config.ocio"
+# Parser of OCIO configs from client code, it uses only standard library
+#   so it is loaded from file without importing the client package
+OCIO_CONFIG_MODULE_PATH: str = os.path.join(
+    CLIENT_ROOT, ADDON_CLIENT_DIR, "config.py"
+)
+# Precompressed variants of config bundle archives served by server addon
+#   by content encoding, variant is kept only if its size is at most
+#   given ratio of archive size
+ARCHIVE_ENCODINGS: Dict[str, str] = {"gzip": ".gz", "zstd": ".zst"}
+ENCODED_VARIANT_MAX_RATIO: float = 0.95
+ZSTD_LEVEL: int = 19
+# Catalog of OCIO configs with their colorspaces, roles and views
+CONFIGS_CATALOG_FILENAME: str = "configs_catalog.json"
+CONFIGS_CATALOG_VERSION: int = 1
+# Manifest with size and CRC-32 of each file of config bundles, CRC-32
+#   of zip members is used so files are not hashed again
+CONFIGS_MANIFEST_FILENAME: str = "configs_manifest.json"
+CONFIGS_MANIFEST_VERSION: int = 1
+_ACES_VERSION_REGEX: Pattern = re.compile(
+    r"aces[-_ ]?v?(?P<version>\d+(?:\.\d+)*)", re.IGNORECASE
+)
+# Delta package with changed client files between addon versions
+DELTA_MANIFEST_FILENAME: str = "delta.json"
+DELTA_MANIFEST_VERSION: int = 1
+DELTA_FILES_DIR: str = "files"
+CHECKSUMS_CACHE_PATH: str = os.path.join(DOWNLOADS_ROOT, ".checksums.json")
+# Content addressed download cache shared by checkouts, location can be
+#   changed with environment variable, value 'off' disables it
+DOWNLOAD_CACHE_ENV: str = "AYON_OCIO_DOWNLOAD_CACHE"
+DOWNLOAD_CACHE_MAX_SIZE_ENV: str = "AYON_OCIO_DOWNLOAD_CACHE_MAX_SIZE"
+DEFAULT_DOWNLOAD_CACHE_MAX_SIZE: int = 10 * 1024 ** 3
+DOWNLOAD_CACHE_TMP_SUFFIX: str = ".tmp"
+# Build cache with build manifest and client zip of last build
+BUILD_CACHE_ROOT: str = os.path.join(CURRENT_ROOT, ".build_cache")
+BUILD_MANIFEST_PATH: str = os.path.join(BUILD_CACHE_ROOT, "manifest.json")
+BUILD_CHECKSUMS_PATH: str = os.path.join(BUILD_CACHE_ROOT, "checksums.json")
+# Change when content of manifest or cached artifacts changes
+BUILD_MANIFEST_VERSION: int = 8
+# Size of chunks used to read files when calculating checksums
+HASH_CHUNK_SIZE: int = 1024 * 1024
+# Verification modes of downloaded files
+#   - 'full' always calculate checksum of the file
+#   - 'cached' calculate checksum only if file changed since last check
+#   - 'none' do not verify checksum of already downloaded files
+VERIFY_MODES: Tuple[str, ...] = ("full", "cached", "none")
+DEFAULT_VERIFY_MODE: str = "cached"
+# Zip format values used when copying compressed zip members
+_ZIP_FLAG_ENCRYPTED: int = 0x01
+_ZIP_FLAG_COMPRESS_OPTION_1: int = 0x02
+_ZIP_FLAG_DATA_DESCRIPTOR: int = 0x08
+_ZIP64_EXTRA_ID: int = 0x0001
+ZIP_MIN_DATE_TIME: Tuple[int, int, int, int, int, int] = (1980, 1, 1, 0, 0, 0)
+_FH_FILENAME_LENGTH: int = 10
+_FH_EXTRA_FIELD_LENGTH: int = 11
+# Download settings
+DOWNLOAD_WORKERS: int = 4
+DOWNLOAD_RETRIES: int = 5
+# Attempts are counted again when download makes progress, total number
+#   of attempts is still capped
+DOWNLOAD_MAX_ATTEMPTS: int = 20
+DOWNLOAD_TIMEOUT: float = 30.0
+DOWNLOAD_BACKOFF: float = 1.0
+DOWNLOAD_CHUNK_SIZE: int = 1024 * 64
+# Maximum size of intermediate artifacts kept in memory, bigger artifacts
+#   are spooled to temporary files
+DEFAULT_MAX_MEMORY: int = 256 * 1024 ** 2
+# Size of chunks used to copy streams
+STREAM_CHUNK_SIZE: int = 1024 * 1024
+# Number of threads copying files to output directory
+DEFAULT_SYNC_WORKERS: int = min(32, (os.cpu_count() or 1) + 4)
+# Number of processes used to compress zip members
+DEFAULT_JOBS: int = 1
+# Bigger files are compressed in main process to keep memory usage low
+PARALLEL_COMPRESS_MAX_SIZE: int = 64 * 1024 ** 2
+COMPRESSION_METHODS: Dict[str, int] = {
+    "store": zipfile.ZIP_STORED,
+    "deflate": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+# Compression rules '(glob pattern, method, level)' matched against path
+#   in zip file, first matching rule is used. Level 'None' is default level
+#   of the method. Files not matching any rule use compression of zip file.
+DEFAULT_COMPRESSION_RULES: List[Tuple[str, str, Optional[int]]] = [
+    # Nested archives are already compressed
+    ("*.zip", "store", None),
+]
+SIZE_UNITS: Dict[str, int] = {
+    "": 1,
+    "K": 1024,
+    "M": 1024 ** 2,
+    "G": 1024 ** 3,
+}
 
 VERSION_PY_CONTENT = f'''# -*- coding: utf-8 -*-
 """Package declaring AYON addon '{ADDON_NAME}' version."""
 __version__ = "{ADDON_VERSION}"
 '''
 
-# Patterns of directories to be skipped for server part of addon
-IGNORE_DIR_PATTERNS: List[Pattern] = [
-    re.compile(pattern)
-    for pattern in {
-        # Skip directories starting with '.'
-        r"^\.",
-        # Skip any pycache folders
-        "^__pycache__$"
-    }
-]
-
-# Patterns of files to be skipped for server part of addon
-IGNORE_FILE_PATTERNS: List[Pattern] = [
-    re.compile(pattern)
-    for pattern in {
-        # Skip files starting with '.'
-        # NOTE this could be an issue in some cases
-        r"^\.",
-        # Skip '.pyc' files
-        r"\.pyc$"
-    }
+# Patterns of files and directories to be skipped for server part of addon
+#   using '.gitignore' syntax
+IGNORE_PATTERNS: List[str] = [
+    # Skip files and directories starting with '.'
+    # NOTE this could be an issue in some cases
+    ".*",
+    # Skip any pycache folders
+    "__pycache__/",
+    # Skip '.pyc' files
+    "*.pyc",
 ]
 
 OCIO_CONFIGS_FILENAME = "OpenColorIO-Configs-1.0.2.zip"
+OCIO_CONFIGS_URL = f"https://distribute.ynput.io/thirdparty/{OCIO_CONFIGS_FILENAME}"
 # sha256 checksum
 OCIO_CONFIGS_CHECKSUM = "4ac17c1f7de83465e6f51dd352d7117e07e765b66d00443257916c828e35b6ce"
 
@@ -106,63 +230,612 @@ OCIO_SOURCES = [
 ]
 
 
-def download_ocio_zip(log):
-    ocio_zip_path = os.path.join(DOWNLOADS_ROOT, OCIO_CONFIGS_FILENAME)
-    src_url = f"https://distribute.ynput.io/thirdparty/{OCIO_CONFIGS_FILENAME}"
-    os.makedirs(DOWNLOADS_ROOT, exist_ok=True)
-    if os.path.exists(ocio_zip_path):
-        with open(ocio_zip_path, "rb") as stream:
-            file_checksum = hashlib.sha256(stream.read()).hexdigest()
-        if OCIO_CONFIGS_CHECKSUM == file_checksum:
-            log.debug(f"OCIO zip is already downloaded {ocio_zip_path}")
-            return ocio_zip_path
+def _load_ocio_config_module():
+    spec = importlib.util.spec_from_file_location(
+        f"_{ADDON_NAME}_config", OCIO_CONFIG_MODULE_PATH
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
 
-    log.debug(f"OCIO zip from {src_url} -> {ocio_zip_path}")
-    log.info("OCIO zip download - started")
-    urllib.request.urlretrieve(src_url, ocio_zip_path)
-    log.info("OCIO zip download - finished")
-    return ocio_zip_path
 
+ocio_config = _load_ocio_config_module()
 
-def download_ocio_sources(log):
-    """Download all OCIO sources defined in get_ocio_source_paths."""
-    downloaded_sources = []
 
-    for source in OCIO_SOURCES:
-        url = source["url"]
-        subdir = source.get("subdir")
+def _get_file_hash(filepath: str, chunk_size: int = HASH_CHUNK_SIZE):
+    checksum = hashlib.sha256()
+    with open(filepath, "rb") as stream:
+        for chunk in iter(lambda: stream.read(chunk_size), b""):
+            checksum.update(chunk)
+    return checksum
 
-        # For OCIO files, download directly to a temporary file
-        filename = os.path.basename(url)
-        filepath = os.path.join(DOWNLOADS_ROOT, filename)
 
-        subpath = filename
-        if subdir:
-            subpath = os.path.join(subdir, filename)
+def calculate_file_checksum(
+    filepath: str, chunk_size: int = HASH_CHUNK_SIZE
+) -> str:
+    """Calculate sha256 checksum of a file.
+
+    File is read in chunks so memory usage does not grow with file size.
+
+    Args:
+        filepath (str): Path to file.
+        chunk_size (int): Size of chunks read from the file.
+
+    Returns:
+        str: Hex digest of sha256 checksum.
+
+    """
+    return _get_file_hash(filepath, chunk_size).hexdigest()
+
+
+class ChecksumCache:
+    """Sidecar manifest of checksums of downloaded files.
+
+    Checksum of a file is stored with its size, modification time and inode.
+    If none of them changed since the checksum was calculated, the stored
+    checksum is used instead of reading the whole file again.
+
+    Args:
+        verify_mode (str): One of 'VERIFY_MODES'.
+        cache_path (Optional[str]): Path to manifest file.
+
+    """
+    def __init__(
+        self,
+        verify_mode: str = DEFAULT_VERIFY_MODE,
+        cache_path: Optional[str] = None,
+    ):
+        if verify_mode not in VERIFY_MODES:
+            raise ValueError(
+                f"Invalid verify mode '{verify_mode}'."
+                f" Expected one of {', '.join(VERIFY_MODES)}."
+            )
+        if cache_path is None:
+            cache_path = CHECKSUMS_CACHE_PATH
+        self.verify_mode: str = verify_mode
+        self._cache_path: str = cache_path
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+        self._changed: bool = False
+        self._lock: threading.Lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self._cache_path):
+            return {}
+        try:
+            with open(self._cache_path, "r") as stream:
+                data = json.load(stream)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return data
+
+    @staticmethod
+    def _get_stat_data(filepath: str) -> Dict[str, int]:
+        file_stat = os.stat(filepath)
+        return {
+            "size": file_stat.st_size,
+            "mtime_ns": file_stat.st_mtime_ns,
+            "inode": file_stat.st_ino,
+        }
+
+    def get_checksum(self, filepath: str) -> str:
+        """Get checksum of a file, use cached value if file did not change.
+
+        Args:
+            filepath (str): Path to file.
+
+        Returns:
+            str: Hex digest of sha256 checksum.
+
+        """
+        key = os.path.abspath(filepath)
+        stat_data = self._get_stat_data(key)
+        with self._lock:
+            entry = self._entries.get(key)
+        if (
+            self.verify_mode != "full"
+            and entry is not None
+            and all(entry.get(k) == v for k, v in stat_data.items())
+        ):
+            return entry["sha256"]
+
+        checksum = calculate_file_checksum(key)
+        self._set_entry(key, stat_data, checksum)
+        return checksum
+
+    def set_checksum(self, filepath: str, checksum: str):
+        """Store already known checksum of a file.
+
+        Args:
+            filepath (str): Path to file.
+            checksum (str): Hex digest of sha256 checksum.
+
+        """
+        key = os.path.abspath(filepath)
+        self._set_entry(key, self._get_stat_data(key), checksum)
+
+    def _set_entry(
+        self, key: str, stat_data: Dict[str, Any], checksum: str
+    ):
+        stat_data["sha256"] = checksum
+        with self._lock:
+            self._entries[key] = stat_data
+            self._changed = True
+
+    def is_valid(self, filepath: str, checksum: str) -> bool:
+        """Check if file exists and has expected checksum.
+
+        Args:
+            filepath (str): Path to file.
+            checksum (str): Expected sha256 checksum.
+
+        Returns:
+            bool: File is valid.
+
+        """
+        if not os.path.exists(filepath):
+            return False
+        if self.verify_mode == "none":
+            return True
+        return self.get_checksum(filepath) == checksum
+
+    def save(self):
+        """Store manifest to disk if anything changed."""
+        with self._lock:
+            if not self._changed:
+                return
+            os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+            tmp_path = f"{self._cache_path}.tmp"
+            with open(tmp_path, "w") as stream:
+                json.dump(self._entries, stream, indent=4, sort_keys=True)
+            os.replace(tmp_path, self._cache_path)
+            self._changed = False
+
+
+def _get_default_download_cache_root() -> str:
+    if platform.system().lower() == "windows":
+        cache_root = os.getenv("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        cache_root = os.getenv("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+    return os.path.join(cache_root, "ayon-ocio", "downloads")
+
+
+class DownloadCache:
+    """Content addressed cache of downloaded files shared by checkouts.
+
+    Files are stored by their sha256 checksum so any checkout or build agent
+    using the same cache root can reuse them without network access. Files
+    are published atomically and least recently used files are evicted
+    when cache exceeds maximum size. Last use is stored as access time of
+    the file, so modification time used by 'ChecksumCache' is not changed.
+
+    Args:
+        root (str): Root directory of the cache.
+        max_size (int): Maximum size of the cache in bytes.
+
+    """
+    def __init__(
+        self, root: str, max_size: int = DEFAULT_DOWNLOAD_CACHE_MAX_SIZE
+    ):
+        self.root: str = root
+        self.max_size: int = max_size
+        self._lock: threading.Lock = threading.Lock()
+
+    def get_path(self, checksum: str) -> str:
+        """Path to cached file with checksum.
+
+        Args:
+            checksum (str): Sha256 checksum of file.
+
+        Returns:
+            str: Path in the cache.
+
+        """
+        return os.path.join(self.root, checksum[:2], checksum)
 
-        target_subdir = os.path.join(
-            ADDON_CLIENT_DIR, "configs", CONFIGS_FOLDER_NAME, subpath
+    @staticmethod
+    def _mark_used(path: str):
+        file_stat = os.stat(path)
+        os.utime(path, ns=(time.time_ns(), file_stat.st_mtime_ns))
+
+    def fetch(
+        self,
+        checksum: str,
+        filepath: str,
+        checksum_cache: ChecksumCache,
+    ) -> bool:
+        """Create file from the cache, hardlink is used if possible.
+
+        Args:
+            checksum (str): Expected sha256 checksum.
+            filepath (str): Destination path.
+            checksum_cache (ChecksumCache): Cache of checksums.
+
+        Returns:
+            bool: File was available in the cache.
+
+        """
+        path = self.get_path(checksum)
+        if not os.path.exists(path):
+            return False
+
+        if not checksum_cache.is_valid(path, checksum):
+            os.remove(path)
+            return False
+
+        self._mark_used(path)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        _fast_copy_file(path, filepath, True)
+        checksum_cache.set_checksum(filepath, checksum)
+        return True
+
+    def publish(self, filepath: str, checksum: str):
+        """Add verified file to the cache.
+
+        Args:
+            filepath (str): Path to file with the checksum.
+            checksum (str): Sha256 checksum of the file.
+
+        """
+        path = self.get_path(checksum)
+        if os.path.exists(path):
+            self._mark_used(path)
+            return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = (
+            f"{path}.{os.getpid()}.{threading.get_ident()}"
+            f"{DOWNLOAD_CACHE_TMP_SUFFIX}"
+        )
+        try:
+            try:
+                os.link(filepath, tmp_path)
+            except OSError:
+                shutil.copyfile(filepath, tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._mark_used(path)
+        self.evict(checksum)
+
+    def evict(self, keep_checksum: Optional[str] = None):
+        """Remove least recently used files until cache fits maximum size.
+
+        Args:
+            keep_checksum (Optional[str]): Checksum of file which is never
+                evicted.
+
+        """
+        with self._lock:
+            entries = []
+            total_size = 0
+            for entry, _ in iter_dir_entries(self.root, []):
+                if entry.name.endswith(DOWNLOAD_CACHE_TMP_SUFFIX):
+                    continue
+                try:
+                    file_stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                total_size += file_stat.st_size
+                entries.append((
+                    file_stat.st_atime_ns,
+                    entry.name,
+                    entry.path,
+                    file_stat.st_size,
+                ))
+
+            for _, checksum, path, size in sorted(entries):
+                if total_size <= self.max_size:
+                    break
+                if checksum == keep_checksum:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total_size -= size
+
+
+def get_download_cache() -> Optional[DownloadCache]:
+    """Shared download cache defined by environment variables.
+
+    Cache root is taken from 'AYON_OCIO_DOWNLOAD_CACHE', user cache
+        directory is used if it is not set. Value 'off' disables the cache.
+
+    Returns:
+        Optional[DownloadCache]: Download cache or None if disabled.
+
+    """
+    root = os.getenv(DOWNLOAD_CACHE_ENV)
+    if root is not None and root.strip().lower() == "off":
+        return None
+    if not root:
+        root = _get_default_download_cache_root()
+
+    max_size = DEFAULT_DOWNLOAD_CACHE_MAX_SIZE
+    max_size_value = os.getenv(DOWNLOAD_CACHE_MAX_SIZE_ENV)
+    if max_size_value:
+        max_size = parse_size(max_size_value)
+    return DownloadCache(root, max_size)
+
+
+class DownloadError(Exception):
+    """Download of a file failed and should not be retried."""
+
+
+def _download_to_part_file(
+    url: str, part_path: str, timeout: float, chunk_size: int
+) -> str:
+    """Download url to '.part' file, resume if file already exists.
+
+    Checksum is calculated from the downloaded chunks so the file does not
+        have to be read again once downloaded. Only already downloaded part
+        of a file is read when download is resumed.
+
+    Args:
+        url (str): Url to download.
+        part_path (str): Path to partial file.
+        timeout (float): Timeout of socket operations in seconds.
+        chunk_size (int): Size of chunks read from the response.
+
+    Returns:
+        str: Hex digest of sha256 checksum of the partial file.
+
+    """
+    offset = 0
+    if os.path.exists(part_path):
+        offset = os.path.getsize(part_path)
+
+    request = urllib.request.Request(url)
+    if offset:
+        request.add_header("Range", f"bytes={offset}-")
+
+    try:
+        response = urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as exc:
+        # Partial file is already complete
+        if exc.code == 416 and offset:
+            return calculate_file_checksum(part_path)
+        if 400 <= exc.code < 500:
+            raise DownloadError(
+                f"Failed to download '{url}': {exc.code} {exc.reason}"
+            ) from exc
+        raise
+
+    with response:
+        mode = "ab"
+        # Server ignored the range request and sent whole file
+        if response.status != 206:
+            mode = "wb"
+            checksum = hashlib.sha256()
+        else:
+            content_range = response.getheader("Content-Range") or ""
+            match = re.match(r"bytes (\d+)-", content_range.strip())
+            if match is None or int(match.group(1)) != offset:
+                # Appended content would not continue the partial file
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                raise http.client.HTTPException(
+                    f"Unexpected Content-Range '{content_range}',"
+                    f" expected start {offset}"
+                )
+            checksum = _get_file_hash(part_path)
+        expected_size = response.getheader("Content-Length")
+        received_size = 0
+        with open(part_path, mode) as stream:
+            for chunk in iter(lambda: response.read(chunk_size), b""):
+                stream.write(chunk)
+                checksum.update(chunk)
+                received_size += len(chunk)
+
+    if expected_size is not None and received_size < int(expected_size):
+        raise http.client.IncompleteRead(
+            b"", int(expected_size) - received_size
         )
-        downloaded_sources.append(
-            (filepath, target_subdir)
+    return checksum.hexdigest()
+
+
+def download_file(
+    url: str,
+    filepath: str,
+    checksum: str,
+    checksum_cache: ChecksumCache,
+    log: logging.Logger,
+    retries: int = DOWNLOAD_RETRIES,
+    timeout: float = DOWNLOAD_TIMEOUT,
+    backoff: float = DOWNLOAD_BACKOFF,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    max_attempts: int = DOWNLOAD_MAX_ATTEMPTS,
+):
+    """Download file with retries and move it in place once verified.
+
+    File is downloaded to '{filepath}.part' which is resumed with HTTP
+        range requests when connection drops. Partial response which does
+        not start at the end of the partial file discards it. The file is
+        moved to 'filepath' only when its checksum matches.
+
+    Args:
+        url (str): Url to download.
+        filepath (str): Destination path.
+        checksum (str): Expected sha256 checksum.
+        checksum_cache (ChecksumCache): Cache of checksums.
+        log (logging.Logger): Logger object.
+        retries (int): Number of attempts without progress before
+            download fails.
+        timeout (float): Timeout of socket operations in seconds.
+        backoff (float): Base delay before retry in seconds, doubled
+            with each attempt.
+        chunk_size (int): Size of chunks read from the response.
+        max_attempts (int): Number of all attempts before download fails,
+            also when download makes progress.
+
+    """
+    part_path = f"{filepath}.part"
+    attempt = 0
+    total_attempts = 0
+    while True:
+        attempt += 1
+        total_attempts += 1
+        part_size = 0
+        if os.path.exists(part_path):
+            part_size = os.path.getsize(part_path)
+        try:
+            file_checksum = _download_to_part_file(
+                url, part_path, timeout, chunk_size
+            )
+            if file_checksum == checksum:
+                break
+            os.remove(part_path)
+            error = (
+                f"Checksum does not match. Expected '{checksum}'"
+                f" got '{file_checksum}'"
+            )
+
+        except DownloadError:
+            raise
+
+        except (OSError, http.client.HTTPException) as exc:
+            error = str(exc)
+            # Reset attempts if download made progress
+            if (
+                os.path.exists(part_path)
+                and os.path.getsize(part_path) > part_size
+            ):
+                attempt = 0
+
+        if attempt >= retries or total_attempts >= max_attempts:
+            raise RuntimeError(
+                f"Failed to download '{url}' after {total_attempts}"
+                f" attempts. {error}"
+            )
+        delay = backoff * (2 ** max(attempt - 1, 0))
+        log.warning(
+            f"Download of '{url}' failed ({error})."
+            f" Retrying in {delay:.1f}s"
         )
+        time.sleep(delay)
 
-        os.makedirs(DOWNLOADS_ROOT, exist_ok=True)
+    os.replace(part_path, filepath)
+    checksum_cache.set_checksum(filepath, checksum)
 
-        if os.path.exists(filepath):
-            with open(filepath, "rb") as stream:
-                file_checksum = hashlib.sha256(stream.read()).hexdigest()
 
-            if source["checksum"] == file_checksum:
-                log.debug(f"OCIO config is already downloaded {filepath}")
-                continue
+def ensure_downloaded(
+    url: str,
+    filepath: str,
+    checksum: str,
+    checksum_cache: ChecksumCache,
+    log: logging.Logger,
+    download_cache: Optional[DownloadCache] = None,
+) -> str:
+    """Download file if it is not downloaded yet or is not valid.
+
+    File is taken from shared download cache if available there, and
+        downloaded files are published to the cache.
+
+    Args:
+        url (str): Url to download.
+        filepath (str): Destination path.
+        checksum (str): Expected sha256 checksum.
+        checksum_cache (ChecksumCache): Cache of checksums.
+        log (logging.Logger): Logger object.
+        download_cache (Optional[DownloadCache]): Shared download cache.
+
+    Returns:
+        str: Path to downloaded file.
+
+    """
+    if checksum_cache.is_valid(filepath, checksum):
+        log.debug(f"File is already downloaded {filepath}")
+        if download_cache is not None:
+            download_cache.publish(filepath, checksum)
+        return filepath
+
+    if (
+        download_cache is not None
+        and download_cache.fetch(checksum, filepath, checksum_cache)
+    ):
+        log.info(f"Using {url} from download cache {download_cache.root}")
+        return filepath
+
+    log.debug(f"Download from {url} -> {filepath}")
+    log.info(f"Download from {url} - started")
+    download_file(url, filepath, checksum, checksum_cache, log)
+    log.info(f"Download from {url} - finished")
+    if download_cache is not None:
+        download_cache.publish(filepath, checksum)
+    return filepath
+
+
+def submit_downloads(
+    executor: concurrent.futures.Executor,
+    downloads: List[Tuple[str, str, str]],
+    log: logging.Logger,
+    checksum_cache: ChecksumCache,
+    download_cache: Optional[DownloadCache] = None,
+) -> List[concurrent.futures.Future]:
+    """Submit downloads to executor.
+
+    Each future returns path to downloaded file.
+
+    Args:
+        executor (concurrent.futures.Executor): Executor running downloads.
+        downloads (List[Tuple[str, str, str]]): Url, destination path and
+            sha256 checksum of each file.
+        log (logging.Logger): Logger object.
+        checksum_cache (ChecksumCache): Cache of checksums.
+        download_cache (Optional[DownloadCache]): Shared download cache.
+
+    Returns:
+        List[concurrent.futures.Future]: Futures of downloads.
+
+    """
+    os.makedirs(DOWNLOADS_ROOT, exist_ok=True)
+    return [
+        executor.submit(
+            ensure_downloaded,
+            url,
+            filepath,
+            checksum,
+            checksum_cache,
+            log,
+            download_cache,
+        )
+        for url, filepath, checksum in downloads
+    ]
 
-        log.debug(f"OCIO config from {url} -> {filepath}")
-        log.info(f"OCIO config download from {url} - started")
-        urllib.request.urlretrieve(url, filepath)
-        log.info(f"OCIO config download from {url} - finished")
 
-    return downloaded_sources
+def get_ocio_sources_info() -> List[Dict[str, str]]:
+    """Information about OCIO sources defined in 'OCIO_SOURCES'.
+
+    Returns:
+        List[Dict[str, str]]: Url, checksum, download path and destination
+            subpath in client code of each source.
+
+    """
+    output = []
+    for source in OCIO_SOURCES:
+        url = source["url"]
+        subdir = source.get("subdir")
+
+        filename = os.path.basename(url)
+        subpath = filename
+        if subdir:
+            subpath = os.path.join(subdir, filename)
+
+        output.append({
+            "url": url,
+            "checksum": source["checksum"],
+            "filepath": os.path.join(DOWNLOADS_ROOT, filename),
+            "dst_subpath": os.path.join(
+                ADDON_CLIENT_DIR, "configs", CONFIGS_FOLDER_NAME, subpath
+            ),
+        })
+    return output
 
 
 class ZipFileLongPaths(zipfile.ZipFile):
@@ -185,6 +858,329 @@ class ZipFileLongPaths(zipfile.ZipFile):
 
         return super()._extract_member(member, tpath, pwd)  # type: ignore
 
+    def write_zip_member(self, member: "ZipMember", arcname: str):
+        """Copy member of other zip file without recompression.
+
+        Compressed data are copied as they are, with CRC and sizes of the
+            source member. Only the path in archive is changed.
+
+        Args:
+            member (ZipMember): Member of source zip file.
+            arcname (str): Path of the member in this zip file.
+
+        """
+        src_info = member.info
+        zinfo = zipfile.ZipInfo(arcname, src_info.date_time)
+        zinfo.compress_type = src_info.compress_type
+        zinfo.create_system = src_info.create_system
+        zinfo.external_attr = src_info.external_attr
+        zinfo.CRC = src_info.CRC
+        zinfo.compress_size = src_info.compress_size
+        zinfo.file_size = src_info.file_size
+        # Sizes are known so data descriptor is not used
+        zinfo.flag_bits = src_info.flag_bits & ~_ZIP_FLAG_DATA_DESCRIPTOR
+        zinfo.extra = zipfile._strip_extra(  # type: ignore
+            src_info.extra, (_ZIP64_EXTRA_ID,)
+        )
+
+        self.write_compressed(zinfo, member.iter_raw_chunks())
+
+    def get_file_zinfo(
+        self,
+        filepath: str,
+        arcname: str,
+        compress_type: Optional[int] = None,
+        compresslevel: Optional[int] = None,
+    ) -> zipfile.ZipInfo:
+        """Create info of file member same way as 'write' does.
+
+        Args:
+            filepath (str): Path to source file.
+            arcname (str): Path of the member in this zip file.
+            compress_type (Optional[int]): Compression method, compression
+                of zip file is used if not set.
+            compresslevel (Optional[int]): Compression level, level of zip
+                file is used if not set.
+
+        Returns:
+            zipfile.ZipInfo: Info of the member without CRC and sizes.
+
+        """
+        zinfo = zipfile.ZipInfo.from_file(
+            filepath, arcname, strict_timestamps=self._strict_timestamps
+        )
+        if compress_type is None:
+            compress_type = self.compression
+        if compresslevel is None:
+            compresslevel = self.compresslevel
+        zinfo.compress_type = compress_type
+        zinfo._compresslevel = compresslevel  # type: ignore
+        zinfo.flag_bits = 0x00
+        if zinfo.compress_type == zipfile.ZIP_LZMA:
+            # Compressed data includes an end-of-stream (EOS) marker
+            zinfo.flag_bits |= _ZIP_FLAG_COMPRESS_OPTION_1
+        return zinfo
+
+    def write_compressed(
+        self,
+        zinfo: zipfile.ZipInfo,
+        chunks: Iterable[bytes],
+        zip64: Optional[bool] = None,
+    ):
+        """Write already compressed data of a member.
+
+        Args:
+            zinfo (zipfile.ZipInfo): Info of the member with filled CRC,
+                compressed and uncompressed size.
+            chunks (Iterable[bytes]): Compressed data.
+            zip64 (Optional[bool]): Use zip64 extension in local header,
+                decided by sizes if not set.
+
+        """
+        with self._lock:
+            if self._writing:
+                raise ValueError(
+                    "Can't write to ZIP archive while an open writing"
+                    " handle exists"
+                )
+            self._writecheck(zinfo)
+            self._didModify = True
+            if self._seekable:
+                self.fp.seek(self.start_dir)
+            zinfo.header_offset = self.fp.tell()
+            self.fp.write(zinfo.FileHeader(zip64))
+            for chunk in chunks:
+                self.fp.write(chunk)
+            self.start_dir = self.fp.tell()
+            self.filelist.append(zinfo)
+            self.NameToInfo[zinfo.filename] = zinfo
+
+
+def get_deterministic_date_time() -> Tuple[int, int, int, int, int, int]:
+    """Date and time of members in deterministic zip files.
+
+    Uses 'SOURCE_DATE_EPOCH' environment variable if set, otherwise the
+        lowest date supported by zip format.
+
+    Returns:
+        Tuple[int, int, int, int, int, int]: Date and time.
+
+    """
+    source_date_epoch = os.getenv("SOURCE_DATE_EPOCH")
+    if source_date_epoch:
+        date_time = time.gmtime(int(source_date_epoch))[:6]
+        if date_time >= ZIP_MIN_DATE_TIME:
+            return date_time
+    return ZIP_MIN_DATE_TIME
+
+
+class DeterministicZipFile(ZipFileLongPaths):
+    """Zip file with normalized member attributes.
+
+    Date and time, permissions, creator system and extra fields of all
+        written members are normalized, so same content produces same zip
+        file on any machine.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._date_time = get_deterministic_date_time()
+
+    def _writecheck(self, zinfo):
+        # Called for each member before its header is written
+        zinfo.date_time = self._date_time
+        zinfo.create_system = 3
+        mode = 0o644
+        if (zinfo.external_attr >> 16) & 0o111:
+            mode = 0o755
+        zinfo.external_attr = (stat.S_IFREG | mode) << 16
+        zinfo.extra = b""
+        return super()._writecheck(zinfo)  # type: ignore
+
+
+class SortedZipFile(DeterministicZipFile):
+    """Deterministic zip file with members sorted by path.
+
+    Members are written to a temporary zip file in order they come, so
+        writing does not wait for all sources, e.g. for all downloads.
+        When zip file is closed, members are copied sorted by path to
+        the target without recompression.
+
+    Args:
+        file (Union[str, BinaryIO]): Path or stream of target zip file.
+        mode (str): Only 'w' is supported.
+        compression (int): Compression method of members.
+        **kwargs: Other arguments of 'zipfile.ZipFile'.
+
+    """
+    def __init__(
+        self,
+        file: Union[str, BinaryIO],
+        mode: str = "w",
+        compression: int = zipfile.ZIP_STORED,
+        **kwargs,
+    ):
+        if mode != "w":
+            raise ValueError(
+                f"Sorted zip file does not support mode '{mode}'."
+            )
+        staging_dir = None
+        if isinstance(file, str):
+            staging_dir = os.path.dirname(os.path.abspath(file))
+        fd, staging_path = tempfile.mkstemp(suffix=".zip", dir=staging_dir)
+        os.close(fd)
+        self._target: Union[str, BinaryIO] = file
+        self._target_kwargs: Dict[str, Any] = kwargs
+        self._staging_path: str = staging_path
+        super().__init__(staging_path, mode, compression, **kwargs)
+
+    def close(self):
+        if self.fp is None:
+            return
+        try:
+            super().close()
+            with DeterministicZipFile(
+                self._target, "w", self.compression, **self._target_kwargs
+            ) as zipf:
+                for zinfo in sorted(
+                    self.filelist, key=lambda info: info.filename
+                ):
+                    zipf.write_zip_member(
+                        ZipMember(self._staging_path, zinfo), zinfo.filename
+                    )
+        finally:
+            if os.path.exists(self._staging_path):
+                os.remove(self._staging_path)
+
+
+def _compress_file(
+    filepath: str, compress_type: int, compresslevel: Optional[int]
+) -> Tuple[bytes, int, int, float]:
+    """Compress file content for zip member.
+
+    Used in worker processes of parallel zip writing.
+
+    Args:
+        filepath (str): Path to file.
+        compress_type (int): Zip compression method.
+        compresslevel (Optional[int]): Compression level.
+
+    Returns:
+        Tuple[bytes, int, int, float]: Compressed data, CRC-32, size of
+            uncompressed data and compression time in seconds.
+
+    """
+    start = time.perf_counter()
+    compressor = zipfile._get_compressor(  # type: ignore
+        compress_type, compresslevel
+    )
+    crc = 0
+    file_size = 0
+    chunks = []
+    with open(filepath, "rb") as stream:
+        for chunk in iter(lambda: stream.read(STREAM_CHUNK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+            file_size += len(chunk)
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+            chunks.append(chunk)
+
+    if compressor is not None:
+        chunks.append(compressor.flush())
+    seconds = time.perf_counter() - start
+    return b"".join(chunks), crc, file_size, seconds
+
+
+class ZipMember:
+    """Member of existing zip file used as source in files mapping.
+
+    Member data are read directly from the zip file when needed, so
+        members do not have to be held in memory.
+
+    Args:
+        zip_path (str): Path to zip file.
+        info (zipfile.ZipInfo): Info of the member.
+
+    """
+    def __init__(self, zip_path: str, info: zipfile.ZipInfo):
+        if info.flag_bits & _ZIP_FLAG_ENCRYPTED:
+            raise ValueError(
+                f"Encrypted zip member '{info.filename}' is not supported."
+            )
+        self.zip_path: str = zip_path
+        self.info: zipfile.ZipInfo = info
+
+    def _get_data_offset(self, stream) -> int:
+        stream.seek(self.info.header_offset)
+        header = stream.read(zipfile.sizeFileHeader)
+        fheader = struct.unpack(zipfile.structFileHeader, header)
+        if fheader[0] != zipfile.stringFileHeader:
+            raise zipfile.BadZipFile(
+                f"Bad magic number for file header of '{self.info.filename}'"
+            )
+        return (
+            self.info.header_offset
+            + zipfile.sizeFileHeader
+            + fheader[_FH_FILENAME_LENGTH]
+            + fheader[_FH_EXTRA_FIELD_LENGTH]
+        )
+
+    def iter_raw_chunks(
+        self, chunk_size: int = HASH_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Iterate over compressed data of the member.
+
+        Args:
+            chunk_size (int): Maximum size of chunks.
+
+        Yields:
+            bytes: Chunk of compressed data.
+
+        """
+        with open(self.zip_path, "rb") as stream:
+            stream.seek(self._get_data_offset(stream))
+            remaining = self.info.compress_size
+            while remaining > 0:
+                chunk = stream.read(min(chunk_size, remaining))
+                if not chunk:
+                    raise EOFError(
+                        f"Unexpected end of data of '{self.info.filename}'"
+                    )
+                remaining -= len(chunk)
+                yield chunk
+
+    def iter_chunks(
+        self, chunk_size: int = HASH_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Iterate over decompressed data of the member.
+
+        Args:
+            chunk_size (int): Maximum size of compressed chunks to
+                decompress at once.
+
+        Yields:
+            bytes: Chunk of decompressed data.
+
+        """
+        decompressor = zipfile._get_decompressor(  # type: ignore
+            self.info.compress_type
+        )
+        crc = 0
+        for chunk in self.iter_raw_chunks(chunk_size):
+            if decompressor is not None:
+                chunk = decompressor.decompress(chunk)
+            crc = zlib.crc32(chunk, crc)
+            yield chunk
+
+        if decompressor is not None and hasattr(decompressor, "flush"):
+            chunk = decompressor.flush()
+            crc = zlib.crc32(chunk, crc)
+            yield chunk
+
+        if crc != self.info.CRC:
+            raise zipfile.BadZipFile(
+                f"Bad CRC-32 for file '{self.info.filename}'"
+            )
+
 
 def _get_yarn_executable() -> Union[str, None]:
     cmd = "which"
@@ -223,70 +1219,613 @@ def safe_copy_file(src_path: str, dst_path: str):
     shutil.copy2(src_path, dst_path)
 
 
-def _value_match_regexes(value: str, regexes: Iterable[Pattern]) -> bool:
-    return any(
-        regex.search(value)
-        for regex in regexes
+def parse_size(value: str) -> int:
+    """Parse size in bytes from string with optional unit suffix.
+
+    Example:
+        >>> parse_size("256M")
+        268435456
+
+    Args:
+        value (str): Size e.g. '1024', '512K', '256M' or '1G'.
+
+    Returns:
+        int: Size in bytes.
+
+    """
+    match = re.match(
+        r"^\s*(\d+)\s*([KMG]?)(?:i?B)?\s*$", value, re.IGNORECASE
     )
+    if match is None:
+        raise ValueError(f"Invalid size '{value}'.")
+    number, unit = match.groups()
+    return int(number) * SIZE_UNITS[unit.upper()]
 
 
-def find_files_in_subdir(
-    src_path: str,
-    ignore_file_patterns: Optional[List[Pattern]] = None,
-    ignore_dir_patterns: Optional[List[Pattern]] = None
-) -> List[Tuple[str, str]]:
-    """Find all files to copy in subdirectories of given path.
+def create_spool(max_memory: int = DEFAULT_MAX_MEMORY) -> BinaryIO:
+    """Create temporary stream for intermediate artifacts.
 
-    All files that match any of the patterns in 'ignore_file_patterns' will
-        be skipped and any directories that match any of the patterns in
-        'ignore_dir_patterns' will be skipped with all subfiles.
+    Stream is kept in memory until it reaches 'max_memory' and is rolled
+        over to a temporary file afterwards.
 
     Args:
-        src_path (str): Path to directory to search in.
-        ignore_file_patterns (Optional[list[Pattern]]): List of regexes
-            to match files to ignore.
-        ignore_dir_patterns (Optional[list[Pattern]]): List of regexes
-            to match directories to ignore.
+        max_memory (int): Maximum size of stream kept in memory. Zero means
+            that stream is always a file on disk.
 
     Returns:
-        list[tuple[str, str]]: List of tuples with path to file and parent
-            directories relative to 'src_path'.
-    """
+        BinaryIO: Temporary stream.
 
-    if ignore_file_patterns is None:
-        ignore_file_patterns = IGNORE_FILE_PATTERNS
+    """
+    if max_memory <= 0:
+        return tempfile.TemporaryFile()
+    return tempfile.SpooledTemporaryFile(max_size=max_memory)
 
-    if ignore_dir_patterns is None:
-        ignore_dir_patterns = IGNORE_DIR_PATTERNS
-    output: List[Tuple[str, str]] = []
-    if not os.path.exists(src_path):
-        return output
 
-    hierarchy_queue: collections.deque = collections.deque()
-    hierarchy_queue.append((src_path, []))
-    while hierarchy_queue:
-        item: Tuple[str, str] = hierarchy_queue.popleft()
-        dirpath, parents = item
-        for name in os.listdir(dirpath):
-            path: str = os.path.join(dirpath, name)
-            if os.path.isfile(path):
-                if not _value_match_regexes(name, ignore_file_patterns):
-                    items: List[str] = list(parents)
-                    items.append(name)
-                    output.append((path, os.path.sep.join(items)))
-                continue
+def _get_stream_size(stream: BinaryIO) -> int:
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    return size
 
-            if not _value_match_regexes(name, ignore_dir_patterns):
-                items: List[str] = list(parents)
-                items.append(name)
-                hierarchy_queue.append((path, items))
 
-    return output
+def copy_mapped_file(src: Union[str, BinaryIO, ZipMember], dst_path: str):
+    """Copy source of file mapping to destination path.
 
+    Args:
+        src (Union[str, BinaryIO, ZipMember]): Source of file mapping.
+        dst_path (str): Path to destination file.
 
-def update_client_version(logger):
-    """Update version in client code if version.py is present."""
-    if not ADDON_CLIENT_DIR:
+    """
+    if isinstance(src, str):
+        safe_copy_file(src, dst_path)
+        return
+
+    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+    with open(dst_path, "wb") as stream:
+        if isinstance(src, ZipMember):
+            for chunk in src.iter_chunks():
+                stream.write(chunk)
+        else:
+            src.seek(0)
+            shutil.copyfileobj(src, stream, STREAM_CHUNK_SIZE)
+
+
+def write_mapped_file(
+    zipf: ZipFileLongPaths,
+    src: Union[str, BinaryIO, ZipMember],
+    arcname: str,
+    compress_type: Optional[int] = None,
+    compresslevel: Optional[int] = None,
+):
+    """Write source of file mapping to zip file.
+
+    Streams are written in chunks, so nested archives are not loaded
+        to memory. Members of other zip files are copied without
+        recompression if they already use the compression method and
+        compression level is not specified.
+
+    Args:
+        zipf (ZipFileLongPaths): Zip file opened for writing.
+        src (Union[str, BinaryIO, ZipMember]): Source of file mapping.
+        arcname (str): Path in zip file.
+        compress_type (Optional[int]): Compression method, compression
+            of zip file is used if not set.
+        compresslevel (Optional[int]): Compression level, level of zip
+            file is used if not set.
+
+    """
+    if compress_type is None:
+        compress_type = zipf.compression
+
+    if isinstance(src, str):
+        zipf.write(src, arcname, compress_type, compresslevel)
+        return
+
+    if isinstance(src, ZipMember):
+        if (
+            src.info.compress_type == compress_type
+            and compresslevel is None
+        ):
+            zipf.write_zip_member(src, arcname)
+            return
+        zinfo = zipfile.ZipInfo(arcname, src.info.date_time)
+        zinfo.external_attr = src.info.external_attr
+        zinfo.file_size = src.info.file_size
+        chunks = src.iter_chunks()
+
+    else:
+        zinfo = zipfile.ZipInfo(arcname, time.localtime(time.time())[:6])
+        zinfo.external_attr = 0o600 << 16
+        zinfo.file_size = _get_stream_size(src)
+        chunks = iter(lambda: src.read(STREAM_CHUNK_SIZE), b"")
+
+    if compresslevel is None:
+        compresslevel = zipf.compresslevel
+    zinfo.compress_type = compress_type
+    zinfo._compresslevel = compresslevel  # type: ignore
+    with zipf.open(
+        zinfo, "w", force_zip64=zinfo.file_size > zipfile.ZIP64_LIMIT
+    ) as stream:
+        for chunk in chunks:
+            stream.write(chunk)
+
+
+def _format_size(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class CompressionPolicy:
+    """Compression method and level of zip members by their path.
+
+    Rules are matched in order against path in zip file, first matching
+        rule is used. Files not matching any rule use compression of the
+        zip file.
+
+    Args:
+        rules (Optional[List[Tuple[str, str, Optional[int]]]]): Glob
+            pattern, compression method from 'COMPRESSION_METHODS' and
+            compression level of each rule. Default rules are used
+            if not set.
+
+    """
+    default_pattern: str = "*"
+
+    def __init__(
+        self, rules: Optional[List[Tuple[str, str, Optional[int]]]] = None
+    ):
+        if rules is None:
+            rules = DEFAULT_COMPRESSION_RULES
+        for pattern, method, _level in rules:
+            if method not in COMPRESSION_METHODS:
+                raise ValueError(
+                    f"Invalid compression method '{method}' of '{pattern}'."
+                    f" Expected one of {', '.join(COMPRESSION_METHODS)}."
+                )
+        self.rules: List[Tuple[str, str, Optional[int]]] = list(rules)
+
+    def get_compression(
+        self, arcname: str
+    ) -> Tuple[str, Optional[int], Optional[int]]:
+        """Get compression for path in zip file.
+
+        Args:
+            arcname (str): Path in zip file.
+
+        Returns:
+            Tuple[str, Optional[int], Optional[int]]: Matching pattern,
+                compression method and compression level. Method and level
+                are 'None' if zip file defaults should be used.
+
+        """
+        arcname = arcname.replace("\\", "/")
+        for pattern, method, level in self.rules:
+            if fnmatch.fnmatchcase(arcname, pattern):
+                return pattern, COMPRESSION_METHODS[method], level
+        return self.default_pattern, None, None
+
+
+def parse_compression_rule(value: str) -> Tuple[str, str, Optional[int]]:
+    """Parse compression rule from 'PATTERN=METHOD[:LEVEL]' string.
+
+    Example:
+        >>> parse_compression_rule("*.ocio=deflate:9")
+        ('*.ocio', 'deflate', 9)
+
+    Args:
+        value (str): Compression rule.
+
+    Returns:
+        Tuple[str, str, Optional[int]]: Glob pattern, compression method
+            and compression level.
+
+    """
+    pattern, sep, method = value.rpartition("=")
+    level = None
+    if ":" in method:
+        method, level = method.split(":", 1)
+    if not sep or not pattern or method not in COMPRESSION_METHODS:
+        raise argparse.ArgumentTypeError(
+            f"Invalid compression rule '{value}'."
+            " Expected 'PATTERN=METHOD[:LEVEL]' where method is one of"
+            f" {', '.join(COMPRESSION_METHODS)}."
+        )
+    if level is not None:
+        try:
+            level = int(level)
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f"Invalid compression level in rule '{value}'."
+            )
+    return pattern, method, level
+
+
+class CompressionReport:
+    """Compressed size and compression time of zip members by rule."""
+    def __init__(self):
+        self._stats: Dict[str, List[float]] = {}
+
+    def add(
+        self,
+        pattern: str,
+        file_size: int,
+        compress_size: int,
+        seconds: float,
+    ):
+        stats = self._stats.setdefault(pattern, [0, 0, 0, 0.0])
+        stats[0] += 1
+        stats[1] += file_size
+        stats[2] += compress_size
+        stats[3] += seconds
+
+    def log(self, log: logging.Logger, title: str):
+        """Log report table.
+
+        Args:
+            log (logging.Logger): Logger object.
+            title (str): Title of the report.
+
+        """
+        lines = [
+            f"{title} compression report:",
+            (
+                f"  {'Pattern':<20} {'Files':>7} {'Size':>11}"
+                f" {'Compressed':>11} {'Ratio':>7} {'Time':>8}"
+            ),
+        ]
+        for pattern, stats in sorted(self._stats.items()):
+            count, file_size, compress_size, seconds = stats
+            ratio = 100.0
+            if file_size:
+                ratio = compress_size / file_size * 100
+            lines.append(
+                f"  {pattern:<20} {count:>7} {_format_size(file_size):>11}"
+                f" {_format_size(compress_size):>11} {ratio:>6.1f}%"
+                f" {seconds:>7.2f}s"
+            )
+        log.info("\n".join(lines))
+
+
+def _write_pending_member(
+    report: CompressionReport,
+    item: Tuple[Any, ...],
+):
+    zipf, future, pattern, data = item
+    if future is None:
+        src, arcname, compress_type, compresslevel = data
+        start = time.perf_counter()
+        write_mapped_file(zipf, src, arcname, compress_type, compresslevel)
+        seconds = time.perf_counter() - start
+        zinfo = zipf.filelist[-1]
+        report.add(pattern, zinfo.file_size, zinfo.compress_size, seconds)
+        return
+
+    zinfo = data
+    compressed, crc, file_size, seconds = future.result()
+    zinfo.CRC = crc
+    zinfo.file_size = file_size
+    zinfo.compress_size = len(compressed)
+    zipf.write_compressed(
+        zinfo, [compressed], file_size * 1.05 > zipfile.ZIP64_LIMIT
+    )
+    report.add(pattern, file_size, zinfo.compress_size, seconds)
+
+
+def write_routed_files_mapping(
+    routed_mapping: Iterable[
+        Tuple[ZipFileLongPaths, Union[str, BinaryIO, ZipMember], str]
+    ],
+    jobs: int = DEFAULT_JOBS,
+    compression_policy: Optional[CompressionPolicy] = None,
+) -> CompressionReport:
+    """Write files to multiple zip files.
+
+    Same as 'write_files_mapping' but each item defines zip file where
+        it is written, all zip files share one process pool.
+
+    Args:
+        routed_mapping (Iterable[Tuple[ZipFileLongPaths, Union[str, BinaryIO, ZipMember], str]]):
+            Zip file opened for writing, source and path in zip file.
+        jobs (int): Number of processes used for compression.
+        compression_policy (Optional[CompressionPolicy]): Compression of
+            members, default policy is used if not set.
+
+    Returns:
+        CompressionReport: Sizes and compression times of members.
+
+    """  # noqa: E501
+    if compression_policy is None:
+        compression_policy = CompressionPolicy()
+
+    report = CompressionReport()
+    max_pending = 0
+    executor = None
+    if jobs > 1:
+        max_pending = jobs * 2
+        executor = concurrent.futures.ProcessPoolExecutor(jobs)
+
+    pending: collections.deque = collections.deque()
+    try:
+        for zipf, src, arcname in routed_mapping:
+            pattern, compress_type, compresslevel = (
+                compression_policy.get_compression(arcname)
+            )
+            if (
+                executor is not None
+                and isinstance(src, str)
+                and os.path.getsize(src) <= PARALLEL_COMPRESS_MAX_SIZE
+            ):
+                zinfo = zipf.get_file_zinfo(
+                    src, arcname, compress_type, compresslevel
+                )
+                future = executor.submit(
+                    _compress_file,
+                    src,
+                    zinfo.compress_type,
+                    zinfo._compresslevel,  # type: ignore
+                )
+                pending.append((zipf, future, pattern, zinfo))
+            else:
+                pending.append((
+                    zipf,
+                    None,
+                    pattern,
+                    (src, arcname, compress_type, compresslevel)
+                ))
+
+            while len(pending) > max_pending:
+                _write_pending_member(report, pending.popleft())
+
+        while pending:
+            _write_pending_member(report, pending.popleft())
+
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+    return report
+
+
+def write_files_mapping(
+    zipf: ZipFileLongPaths,
+    files_mapping: Iterable[FileMapping],
+    jobs: int = DEFAULT_JOBS,
+    compression_policy: Optional[CompressionPolicy] = None,
+) -> CompressionReport:
+    """Write files mapping to zip file.
+
+    With more than one job are files compressed in a process pool. Members
+        are written in order of the mapping and are same as if they were
+        written with 'ZipFile.write'.
+
+    Args:
+        zipf (ZipFileLongPaths): Zip file opened for writing.
+        files_mapping (Iterable[FileMapping]): Source and destination
+            path of each file.
+        jobs (int): Number of processes used for compression.
+        compression_policy (Optional[CompressionPolicy]): Compression of
+            members, default policy is used if not set.
+
+    Returns:
+        CompressionReport: Sizes and compression times of members.
+
+    """
+    return write_routed_files_mapping(
+        (
+            (zipf, src, arcname)
+            for src, arcname in files_mapping
+        ),
+        jobs,
+        compression_policy,
+    )
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Convert '.gitignore' glob pattern to regex.
+
+    Single '*' and '?' do not match '/', '**' matches across directories.
+
+    """
+    output = []
+    idx = 0
+    length = len(pattern)
+    while idx < length:
+        char = pattern[idx]
+        if pattern.startswith("**/", idx):
+            output.append("(?:.*/)?")
+            idx += 3
+            continue
+
+        if pattern.startswith("**", idx):
+            output.append(".*")
+            idx += 2
+            continue
+
+        if char == "*":
+            output.append("[^/]*")
+        elif char == "?":
+            output.append("[^/]")
+        elif char == "[":
+            end_idx = pattern.find("]", idx + 2)
+            if end_idx < 0:
+                output.append(re.escape(char))
+            else:
+                chars = pattern[idx + 1:end_idx].replace("\\", "\\\\")
+                if chars.startswith("!"):
+                    chars = "^" + chars[1:]
+                output.append(f"[{chars}]")
+                idx = end_idx
+        elif char == "\\" and idx + 1 < length:
+            idx += 1
+            output.append(re.escape(pattern[idx]))
+        else:
+            output.append(re.escape(char))
+        idx += 1
+    return "".join(output)
+
+
+class IgnoreMatcher:
+    """Match relative paths against '.gitignore' style patterns.
+
+    All patterns are compiled into a single regex. Same as in '.gitignore'
+        the last matching pattern decides, patterns starting with '!'
+        re-include paths, patterns ending with '/' match only directories
+        and patterns without '/' match name in any directory.
+
+    Args:
+        patterns (Iterable[str]): Patterns in '.gitignore' syntax.
+
+    """
+    def __init__(self, patterns: Iterable[str]):
+        self._negated: Dict[str, bool] = {}
+        regexes = []
+        for idx, pattern in enumerate(patterns):
+            pattern = pattern.strip()
+            if not pattern or pattern.startswith("#"):
+                continue
+            negated = pattern.startswith("!")
+            if negated:
+                pattern = pattern[1:]
+            dir_only = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+            if not pattern:
+                continue
+
+            prefix = ""
+            if "/" in pattern:
+                pattern = pattern.lstrip("/")
+            else:
+                prefix = "(?:.*/)?"
+            suffix = "/" if dir_only else "/?"
+
+            group_name = f"p{idx}"
+            self._negated[group_name] = negated
+            regexes.append(
+                f"(?P<{group_name}>{prefix}{_glob_to_regex(pattern)}{suffix})"
+            )
+
+        # Reversed order so the last pattern in list is matched first
+        self._regex: Optional[Pattern] = None
+        if regexes:
+            self._regex = re.compile("|".join(reversed(regexes)), re.DOTALL)
+
+    def match(self, rel_path: str, is_dir: bool) -> bool:
+        """Path should be ignored.
+
+        Args:
+            rel_path (str): Path relative to root using '/' as separator.
+            is_dir (bool): Path is a directory.
+
+        Returns:
+            bool: Path matches ignore patterns.
+
+        """
+        if self._regex is None:
+            return False
+        if is_dir:
+            rel_path += "/"
+        result = self._regex.fullmatch(rel_path)
+        if result is None:
+            return False
+        return not self._negated[result.lastgroup]
+
+
+def iter_dir_entries(
+    src_path: str,
+    ignore_patterns: Optional[Iterable[str]] = None,
+) -> Iterator[Tuple[os.DirEntry, str]]:
+    """Iterate over files in subdirectories of given path.
+
+    Directories are listed with 'os.scandir' so information about type
+        of an entry does not require additional system calls. Directories
+        matching ignore patterns are not walked.
+
+    Args:
+        src_path (str): Path to directory to search in.
+        ignore_patterns (Optional[Iterable[str]]): Patterns in '.gitignore'
+            syntax of files and directories to ignore. 'IGNORE_PATTERNS'
+            are used if not passed.
+
+    Yields:
+        Tuple[os.DirEntry, str]: Entry of file and path relative
+            to 'src_path'.
+
+    """
+    if ignore_patterns is None:
+        ignore_patterns = IGNORE_PATTERNS
+    matcher = IgnoreMatcher(ignore_patterns)
+    if not os.path.isdir(src_path):
+        return
+
+    hierarchy_queue: collections.deque = collections.deque()
+    hierarchy_queue.append((src_path, ""))
+    while hierarchy_queue:
+        dirpath, rel_dir = hierarchy_queue.popleft()
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                rel_path = entry.name
+                if rel_dir:
+                    rel_path = f"{rel_dir}/{entry.name}"
+
+                if entry.is_file():
+                    if not matcher.match(rel_path, False):
+                        yield entry, rel_path
+                elif (
+                    entry.is_dir()
+                    and not matcher.match(rel_path, True)
+                ):
+                    hierarchy_queue.append((entry.path, rel_path))
+
+
+def iter_files_in_subdir(
+    src_path: str,
+    ignore_patterns: Optional[Iterable[str]] = None,
+) -> Iterator[Tuple[str, str]]:
+    """Iterate over files to copy in subdirectories of given path.
+
+    Args:
+        src_path (str): Path to directory to search in.
+        ignore_patterns (Optional[Iterable[str]]): Patterns in '.gitignore'
+            syntax of files and directories to ignore. 'IGNORE_PATTERNS'
+            are used if not passed.
+
+    Yields:
+        Tuple[str, str]: Path to file and path relative to 'src_path'.
+
+    """
+    for entry, rel_path in iter_dir_entries(src_path, ignore_patterns):
+        if os.path.sep != "/":
+            rel_path = rel_path.replace("/", os.path.sep)
+        yield entry.path, rel_path
+
+
+def find_files_in_subdir(
+    src_path: str,
+    ignore_patterns: Optional[Iterable[str]] = None,
+) -> List[Tuple[str, str]]:
+    """Find all files to copy in subdirectories of given path.
+
+    All files and directories that match any of the 'ignore_patterns'
+        will be skipped, ignored directories are skipped with all subfiles.
+
+    Args:
+        src_path (str): Path to directory to search in.
+        ignore_patterns (Optional[Iterable[str]]): Patterns in '.gitignore'
+            syntax of files and directories to ignore. 'IGNORE_PATTERNS'
+            are used if not passed.
+
+    Returns:
+        list[tuple[str, str]]: List of tuples with path to file and parent
+            directories relative to 'src_path'.
+    """
+    return list(iter_files_in_subdir(src_path, ignore_patterns))
+
+
+def update_client_version(logger):
+    """Update version in client code if version.py is present."""
+    if not ADDON_CLIENT_DIR:
         return
 
     version_path: str = os.path.join(
@@ -296,6 +1835,11 @@ def update_client_version(logger):
         logger.debug("Did not find version.py in client directory")
         return
 
+    with open(version_path, "r") as stream:
+        if stream.read() == VERSION_PY_CONTENT:
+            logger.debug("Client version is up to date")
+            return
+
     logger.info("Updating client version")
     with open(version_path, "w") as stream:
         stream.write(VERSION_PY_CONTENT)
@@ -314,7 +1858,381 @@ def build_frontend():
         )
 
 
-def get_client_files_mapping(log) -> List[FileMapping]:
+def _iter_file_transform_sources(data: Any) -> Iterator[str]:
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_file_transform_sources(item)
+        return
+
+    if not isinstance(data, dict):
+        return
+    src = data.get("src")
+    if data.get("_type") == "FileTransform" and isinstance(src, str):
+        yield src
+    for value in data.values():
+        yield from _iter_file_transform_sources(value)
+
+
+def _get_ocio_search_paths(data: Dict[str, Any]) -> List[str]:
+    search_path = data.get("search_path")
+    if isinstance(search_path, list):
+        paths = [str(path) for path in search_path]
+    elif search_path:
+        paths = str(search_path).split(":")
+    else:
+        paths = []
+    return [path for path in paths if path] or ["."]
+
+
+def _is_context_reference(path: str) -> bool:
+    # Absolute paths and context variables depend on machine where
+    #   config is used
+    return posixpath.isabs(path) or "$" in path
+
+
+def _resolve_ocio_reference(
+    src: str,
+    config_dir: str,
+    search_paths: List[str],
+    names: Set[str],
+) -> Tuple[Optional[str], bool]:
+    """Resolve 'FileTransform' source to zip member.
+
+    Returns:
+        Tuple[Optional[str], bool]: Name of zip member or None if not
+            resolved and if the reference depends on context.
+
+    """
+    if _is_context_reference(src):
+        return None, True
+
+    # OCIO uses first search path where file exists
+    for search_path in search_paths:
+        if _is_context_reference(search_path):
+            return None, True
+        path = posixpath.normpath(
+            posixpath.join(config_dir, search_path, src)
+        )
+        if path in names:
+            return path, False
+    return None, False
+
+
+def get_ocio_references(
+    ocio_zip: zipfile.ZipFile,
+    log: logging.Logger,
+    legacy_configs: Optional[Iterable[str]] = None,
+    allow_context_references: bool = False,
+) -> Dict[str, Set[str]]:
+    """Get files referenced by configs in OCIO configs zip.
+
+    Each '.ocio' file of selected configs is parsed and every
+        'FileTransform' source is resolved against 'search_path' of
+        the config, the same way as OCIO does it.
+
+    References which are absolute or use context variables can't be
+        resolved at build time. They fail the build unless
+        'allow_context_references' is set, then they are logged as warning
+        and all files in folder of the config are referenced, so nothing
+        the config might need is pruned. Reference to a missing file
+        always fails the build.
+
+    Args:
+        ocio_zip (zipfile.ZipFile): Opened OCIO configs zip.
+        log (logging.Logger): Logger object.
+        legacy_configs (Optional[Iterable[str]]): Names of config folders
+            to use, all configs are used if not set.
+        allow_context_references (bool): Allow references which are
+            absolute or use context variables.
+
+    Returns:
+        Dict[str, Set[str]]: Names of referenced zip members by name of
+            '.ocio' member.
+
+    Raises:
+        RuntimeError: Selected config does not exist or file references
+            could not be resolved.
+
+    """
+    names = {
+        info.filename
+        for info in ocio_zip.infolist()
+        if not info.is_dir()
+    }
+    configs: Dict[str, List[str]] = collections.defaultdict(list)
+    for name in sorted(names):
+        parts = name.split("/")
+        if len(parts) == 3 and name.endswith(".ocio"):
+            configs[parts[1]].append(name)
+
+    if legacy_configs is None:
+        legacy_configs = list(configs)
+    legacy_configs = set(legacy_configs)
+    missing_configs = legacy_configs - set(configs)
+    if missing_configs:
+        raise RuntimeError(
+            "Legacy OCIO configs were not found: "
+            + ", ".join(sorted(missing_configs))
+        )
+
+    output: Dict[str, Set[str]] = {}
+    unresolved: List[str] = []
+    for config_name in sorted(legacy_configs):
+        for ocio_path in configs[config_name]:
+            references = output.setdefault(ocio_path, set())
+            config_dir = posixpath.dirname(ocio_path)
+            data = ocio_config.parse_ocio_yaml(
+                ocio_zip.read(ocio_path).decode("utf-8", errors="replace")
+            )
+            search_paths = _get_ocio_search_paths(data)
+            context_references: List[str] = []
+            for src in sorted(set(_iter_file_transform_sources(data))):
+                resolved, is_context = _resolve_ocio_reference(
+                    src, config_dir, search_paths, names
+                )
+                if resolved is not None:
+                    references.add(resolved)
+                elif is_context and allow_context_references:
+                    context_references.append(src)
+                else:
+                    unresolved.append(f"{ocio_path}: {src}")
+
+            if context_references:
+                log.warning(
+                    "Context dependent file references in OCIO config"
+                    f" '{ocio_path}', all files in '{config_dir}' are kept:"
+                    "\n" + "\n".join(context_references)
+                )
+                references.update(
+                    name
+                    for name in names
+                    if name.startswith(f"{config_dir}/")
+                    and name != ocio_path
+                )
+
+    if unresolved:
+        raise RuntimeError(
+            "Unresolved file references in OCIO configs:\n"
+            + "\n".join(unresolved)
+        )
+    return output
+
+
+def get_required_ocio_members(
+    ocio_zip: zipfile.ZipFile,
+    log: logging.Logger,
+    legacy_configs: Optional[Iterable[str]] = None,
+    allow_context_references: bool = False,
+) -> Set[str]:
+    """Get members of OCIO configs zip required by selected configs.
+
+    Args:
+        ocio_zip (zipfile.ZipFile): Opened OCIO configs zip.
+        log (logging.Logger): Logger object.
+        legacy_configs (Optional[Iterable[str]]): Names of config folders
+            to use, all configs are used if not set.
+        allow_context_references (bool): Allow references which are
+            absolute or use context variables.
+
+    Returns:
+        Set[str]: Names of required zip members.
+
+    """
+    required: Set[str] = set()
+    for ocio_path, references in get_ocio_references(
+        ocio_zip, log, legacy_configs, allow_context_references
+    ).items():
+        required.add(ocio_path)
+        required |= references
+    return required
+
+
+def create_ocioz(
+    ocio_zip_path: str,
+    ocio_path: str,
+    references: Iterable[str],
+) -> BinaryIO:
+    """Create OCIO config archive '.ocioz' from OCIO configs zip member.
+
+    Config is stored as 'config.ocio' in root of the archive and referenced
+        files keep their path relative to config. Members are copied
+        without recompression.
+
+    Args:
+        ocio_zip_path (str): Path to OCIO configs zip.
+        ocio_path (str): Name of '.ocio' member.
+        references (Iterable[str]): Names of members referenced by config.
+
+    Returns:
+        BinaryIO: Stream with '.ocioz' archive.
+
+    Raises:
+        RuntimeError: Referenced file is outside of config folder.
+
+    """
+    with ZipFileLongPaths(ocio_zip_path) as ocio_zip:
+        infos = {
+            info.filename: info
+            for info in ocio_zip.infolist()
+        }
+
+    config_dir = posixpath.dirname(ocio_path)
+    stream = create_spool()
+    with ZipFileLongPaths(stream, "w", zipfile.ZIP_DEFLATED) as ocioz:
+        ocioz.write_zip_member(
+            ZipMember(ocio_zip_path, infos[ocio_path]), OCIOZ_CONFIG_NAME
+        )
+        for name in sorted(references):
+            arcname = posixpath.relpath(name, config_dir)
+            if arcname.startswith("../"):
+                raise RuntimeError(
+                    f"Config '{ocio_path}' references '{name}' outside of"
+                    " its folder and can't be archived to '.ocioz'."
+                )
+            ocioz.write_zip_member(
+                ZipMember(ocio_zip_path, infos[name]), arcname
+            )
+    stream.seek(0)
+    return stream
+
+
+def _iter_ocio_zip_mapping(
+    ocio_zip_path: str,
+    log: logging.Logger,
+    legacy_configs: Optional[Iterable[str]] = None,
+    use_ocioz: bool = False,
+    allow_context_references: bool = False,
+) -> Iterator[FileMapping]:
+    with ZipFileLongPaths(ocio_zip_path) as ocio_zip:
+        infos = ocio_zip.infolist()
+        references = get_ocio_references(
+            ocio_zip, log, legacy_configs, allow_context_references
+        )
+
+    if use_ocioz:
+        exploded_count = 0
+        for ocio_path, config_references in references.items():
+            exploded_count += len(config_references) + 1
+            dst_path = os.path.join(
+                ADDON_CLIENT_DIR,
+                "configs",
+                f"{os.path.splitext(ocio_path)[0]}.ocioz"
+            )
+            yield (
+                create_ocioz(ocio_zip_path, ocio_path, config_references),
+                dst_path
+            )
+        log.info(
+            f"Archived {exploded_count} files of {len(references)} legacy"
+            " OCIO configs to '.ocioz' archives"
+        )
+        return
+
+    required: Set[str] = set(references)
+    for config_references in references.values():
+        required |= config_references
+
+    pruned_count = 0
+    pruned_size = 0
+    for path_item in infos:
+        if path_item.is_dir():
+            continue
+        if path_item.filename not in required:
+            pruned_count += 1
+            pruned_size += path_item.file_size
+            continue
+        dst_path = os.path.join(
+            ADDON_CLIENT_DIR, "configs", path_item.filename
+        )
+        yield ZipMember(ocio_zip_path, path_item), dst_path
+
+    log.info(
+        f"Pruned {pruned_count} files ({_format_size(pruned_size)})"
+        " not referenced by legacy OCIO configs"
+    )
+
+
+def iter_client_files_mapping(
+    log,
+    verify_mode: str = DEFAULT_VERIFY_MODE,
+    download_workers: int = DOWNLOAD_WORKERS,
+    legacy_configs: Optional[Iterable[str]] = None,
+    use_ocioz: bool = False,
+    allow_context_references: bool = False,
+) -> Iterator[FileMapping]:
+    """Iterate over mapping of client files to destination paths.
+
+    Downloads are started in background. Client code is yielded first and
+        downloaded files are yielded as soon as their download is finished
+        and verified, so following stages can process them while other
+        downloads are still running.
+
+    Args:
+        log (logging.Logger): Logger object.
+        verify_mode (str): Verification mode of downloaded files.
+        download_workers (int): Maximum number of parallel downloads.
+        legacy_configs (Optional[Iterable[str]]): Names of legacy config
+            folders to use, all configs are used if not set.
+        use_ocioz (bool): Ship each legacy config as '.ocioz' archive.
+        allow_context_references (bool): Allow references of legacy
+            configs which are absolute or use context variables.
+
+    Yields:
+        FileMapping: Source and destination path relative to expected
+            output directory.
+
+    """
+    checksum_cache = ChecksumCache(verify_mode)
+    ocio_zip_path = os.path.join(DOWNLOADS_ROOT, OCIO_CONFIGS_FILENAME)
+    sources_info = get_ocio_sources_info()
+    dst_subpaths: Dict[str, str] = {
+        item["filepath"]: item["dst_subpath"]
+        for item in sources_info
+    }
+    downloads = [(OCIO_CONFIGS_URL, ocio_zip_path, OCIO_CONFIGS_CHECKSUM)]
+    downloads.extend(
+        (item["url"], item["filepath"], item["checksum"])
+        for item in sources_info
+    )
+
+    workers = max(1, min(download_workers, len(downloads)))
+    executor = concurrent.futures.ThreadPoolExecutor(workers)
+    try:
+        futures = submit_downloads(
+            executor, downloads, log, checksum_cache, get_download_cache()
+        )
+
+        # Add client code content to zip
+        client_code_dir: str = os.path.join(CLIENT_ROOT, ADDON_CLIENT_DIR)
+        for path, sub_path in iter_files_in_subdir(client_code_dir):
+            yield path, os.path.join(ADDON_CLIENT_DIR, sub_path)
+
+        for future in concurrent.futures.as_completed(futures):
+            filepath = future.result()
+            if filepath == ocio_zip_path:
+                yield from _iter_ocio_zip_mapping(
+                    filepath,
+                    log,
+                    legacy_configs,
+                    use_ocioz,
+                    allow_context_references,
+                )
+            else:
+                yield filepath, dst_subpaths[filepath]
+
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        checksum_cache.save()
+
+
+def get_client_files_mapping(
+    log,
+    verify_mode: str = DEFAULT_VERIFY_MODE,
+    download_workers: int = DOWNLOAD_WORKERS,
+    legacy_configs: Optional[Iterable[str]] = None,
+    use_ocioz: bool = False,
+    allow_context_references: bool = False,
+) -> List[FileMapping]:
     """Mapping of source client code files to destination paths.
 
     Example output:
@@ -329,52 +2247,820 @@ def get_client_files_mapping(log) -> List[FileMapping]:
             )
         ]
 
+    Args:
+        log (logging.Logger): Logger object.
+        verify_mode (str): Verification mode of downloaded files.
+        download_workers (int): Maximum number of parallel downloads.
+        legacy_configs (Optional[Iterable[str]]): Names of legacy config
+            folders to use, all configs are used if not set.
+        use_ocioz (bool): Ship each legacy config as '.ocioz' archive.
+        allow_context_references (bool): Allow references of legacy
+            configs which are absolute or use context variables.
+
     Returns:
         List[FileMapping]: List of path mappings to
             copy. The destination path is relative to expected output
             directory.
 
     """
-    ocio_zip_path = download_ocio_zip(log)
-    ocio_sources_info = download_ocio_sources(log)
+    return list(iter_client_files_mapping(
+        log,
+        verify_mode,
+        download_workers,
+        legacy_configs,
+        use_ocioz,
+        allow_context_references,
+    ))
+
+
+def get_config_bundle(dst_subpath: str) -> Tuple[Optional[str], str]:
+    """Get config bundle of a client file.
+
+    Each directory in configs folder is a bundle, files directly in
+        configs folder belong to 'CONFIGS_ROOT_BUNDLE'.
+
+    Args:
+        dst_subpath (str): Destination path of client file.
+
+    Returns:
+        Tuple[Optional[str], str]: Bundle name and path relative to configs
+            folder. Bundle is 'None' for files that are not configs.
+
+    """
+    path = dst_subpath.replace("\\", "/")
+    prefix = f"{ADDON_CLIENT_DIR}/configs/{CONFIGS_FOLDER_NAME}/"
+    if not path.startswith(prefix):
+        return None, dst_subpath
+    subpath = path[len(prefix):]
+    bundle, sep, _ = subpath.partition("/")
+    if not sep:
+        bundle = CONFIGS_ROOT_BUNDLE
+    return bundle, subpath
+
+
+def _read_mapped_file(src: Union[str, BinaryIO, ZipMember]) -> bytes:
+    if isinstance(src, str):
+        with open(src, "rb") as stream:
+            return stream.read()
+    if isinstance(src, ZipMember):
+        return b"".join(src.iter_chunks())
+    src.seek(0)
+    content = src.read()
+    src.seek(0)
+    return content
+
+
+def _read_ocioz_config(src: Union[str, BinaryIO, ZipMember]) -> bytes:
+    if isinstance(src, ZipMember):
+        src = io.BytesIO(_read_mapped_file(src))
+    elif not isinstance(src, str):
+        src.seek(0)
+    with zipfile.ZipFile(src) as ocioz:
+        content = ocioz.read(OCIOZ_CONFIG_NAME)
+    if not isinstance(src, str):
+        src.seek(0)
+    return content
+
+
+def get_aces_version(*values: Optional[str]) -> Optional[str]:
+    """Find ACES version in names or paths of OCIO config.
+
+    Args:
+        *values (Optional[str]): Config names or paths, first value
+            containing ACES version is used.
+
+    Returns:
+        Optional[str]: ACES version e.g. '1.3' or None if not found.
+
+    """
+    for value in values:
+        if not value:
+            continue
+        match = _ACES_VERSION_REGEX.search(value)
+        if match is not None:
+            return match.group("version")
+    return None
+
+
+def get_config_catalog_entry(
+    src: Union[str, BinaryIO, ZipMember], config_subpath: str
+) -> Dict[str, Any]:
+    """Catalog information about OCIO config.
+
+    Args:
+        src (Union[str, BinaryIO, ZipMember]): Source of '.ocio' file.
+        config_subpath (str): Path of config relative to configs folder.
+
+    Returns:
+        Dict[str, Any]: Catalog entry of config.
+
+    """
+    config_subpath = config_subpath.replace("\\", "/")
+    if config_subpath.endswith(".ocioz"):
+        content = _read_ocioz_config(src).decode("utf-8", errors="replace")
+    else:
+        content = _read_mapped_file(src).decode("utf-8", errors="replace")
+    config = ocio_config.OCIOConfig(ocio_config.parse_ocio_yaml(content))
+    return {
+        "path": config_subpath,
+        "name": config.name,
+        "ocio_profile_version": config.profile_version,
+        "aces_version": get_aces_version(config.name, config_subpath),
+        "colorspaces": sorted(config.colorspaces),
+        "roles": config.roles,
+        "displays": {
+            display: config.get_views(display)
+            for display in config.get_displays()
+        },
+    }
+
+
+def iter_with_configs_catalog(
+    files_mapping: Iterable[FileMapping],
+) -> Iterator[FileMapping]:
+    """Iterate files mapping and add catalog of OCIO configs at the end.
+
+    OCIO configs are parsed while files are iterated, so catalog does not
+        need another pass over files. Config is parsed before its item is
+        yielded, because consumer can read source stream in another
+        thread, e.g. when synchronizing output directory.
+
+    Args:
+        files_mapping (Iterable[FileMapping]): Client files mapping.
+
+    Yields:
+        FileMapping: Items of files mapping and catalog as last item.
+
+    """
+    entries = []
+    for src, dst_subpath in files_mapping:
+        bundle, subpath = get_config_bundle(dst_subpath)
+        if bundle is not None and subpath.endswith((".ocio", ".ocioz")):
+            entries.append(get_config_catalog_entry(src, subpath))
+        yield src, dst_subpath
+
+    content = json.dumps(
+        {
+            "version": CONFIGS_CATALOG_VERSION,
+            "configs": sorted(entries, key=lambda entry: entry["path"]),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    yield (
+        io.BytesIO(content.encode("utf-8")),
+        os.path.join(ADDON_CLIENT_DIR, CONFIGS_CATALOG_FILENAME),
+    )
+
+
+def _get_archive_info(target: Union[str, BinaryIO]) -> Dict[str, Any]:
+    if isinstance(target, str):
+        return {
+            "sha256": calculate_file_checksum(target),
+            "size": os.path.getsize(target),
+        }
+    return {
+        "sha256": _get_stream_checksum(target),
+        "size": _get_stream_size(target),
+    }
+
+
+def _iter_target_chunks(target: Union[str, BinaryIO]) -> Iterator[bytes]:
+    if isinstance(target, str):
+        yield from _iter_stream_chunks(open(target, "rb"))
+        return
+    target.seek(0)
+    for chunk in iter(lambda: target.read(STREAM_CHUNK_SIZE), b""):
+        yield chunk
+    target.seek(0)
+
+
+def _encode_archive(
+    target: Union[str, BinaryIO], encoding: str, stream: BinaryIO
+):
+    if encoding == "gzip":
+        with gzip.GzipFile(
+            filename="", mode="wb", fileobj=stream, mtime=0
+        ) as gzip_stream:
+            for chunk in _iter_target_chunks(target):
+                gzip_stream.write(chunk)
+
+    elif encoding == "zstd":
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        with compressor.stream_writer(stream, closefd=False) as writer:
+            for chunk in _iter_target_chunks(target):
+                writer.write(chunk)
+
+    else:
+        raise ValueError(f"Unknown archive encoding '{encoding}'.")
+
+
+def create_encoded_variants(
+    target: Union[str, BinaryIO],
+    filename: str,
+    max_memory: int = DEFAULT_MAX_MEMORY,
+    output_dir: Optional[str] = None,
+) -> Dict[str, Tuple[Union[str, BinaryIO], Dict[str, Any]]]:
+    """Create precompressed variants of archive served by server addon.
+
+    Variants which are not noticeably smaller than the archive are not
+        kept, e.g. when archive members are already compressed. 'zstd'
+        variant is created only if 'zstandard' module is available.
+
+    Args:
+        target (Union[str, BinaryIO]): Path to archive or stream with it.
+        filename (str): Filename of archive in package.
+        max_memory (int): Maximum size of variant kept in memory. Used only
+            if 'output_dir' is not set.
+        output_dir (Optional[str]): Directory where variants are created,
+            variants are created in temporary streams if not set.
+
+    Returns:
+        Dict[str, Tuple[Union[str, BinaryIO], Dict[str, Any]]]: Variant
+            and its filename, sha256 and size by content encoding.
+
+    """
+    if isinstance(target, str):
+        size = os.path.getsize(target)
+    else:
+        size = _get_stream_size(target)
+
+    output = {}
+    for encoding, suffix in ARCHIVE_ENCODINGS.items():
+        if encoding == "zstd" and zstandard is None:
+            continue
+
+        variant_filename = f"{filename}{suffix}"
+        variant: Union[str, BinaryIO]
+        if output_dir is None:
+            variant = create_spool(max_memory)
+            _encode_archive(target, encoding, variant)
+        else:
+            variant = os.path.join(output_dir, variant_filename)
+            with open(variant, "wb") as stream:
+                _encode_archive(target, encoding, stream)
+
+        info = _get_archive_info(variant)
+        if info["size"] > size * ENCODED_VARIANT_MAX_RATIO:
+            if isinstance(variant, str):
+                os.remove(variant)
+            else:
+                variant.close()
+            continue
+
+        info["filename"] = variant_filename
+        output[encoding] = (variant, info)
+    return output
+
+
+def create_client_archives(
+    log: logging.Logger,
+    verify_mode: str = DEFAULT_VERIFY_MODE,
+    download_workers: int = DOWNLOAD_WORKERS,
+    max_memory: int = DEFAULT_MAX_MEMORY,
+    jobs: int = DEFAULT_JOBS,
+    compression_policy: Optional[CompressionPolicy] = None,
+    deterministic: bool = False,
+    legacy_configs: Optional[Iterable[str]] = None,
+    use_ocioz: bool = False,
+    allow_context_references: bool = False,
+    output_dir: Optional[str] = None,
+) -> List[FileMapping]:
+    """Create client code archive and config bundle archives.
+
+    Client code is in 'client.zip' which is small, config bundles are in
+        separate archives. Client code contains index of bundle archives
+        with their checksums so client can reuse already installed bundles
+        when only code changed. The index is also next to the archives
+        for server addon. Client code contains also manifest with size
+        and CRC-32 of each file of bundles to verify installed configs.
+
+    Args:
+        log (logging.Logger): Logger object.
+        verify_mode (str): Verification mode of downloaded files.
+        download_workers (int): Maximum number of parallel downloads.
+        max_memory (int): Maximum size of archive kept in memory, bigger
+            archives are spooled to temporary file. Used only if
+            'output_dir' is not set.
+        jobs (int): Number of processes used for compression.
+        compression_policy (Optional[CompressionPolicy]): Compression of
+            zip members.
+        deterministic (bool): Create zips with sorted members and
+            normalized attributes.
+        legacy_configs (Optional[Iterable[str]]): Names of legacy config
+            folders to use, all configs are used if not set.
+        use_ocioz (bool): Ship each legacy config as '.ocioz' archive.
+        allow_context_references (bool): Allow references of legacy
+            configs which are absolute or use context variables.
+        output_dir (Optional[str]): Directory where archives are created,
+            archives are created in temporary streams if not set.
+
+    Returns:
+        List[FileMapping]: Archives with destination path in package.
+
+    """
+    log.info("Preparing client archives")
+    files_mapping: Iterable[FileMapping] = iter_client_files_mapping(
+        log,
+        verify_mode,
+        download_workers,
+        legacy_configs,
+        use_ocioz,
+        allow_context_references,
+    )
+    files_mapping = iter_with_configs_catalog(files_mapping)
+    # Members are sorted when archives are closed, so archives are
+    #   written while downloads are running
+    zip_cls = ZipFileLongPaths
+    if deterministic:
+        zip_cls = SortedZipFile
 
-    # Add client code content to zip
+    targets: Dict[Optional[str], Union[str, BinaryIO]] = {}
+    archives: Dict[Optional[str], ZipFileLongPaths] = {}
+
+    def _get_archive(bundle: Optional[str]) -> ZipFileLongPaths:
+        zipf = archives.get(bundle)
+        if zipf is None:
+            filename = CLIENT_ZIP_FILENAME
+            if bundle is not None:
+                filename = CONFIGS_ZIP_TEMPLATE.format(bundle=bundle)
+            target: Union[str, BinaryIO]
+            if output_dir is None:
+                target = create_spool(max_memory)
+            else:
+                target = os.path.join(output_dir, filename)
+            targets[bundle] = target
+            zipf = zip_cls(target, "w", zipfile.ZIP_DEFLATED)
+            archives[bundle] = zipf
+        return zipf
+
+    def _route_mapping():
+        for src, dst_subpath in files_mapping:
+            bundle, arcname = get_config_bundle(dst_subpath)
+            yield _get_archive(bundle), src, arcname
+
+    variants: List[Tuple[Union[str, BinaryIO], str]] = []
+    code_zipf = _get_archive(None)
+    try:
+        report = write_routed_files_mapping(
+            _route_mapping(), jobs, compression_policy
+        )
+        bundles_info = {}
+        bundles_files = {}
+        for bundle, zipf in archives.items():
+            if bundle is None:
+                continue
+            file_count = len(zipf.filelist)
+            bundles_files[bundle] = {
+                zinfo.filename: [zinfo.file_size, f"{zinfo.CRC:08x}"]
+                for zinfo in zipf.filelist
+                if not zinfo.is_dir()
+            }
+            zipf.close()
+            filename = CONFIGS_ZIP_TEMPLATE.format(bundle=bundle)
+            info = _get_archive_info(targets[bundle])
+            info["filename"] = filename
+            info["files"] = file_count
+            info["encodings"] = {}
+            encoded_variants = create_encoded_variants(
+                targets[bundle], filename, max_memory, output_dir
+            )
+            for encoding, (variant, variant_info) in (
+                encoded_variants.items()
+            ):
+                info["encodings"][encoding] = variant_info
+                variants.append((variant, variant_info["filename"]))
+            bundles_info[bundle] = info
+
+        index_content = json.dumps(
+            {
+                "version": CONFIGS_INDEX_VERSION,
+                "bundles": bundles_info,
+            },
+            indent=4,
+            sort_keys=True,
+        )
+        write_mapped_file(
+            code_zipf,
+            io.BytesIO(index_content.encode("utf-8")),
+            os.path.join(ADDON_CLIENT_DIR, CONFIGS_INDEX_FILENAME),
+        )
+        manifest_content = json.dumps(
+            {
+                "version": CONFIGS_MANIFEST_VERSION,
+                "bundles": {
+                    bundle: {
+                        "sha256": bundles_info[bundle]["sha256"],
+                        "files": files,
+                    }
+                    for bundle, files in bundles_files.items()
+                },
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        write_mapped_file(
+            code_zipf,
+            io.BytesIO(manifest_content.encode("utf-8")),
+            os.path.join(ADDON_CLIENT_DIR, CONFIGS_MANIFEST_FILENAME),
+        )
+    finally:
+        for zipf in archives.values():
+            zipf.close()
+
+    report.log(log, "Client archives")
+    output: List[FileMapping] = []
+    for bundle, target in targets.items():
+        if not isinstance(target, str):
+            target.seek(0)
+        filename = CLIENT_ZIP_FILENAME
+        if bundle is not None:
+            filename = CONFIGS_ZIP_TEMPLATE.format(bundle=bundle)
+        output.append((target, f"private/{filename}"))
+    for variant, filename in variants:
+        output.append((variant, f"private/{filename}"))
+
+    # Index is available also to server addon
+    index_target: Union[str, BinaryIO]
+    if output_dir is None:
+        index_target = io.BytesIO(index_content.encode("utf-8"))
+    else:
+        index_target = os.path.join(output_dir, CONFIGS_INDEX_FILENAME)
+        with open(index_target, "w") as stream:
+            stream.write(index_content)
+    output.append((index_target, f"private/{CONFIGS_INDEX_FILENAME}"))
+    return output
+
+
+def sort_files_mapping(
+    files_mapping: Iterable[FileMapping]
+) -> List[FileMapping]:
+    """Sort files mapping by destination path.
+
+    Args:
+        files_mapping (Iterable[FileMapping]): Files mapping.
+
+    Returns:
+        List[FileMapping]: Files mapping sorted by destination path.
+
+    """
+    return sorted(
+        files_mapping,
+        key=lambda item: item[1].replace("\\", "/")
+    )
+
+
+def _hash_json(data: Any) -> str:
+    content = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def get_client_inputs_hash(
+    checksum_cache: ChecksumCache,
+    compression_policy: CompressionPolicy,
+    deterministic: bool = False,
+    legacy_configs: Optional[Iterable[str]] = None,
+    use_ocioz: bool = False,
+    allow_context_references: bool = False,
+) -> str:
+    """Hash of all inputs of client zip.
+
+    Client code files are hashed by content, downloaded files are
+        represented by their expected checksums, so they don't have to be
+        downloaded to calculate the hash.
+
+    Args:
+        checksum_cache (ChecksumCache): Cache of checksums of files.
+        compression_policy (CompressionPolicy): Compression of zip members.
+        deterministic (bool): Client zip is deterministic.
+        legacy_configs (Optional[Iterable[str]]): Names of legacy config
+            folders to use, all configs are used if not set.
+        use_ocioz (bool): Ship each legacy config as '.ocioz' archive.
+        allow_context_references (bool): Allow references of legacy
+            configs which are absolute or use context variables.
+
+    Returns:
+        str: Hex digest of sha256 checksum.
+
+    """
     client_code_dir: str = os.path.join(CLIENT_ROOT, ADDON_CLIENT_DIR)
+    client_files = sorted(
+        (sub_path.replace("\\", "/"), checksum_cache.get_checksum(path))
+        for path, sub_path in iter_files_in_subdir(client_code_dir)
+    )
+    sources = sorted(
+        (item["dst_subpath"].replace("\\", "/"), item["checksum"])
+        for item in get_ocio_sources_info()
+    )
+    return _hash_json({
+        "version": BUILD_MANIFEST_VERSION,
+        "client_files": client_files,
+        "ocio_zip": OCIO_CONFIGS_CHECKSUM,
+        "ocio_sources": sources,
+        "compression": compression_policy.rules,
+        "deterministic": deterministic,
+        "encodings": [
+            encoding
+            for encoding in ARCHIVE_ENCODINGS
+            if encoding != "zstd" or zstandard is not None
+        ],
+        "legacy_configs": (
+            None if legacy_configs is None else sorted(legacy_configs)
+        ),
+        "use_ocioz": use_ocioz,
+        "allow_context_references": allow_context_references,
+    })
 
-    files_mapping: List[FileMapping] = [
-        (path, os.path.join(ADDON_CLIENT_DIR, sub_path))
-        for path, sub_path in find_files_in_subdir(client_code_dir)
-    ]
 
-    with ZipFileLongPaths(ocio_zip_path) as ocio_zip:
-        for path_item in ocio_zip.infolist():
-            if path_item.is_dir():
-                continue
-            src_path = path_item.filename
-            dst_path = os.path.join(ADDON_CLIENT_DIR, "configs", src_path)
-            content = io.BytesIO(ocio_zip.read(src_path))
+def get_package_inputs_hash(
+    base_files_mapping: List[FileMapping],
+    client_inputs_hash: str,
+    skip_zip: bool,
+    checksum_cache: ChecksumCache,
+    compression_policy: CompressionPolicy,
+    deterministic: bool = False,
+) -> str:
+    """Hash of all inputs of addon package.
+
+    Args:
+        base_files_mapping (List[FileMapping]): Server side files mapping.
+        client_inputs_hash (str): Hash of inputs of client zip.
+        skip_zip (bool): Package is created as folder.
+        checksum_cache (ChecksumCache): Cache of checksums of files.
+        compression_policy (CompressionPolicy): Compression of zip members.
+        deterministic (bool): Package zip is deterministic.
+
+    Returns:
+        str: Hex digest of sha256 checksum.
+
+    """
+    base_files = sorted(
+        (dst_subpath.replace("\\", "/"), checksum_cache.get_checksum(src))
+        for src, dst_subpath in base_files_mapping
+    )
+    return _hash_json({
+        "version": BUILD_MANIFEST_VERSION,
+        "base_files": base_files,
+        "client": client_inputs_hash,
+        "skip_zip": skip_zip,
+        "compression": compression_policy.rules,
+        "deterministic": deterministic,
+    })
+
+
+class BuildManifest:
+    """Manifest of previous builds with hashes of their inputs.
+
+    Args:
+        manifest_path (Optional[str]): Path to manifest file.
+
+    """
+    def __init__(self, manifest_path: Optional[str] = None):
+        if manifest_path is None:
+            manifest_path = BUILD_MANIFEST_PATH
+        self._manifest_path: str = manifest_path
+        self._outputs: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self._manifest_path):
+            return {}
+        try:
+            with open(self._manifest_path, "r") as stream:
+                data = json.load(stream)
+        except (OSError, ValueError):
+            return {}
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != BUILD_MANIFEST_VERSION
+        ):
+            return {}
+        return data.get("outputs") or {}
+
+    @staticmethod
+    def _get_output_stat(output_path: str) -> Optional[Dict[str, Any]]:
+        """Size and modification time of output.
+
+        Output directory, e.g. with '--skip-zip', has size and modification
+            time of each file in it, because modification time of directory
+            does not change when nested file changes.
+
+        """
+        if not os.path.exists(output_path):
+            return None
+        if not os.path.isdir(output_path):
+            output_stat = os.stat(output_path)
+            return {
+                "size": output_stat.st_size,
+                "mtime_ns": output_stat.st_mtime_ns,
+            }
+
+        files = {}
+        for root, _, filenames in os.walk(output_path):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                file_stat = os.stat(path)
+                subpath = os.path.relpath(path, output_path)
+                files[subpath.replace("\\", "/")] = [
+                    file_stat.st_size, file_stat.st_mtime_ns
+                ]
+        return {"files": files}
+
+    def is_up_to_date(self, output_path: str, inputs_hash: str) -> bool:
+        """Output was created from same inputs and was not changed since.
+
+        Args:
+            output_path (str): Path to output package.
+            inputs_hash (str): Hash of inputs of the package.
+
+        Returns:
+            bool: Output does not have to be created again.
+
+        """
+        entry = self._outputs.get(os.path.abspath(output_path))
+        if not entry or entry.get("inputs") != inputs_hash:
+            return False
+        output_stat = self._get_output_stat(output_path)
+        return output_stat is not None and output_stat == entry.get("stat")
+
+    def set_output(self, output_path: str, inputs_hash: str):
+        """Store inputs hash of created output.
+
+        Args:
+            output_path (str): Path to output package.
+            inputs_hash (str): Hash of inputs of the package.
+
+        """
+        self._outputs[os.path.abspath(output_path)] = {
+            "inputs": inputs_hash,
+            "stat": self._get_output_stat(output_path),
+        }
+
+    def save(self):
+        """Store manifest to disk."""
+        os.makedirs(os.path.dirname(self._manifest_path), exist_ok=True)
+        tmp_path = f"{self._manifest_path}.tmp"
+        with open(tmp_path, "w") as stream:
+            json.dump(
+                {
+                    "version": BUILD_MANIFEST_VERSION,
+                    "outputs": self._outputs,
+                },
+                stream,
+                indent=4,
+                sort_keys=True,
+            )
+        os.replace(tmp_path, self._manifest_path)
+
+
+def _get_valid_cached_archives(
+    archives_dir: str, checksum_cache: ChecksumCache
+) -> Optional[List[FileMapping]]:
+    """Client archives from build cache if all of them are intact.
+
+    Args:
+        archives_dir (str): Directory with cached client archives.
+        checksum_cache (ChecksumCache): Cache of checksums of files.
+
+    Returns:
+        Optional[List[FileMapping]]: Archives with destination path in
+            package or None if an archive is missing or changed.
+
+    """
+    archives_path = os.path.join(archives_dir, "archives.json")
+    try:
+        with open(archives_path, "r") as stream:
+            archives_info = json.load(stream)
+    except (OSError, ValueError):
+        return None
+
+    output = []
+    for item in archives_info:
+        if len(item) != 4:
+            return None
+        filename, dst_subpath, size, checksum = item
+        path = os.path.join(archives_dir, filename)
+        if (
+            not os.path.isfile(path)
+            or os.path.getsize(path) != size
+            or not checksum_cache.is_valid(path, checksum)
+        ):
+            return None
+        output.append((path, dst_subpath))
+    return output
+
+
+def get_cached_client_archives(
+    client_inputs_hash: str,
+    log: logging.Logger,
+    verify_mode: str = DEFAULT_VERIFY_MODE,
+    download_workers: int = DOWNLOAD_WORKERS,
+    jobs: int = DEFAULT_JOBS,
+    compression_policy: Optional[CompressionPolicy] = None,
+    deterministic: bool = False,
+    legacy_configs: Optional[Iterable[str]] = None,
+    use_ocioz: bool = False,
+    allow_context_references: bool = False,
+) -> List[FileMapping]:
+    """Get client archives from build cache, create them if not available.
+
+    Client archives in cache are reused when hash of their inputs did not
+        change and size and checksum of each archive match values stored
+        with them. Client archives of other inputs are removed from cache.
+
+    Args:
+        client_inputs_hash (str): Hash of inputs of client archives.
+        log (logging.Logger): Logger object.
+        verify_mode (str): Verification mode of downloaded files.
+        download_workers (int): Maximum number of parallel downloads.
+        jobs (int): Number of processes used for compression.
+        compression_policy (Optional[CompressionPolicy]): Compression of
+            zip members.
+        deterministic (bool): Create zips with sorted members and
+            normalized attributes.
+        legacy_configs (Optional[Iterable[str]]): Names of legacy config
+            folders to use, all configs are used if not set.
+        use_ocioz (bool): Ship each legacy config as '.ocioz' archive.
+        allow_context_references (bool): Allow references of legacy
+            configs which are absolute or use context variables.
+
+    Returns:
+        List[FileMapping]: Archives with destination path in package.
+
+    """
+    dirname = f"client_{client_inputs_hash}"
+    archives_dir = os.path.join(BUILD_CACHE_ROOT, dirname)
+    archives_path = os.path.join(archives_dir, "archives.json")
+    checksum_cache = ChecksumCache(verify_mode, BUILD_CHECKSUMS_PATH)
+    cached_archives = _get_valid_cached_archives(
+        archives_dir, checksum_cache
+    )
+    if cached_archives is not None:
+        log.info(
+            "Client archives inputs did not change,"
+            " using cached client archives"
+        )
+        checksum_cache.save()
+        return cached_archives
 
-            files_mapping.append((content, dst_path))
+    if os.path.exists(archives_path):
+        log.warning(
+            "Cached client archives are missing or changed,"
+            " creating them again"
+        )
 
-    # Get all OCIO sources
-    for (filepath, target_subpath) in ocio_sources_info:
-        files_mapping.append((filepath, target_subpath))
+    tmp_dir = f"{archives_dir}.tmp"
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+    try:
+        archives = create_client_archives(
+            log,
+            verify_mode,
+            download_workers,
+            jobs=jobs,
+            compression_policy=compression_policy,
+            deterministic=deterministic,
+            legacy_configs=legacy_configs,
+            use_ocioz=use_ocioz,
+            allow_context_references=allow_context_references,
+            output_dir=tmp_dir,
+        )
+        archives_info = []
+        for path, dst_subpath in archives:
+            archives_info.append((
+                os.path.basename(path),
+                dst_subpath,
+                os.path.getsize(path),
+                calculate_file_checksum(path),
+            ))
+        with open(os.path.join(tmp_dir, "archives.json"), "w") as stream:
+            json.dump(archives_info, stream, indent=4)
+        if os.path.exists(archives_dir):
+            shutil.rmtree(archives_dir)
+        os.replace(tmp_dir, archives_dir)
+    finally:
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir)
 
-    return files_mapping
+    for filename, _, _, checksum in archives_info:
+        checksum_cache.set_checksum(
+            os.path.join(archives_dir, filename), checksum
+        )
+    checksum_cache.save()
 
+    for name in os.listdir(BUILD_CACHE_ROOT):
+        path = os.path.join(BUILD_CACHE_ROOT, name)
+        if name == dirname or not name.startswith("client_"):
+            continue
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
 
-def get_client_zip_content(log) -> io.BytesIO:
-    log.info("Preparing client code zip")
-    files_mapping: List[FileMapping] = get_client_files_mapping(log)
-    stream = io.BytesIO()
-    with ZipFileLongPaths(stream, "w", zipfile.ZIP_DEFLATED) as zipf:
-        for src_path, subpath in files_mapping:
-            if isinstance(src_path, io.BytesIO):
-                zipf.writestr(subpath, src_path.getvalue())
-            else:
-                zipf.write(src_path, subpath)
-    stream.seek(0)
-    return stream
+    return [
+        (os.path.join(archives_dir, os.path.basename(path)), dst_subpath)
+        for path, dst_subpath in archives
+    ]
 
 
 def get_base_files_mapping() -> List[FileMapping]:
@@ -408,12 +3094,237 @@ def get_base_files_mapping() -> List[FileMapping]:
     return filepaths_to_copy
 
 
-def copy_client_code(output_dir: str, log: logging.Logger):
+def _copy_file_range(src_path: str, dst_path: str):
+    """Copy file content with 'os.copy_file_range'.
+
+    Copy is done in kernel and filesystems which support it (e.g. Btrfs,
+        XFS or NFS 4.2) can create reflink or server side copy.
+
+    """
+    with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(
+                src.fileno(), dst.fileno(), remaining
+            )
+            if copied == 0:
+                break
+            remaining -= copied
+
+
+def _fast_copy_file(src_path: str, dst_path: str, use_hardlinks: bool):
+    """Copy file using the fastest method available.
+
+    Hardlink is used if enabled and both paths are on the same
+        filesystem, 'os.copy_file_range' is tried next on same filesystem
+        and regular copy is used as fallback. Destination is replaced
+        atomically.
+
+    """
+    dst_dir = os.path.dirname(dst_path)
+    tmp_path = f"{dst_path}.tmp"
+    same_device = os.stat(src_path).st_dev == os.stat(dst_dir).st_dev
+    try:
+        if use_hardlinks and same_device:
+            try:
+                os.link(src_path, tmp_path)
+                os.replace(tmp_path, dst_path)
+                return
+            except OSError:
+                pass
+
+        copied = False
+        if same_device and hasattr(os, "copy_file_range"):
+            try:
+                _copy_file_range(src_path, tmp_path)
+                copied = True
+            except OSError:
+                pass
+
+        if not copied:
+            shutil.copyfile(src_path, tmp_path)
+        shutil.copystat(src_path, tmp_path)
+        os.replace(tmp_path, dst_path)
+
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _get_stream_checksum(stream: BinaryIO) -> str:
+    checksum = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(STREAM_CHUNK_SIZE), b""):
+        checksum.update(chunk)
+    stream.seek(0)
+    return checksum.hexdigest()
+
+
+def _get_file_crc(filepath: str) -> int:
+    crc = 0
+    with open(filepath, "rb") as stream:
+        for chunk in iter(lambda: stream.read(STREAM_CHUNK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def _is_mapped_file_synced(
+    src: Union[str, BinaryIO, ZipMember], dst_path: str
+) -> bool:
+    if not os.path.isfile(dst_path):
+        return False
+
+    dst_stat = os.stat(dst_path)
+    if isinstance(src, ZipMember):
+        return (
+            dst_stat.st_size == src.info.file_size
+            and _get_file_crc(dst_path) == src.info.CRC
+        )
+
+    if not isinstance(src, str):
+        return (
+            dst_stat.st_size == _get_stream_size(src)
+            and calculate_file_checksum(dst_path) == _get_stream_checksum(src)
+        )
+
+    src_stat = os.stat(src)
+    if (
+        src_stat.st_ino == dst_stat.st_ino
+        and src_stat.st_dev == dst_stat.st_dev
+    ):
+        return True
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+    if src_stat.st_mtime_ns == dst_stat.st_mtime_ns:
+        return True
+    if calculate_file_checksum(src) != calculate_file_checksum(dst_path):
+        return False
+    # Same content, copy modification time so next check is quick
+    shutil.copystat(src, dst_path)
+    return True
+
+
+def sync_mapped_file(
+    src: Union[str, BinaryIO, ZipMember],
+    dst_path: str,
+    use_hardlinks: bool = False,
+) -> bool:
+    """Copy source of file mapping to destination only if it changed.
+
+    Files are compared by size, modification time and content hash.
+
+    Args:
+        src (Union[str, BinaryIO, ZipMember]): Source of file mapping.
+        dst_path (str): Path to destination file.
+        use_hardlinks (bool): Create hardlinks of source files on the same
+            filesystem instead of copies.
+
+    Returns:
+        bool: File was copied.
+
+    """
+    if _is_mapped_file_synced(src, dst_path):
+        return False
+
+    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+    if isinstance(src, str):
+        _fast_copy_file(src, dst_path, use_hardlinks)
+    else:
+        tmp_path = f"{dst_path}.tmp"
+        try:
+            copy_mapped_file(src, tmp_path)
+            os.replace(tmp_path, dst_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return True
+
+
+def sync_files_mapping(
+    files_mapping: Iterable[FileMapping],
+    output_dir: str,
+    log: logging.Logger,
+    workers: int = DEFAULT_SYNC_WORKERS,
+    use_hardlinks: bool = False,
+):
+    """Synchronize output directory with files mapping.
+
+    Only changed files are copied and only files that are not in mapping
+        are removed from output directory. Files are copied in thread pool.
+
+    Args:
+        files_mapping (Iterable[FileMapping]): Source and destination
+            subpath of each file.
+        output_dir (str): Output directory path.
+        log (logging.Logger): Logger object.
+        workers (int): Number of threads copying files.
+        use_hardlinks (bool): Create hardlinks of source files on the same
+            filesystem instead of copies.
+
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    existing_paths = set()
+    for root, _, filenames in os.walk(output_dir):
+        for filename in filenames:
+            existing_paths.add(os.path.normpath(os.path.join(root, filename)))
+
+    dst_paths = set()
+    copied = 0
+    with concurrent.futures.ThreadPoolExecutor(max(1, workers)) as executor:
+        futures = []
+        for src, dst_subpath in files_mapping:
+            dst_path = os.path.normpath(os.path.join(output_dir, dst_subpath))
+            dst_paths.add(dst_path)
+            futures.append(executor.submit(
+                sync_mapped_file, src, dst_path, use_hardlinks
+            ))
+
+        for future in concurrent.futures.as_completed(futures):
+            if future.result():
+                copied += 1
+
+    stale_paths = existing_paths - dst_paths
+    for path in stale_paths:
+        os.remove(path)
+
+    # Remove empty directories
+    for root, _, _ in os.walk(output_dir, topdown=False):
+        if root != output_dir and not os.listdir(root):
+            os.rmdir(root)
+
+    log.info(
+        f"Synchronized {len(dst_paths)} files in '{output_dir}':"
+        f" {copied} copied, {len(dst_paths) - copied} unchanged,"
+        f" {len(stale_paths)} removed"
+    )
+
+
+def copy_client_code(
+    output_dir: str,
+    log: logging.Logger,
+    verify_mode: str = DEFAULT_VERIFY_MODE,
+    download_workers: int = DOWNLOAD_WORKERS,
+    use_hardlinks: bool = False,
+    legacy_configs: Optional[Iterable[str]] = None,
+    use_ocioz: bool = False,
+    allow_context_references: bool = False,
+):
     """Copies server side folders to 'addon_package_dir'
 
+    Only changed files are copied to existing output.
+
     Args:
         output_dir (str): Output directory path.
         log (logging.Logger)
+        verify_mode (str): Verification mode of downloaded files.
+        download_workers (int): Maximum number of parallel downloads.
+        use_hardlinks (bool): Create hardlinks of source files on the same
+            filesystem instead of copies.
+        legacy_configs (Optional[Iterable[str]]): Names of legacy config
+            folders to use, all configs are used if not set.
+        use_ocioz (bool): Ship each legacy config as '.ocioz' archive.
+        allow_context_references (bool): Allow references of legacy
+            configs which are absolute or use context variables.
 
     """
     log.info(f"Copying client for {ADDON_NAME}-{ADDON_VERSION}")
@@ -421,18 +3332,20 @@ def copy_client_code(output_dir: str, log: logging.Logger):
     full_output_path = os.path.join(
         output_dir, f"{ADDON_NAME}_{ADDON_VERSION}"
     )
-    if os.path.exists(full_output_path):
-        shutil.rmtree(full_output_path)
-    os.makedirs(full_output_path, exist_ok=True)
 
-    for src_path, dst_subpath in get_client_files_mapping(log):
-        dst_path = os.path.join(full_output_path, dst_subpath)
-        if isinstance(src_path, io.BytesIO):
-            os.makedirs(os.path.dirname(dst_path), exist_ok=True)
-            with open(dst_path, "wb") as stream:
-                stream.write(src_path.getvalue())
-        else:
-            safe_copy_file(src_path, dst_path)
+    files_mapping: Iterator[FileMapping] = iter_with_configs_catalog(
+        iter_client_files_mapping(
+            log,
+            verify_mode,
+            download_workers,
+            legacy_configs,
+            use_ocioz,
+            allow_context_references,
+        )
+    )
+    sync_files_mapping(
+        files_mapping, full_output_path, log, use_hardlinks=use_hardlinks
+    )
 
     log.info("Client copy finished")
 
@@ -440,39 +3353,31 @@ def copy_client_code(output_dir: str, log: logging.Logger):
 def copy_addon_package(
     output_dir: str,
     files_mapping: List[FileMapping],
-    log: logging.Logger
+    log: logging.Logger,
+    use_hardlinks: bool = False,
 ):
     """Copy client code to output directory.
 
+    Only changed files are copied to existing output.
+
     Args:
         output_dir (str): Directory path to output client code.
         files_mapping (List[FileMapping]): List of tuples with source file
             and destination subpath.
         log (logging.Logger): Logger object.
+        use_hardlinks (bool): Create hardlinks of source files on the same
+            filesystem instead of copies.
 
     """
     log.info(f"Copying package for {ADDON_NAME}-{ADDON_VERSION}")
 
     # Add addon name and version to output directory
-    addon_output_dir: str = os.path.join(
-        output_dir, ADDON_NAME, ADDON_VERSION
-    )
-    if os.path.isdir(addon_output_dir):
-        log.info(f"Purging {addon_output_dir}")
-        shutil.rmtree(addon_output_dir)
-
-    os.makedirs(addon_output_dir, exist_ok=True)
+    addon_output_dir: str = get_package_output_path(output_dir, True)
 
     # Copy server content
-    for src_file, dst_subpath in files_mapping:
-        dst_path: str = os.path.join(addon_output_dir, dst_subpath)
-        dst_dir: str = os.path.dirname(dst_path)
-        os.makedirs(dst_dir, exist_ok=True)
-        if isinstance(src_file, io.BytesIO):
-            with open(dst_path, "wb") as stream:
-                stream.write(src_file.getvalue())
-        else:
-            safe_copy_file(src_file, dst_path)
+    sync_files_mapping(
+        files_mapping, addon_output_dir, log, use_hardlinks=use_hardlinks
+    )
 
     log.info("Package copy finished")
 
@@ -480,30 +3385,380 @@ def copy_addon_package(
 def create_addon_package(
     output_dir: str,
     files_mapping: List[FileMapping],
-    log: logging.Logger
+    log: logging.Logger,
+    jobs: int = DEFAULT_JOBS,
+    compression_policy: Optional[CompressionPolicy] = None,
+    deterministic: bool = False,
 ):
+    """Create addon package zip and sha256 checksum file next to it.
+
+    Existing package is kept untouched if new package has the same
+        checksum, so unchanged builds can be detected and upload skipped.
+
+    Args:
+        output_dir (str): Output directory path.
+        files_mapping (List[FileMapping]): List of tuples with source file
+            and destination subpath.
+        log (logging.Logger): Logger object.
+        jobs (int): Number of processes used for compression.
+        compression_policy (Optional[CompressionPolicy]): Compression of
+            zip members.
+        deterministic (bool): Create zip with sorted members and normalized
+            attributes.
+
+    """
     log.info(f"Creating package for {ADDON_NAME}-{ADDON_VERSION}")
 
     os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(
-        output_dir, f"{ADDON_NAME}-{ADDON_VERSION}.zip"
+    output_path = get_package_output_path(output_dir, False)
+    checksum_path = f"{output_path}.sha256"
+    tmp_path = f"{output_path}.tmp"
+
+    zip_cls = ZipFileLongPaths
+    if deterministic:
+        zip_cls = DeterministicZipFile
+        files_mapping = sort_files_mapping(files_mapping)
+
+    try:
+        with zip_cls(tmp_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+            # Copy server content
+            report = write_files_mapping(
+                zipf, files_mapping, jobs, compression_policy
+            )
+        report.log(log, "Package")
+
+        checksum = calculate_file_checksum(tmp_path)
+        previous_checksum = None
+        if os.path.exists(checksum_path) and os.path.exists(output_path):
+            with open(checksum_path, "r") as stream:
+                previous_checksum = stream.read().split(" ", 1)[0]
+
+        if checksum == previous_checksum:
+            log.info(
+                f"Package content did not change ({checksum}),"
+                f" keeping existing {output_path}"
+            )
+        else:
+            os.replace(tmp_path, output_path)
+            with open(checksum_path, "w") as stream:
+                stream.write(f"{checksum}  {os.path.basename(output_path)}\n")
+            log.info(f"Package checksum {checksum}")
+
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    log.info("Package created")
+
+
+def _get_member_checksum(member: ZipMember) -> str:
+    checksum = hashlib.sha256()
+    for chunk in member.iter_chunks(STREAM_CHUNK_SIZE):
+        checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+def _get_package_version(package_zip: zipfile.ZipFile) -> str:
+    content = package_zip.read("package.py").decode("utf-8")
+    match = re.search(
+        r"^version\s*=\s*[\"'](?P<version>[^\"']+)[\"']",
+        content,
+        re.MULTILINE,
     )
+    if match is None:
+        raise RuntimeError("Version was not found in package 'package.py'.")
+    return match.group("version")
+
+
+def get_package_client_files(
+    package_path: str, tmp_dir: str
+) -> Tuple[str, Dict[str, ZipMember]]:
+    """Get client files in addon package zip.
+
+    Client archives are extracted from package to temporary directory and
+        client files are mapped by their path in full client tree, as it
+        would be created with '--only-client'.
+
+    Args:
+        package_path (str): Path to addon package zip.
+        tmp_dir (str): Directory where client archives are extracted.
 
-    with ZipFileLongPaths(output_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-        # Copy server content
-        for src_file, dst_subpath in files_mapping:
-            if isinstance(src_file, io.BytesIO):
-                zipf.writestr(dst_subpath, src_file.getvalue())
+    Returns:
+        Tuple[str, Dict[str, ZipMember]]: Addon version of the package and
+            client files by their path.
+
+    """
+    configs_prefix, configs_suffix = CONFIGS_ZIP_TEMPLATE.split("{bundle}")
+    configs_subpath = f"{ADDON_CLIENT_DIR}/configs/{CONFIGS_FOLDER_NAME}/"
+    index_subpath = f"{ADDON_CLIENT_DIR}/{CONFIGS_INDEX_FILENAME}"
+    output: Dict[str, ZipMember] = {}
+    with ZipFileLongPaths(package_path) as package_zip:
+        version = _get_package_version(package_zip)
+        for info in package_zip.infolist():
+            dirname, _, filename = info.filename.rpartition("/")
+            if dirname != "private":
+                continue
+            if filename == CLIENT_ZIP_FILENAME:
+                prefix = ""
+            elif (
+                filename.startswith(configs_prefix)
+                and filename.endswith(configs_suffix)
+            ):
+                prefix = configs_subpath
             else:
-                zipf.write(src_file, dst_subpath)
+                continue
 
-    log.info("Package created")
+            archive_path = os.path.join(tmp_dir, filename)
+            with package_zip.open(info) as src_stream:
+                with open(archive_path, "wb") as dst_stream:
+                    shutil.copyfileobj(
+                        src_stream, dst_stream, STREAM_CHUNK_SIZE
+                    )
+
+            with ZipFileLongPaths(archive_path) as archive:
+                infos = archive.infolist()
+            for member_info in infos:
+                path = prefix + member_info.filename
+                if member_info.is_dir() or path == index_subpath:
+                    continue
+                output[path] = ZipMember(archive_path, member_info)
+    return version, output
+
+
+def create_delta_package(
+    output_dir: str,
+    package_path: str,
+    previous_package_path: str,
+    log: logging.Logger,
+) -> str:
+    """Create delta package between previous and current addon package.
+
+    Delta package contains only client files that were added or changed
+        since previous package, list of removed files and sha256 checksums
+        of all files in full client tree of current package. Full client
+        tree can be rebuilt with 'apply_delta_package'. Files which are
+        not in client tree created with '--only-client' are always in
+        delta package, so the tree can be used as base.
+
+    Args:
+        output_dir (str): Directory where delta package is created.
+        package_path (str): Path to current addon package zip.
+        previous_package_path (str): Path to previous addon package zip.
+        log (logging.Logger): Logger object.
+
+    Returns:
+        str: Path to delta package.
+
+    """
+    if not os.path.isfile(previous_package_path):
+        raise RuntimeError(
+            f"Previous package was not found '{previous_package_path}'."
+        )
+
+    log.info(f"Creating delta package from {previous_package_path}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        previous_dir = os.path.join(tmp_dir, "previous")
+        current_dir = os.path.join(tmp_dir, "current")
+        os.makedirs(previous_dir)
+        os.makedirs(current_dir)
+        previous_version, previous_files = get_package_client_files(
+            previous_package_path, previous_dir
+        )
+        version, files = get_package_client_files(package_path, current_dir)
+
+        # Manifest of config bundles exists only in client archive of
+        #   package, client tree created with '--only-client' used as
+        #   base does not have it
+        package_only_paths = {
+            f"{ADDON_CLIENT_DIR}/{CONFIGS_MANIFEST_FILENAME}"
+        }
+        manifest: Dict[str, str] = {}
+        added: List[str] = []
+        changed: List[str] = []
+        for path in sorted(files):
+            member = files[path]
+            checksum = _get_member_checksum(member)
+            manifest[path] = checksum
+            previous_member = previous_files.get(path)
+            if previous_member is None:
+                added.append(path)
+            elif path in package_only_paths:
+                changed.append(path)
+            elif (
+                previous_member.info.file_size != member.info.file_size
+                or previous_member.info.CRC != member.info.CRC
+                or _get_member_checksum(previous_member) != checksum
+            ):
+                changed.append(path)
+        removed = sorted(set(previous_files) - set(files))
+
+        delta_info = {
+            "version": DELTA_MANIFEST_VERSION,
+            "addon_name": ADDON_NAME,
+            "from_version": previous_version,
+            "to_version": version,
+            "added": added,
+            "changed": changed,
+            "removed": removed,
+            "manifest": manifest,
+        }
+        delta_path = os.path.join(
+            output_dir,
+            f"{ADDON_NAME}-{previous_version}-{version}-delta.zip"
+        )
+        tmp_path = f"{delta_path}.tmp"
+        with ZipFileLongPaths(tmp_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+            zipf.writestr(
+                DELTA_MANIFEST_FILENAME,
+                json.dumps(delta_info, indent=4, sort_keys=True)
+            )
+            for path in added + changed:
+                write_mapped_file(
+                    zipf, files[path], f"{DELTA_FILES_DIR}/{path}"
+                )
+        os.replace(tmp_path, delta_path)
+
+    log.info(
+        f"Delta package {previous_version} -> {version}:"
+        f" {len(added)} added, {len(changed)} changed,"
+        f" {len(removed)} removed ({_format_size(os.path.getsize(delta_path))})"
+    )
+    return delta_path
+
+
+def _iter_stream_chunks(stream: BinaryIO) -> Iterator[bytes]:
+    with stream:
+        for chunk in iter(lambda: stream.read(STREAM_CHUNK_SIZE), b""):
+            yield chunk
+
+
+def _get_base_client_files(
+    base_path: str, tmp_dir: str
+) -> Dict[str, Union[str, ZipMember]]:
+    if os.path.isdir(base_path):
+        return {
+            sub_path.replace("\\", "/"): path
+            for path, sub_path in iter_files_in_subdir(base_path)
+        }
+    _, files = get_package_client_files(base_path, tmp_dir)
+    return dict(files)
+
+
+def apply_delta_package(
+    delta_path: str,
+    base_path: str,
+    output_dir: str,
+    log: logging.Logger,
+):
+    """Rebuild full client tree from base and delta package.
+
+    Every file of rebuilt client tree is verified against checksum in
+        delta package. Client tree is created in temporary directory and
+        replaces output directory only if all files are valid.
+
+    Args:
+        delta_path (str): Path to delta package.
+        base_path (str): Path to previous addon package zip or to directory
+            with full client tree of previous version.
+        output_dir (str): Directory where full client tree is created.
+        log (logging.Logger): Logger object.
+
+    """
+    output_dir = os.path.abspath(output_dir)
+    with ZipFileLongPaths(delta_path) as delta_zip, \
+            tempfile.TemporaryDirectory() as tmp_dir:
+        delta_info = json.loads(delta_zip.read(DELTA_MANIFEST_FILENAME))
+        if delta_info.get("version") != DELTA_MANIFEST_VERSION:
+            raise RuntimeError(
+                f"Unsupported delta package version in '{delta_path}'."
+            )
+        log.info(
+            f"Applying delta package {delta_info['from_version']}"
+            f" -> {delta_info['to_version']}"
+        )
+        base_files = _get_base_client_files(base_path, tmp_dir)
+        delta_files = set(delta_info["added"]) | set(delta_info["changed"])
+
+        parent_dir = os.path.dirname(output_dir)
+        os.makedirs(parent_dir, exist_ok=True)
+        build_dir = tempfile.mkdtemp(prefix=".delta_", dir=parent_dir)
+        try:
+            for path, expected_checksum in delta_info["manifest"].items():
+                chunks: Iterable[bytes]
+                if path in delta_files:
+                    chunks = _iter_stream_chunks(
+                        delta_zip.open(f"{DELTA_FILES_DIR}/{path}")
+                    )
+                else:
+                    src = base_files.get(path)
+                    if src is None:
+                        raise RuntimeError(
+                            f"File '{path}' is missing in base '{base_path}'."
+                        )
+                    if isinstance(src, ZipMember):
+                        chunks = src.iter_chunks(STREAM_CHUNK_SIZE)
+                    else:
+                        chunks = _iter_stream_chunks(open(src, "rb"))
+
+                dst_path = os.path.join(build_dir, *path.split("/"))
+                os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+                checksum = hashlib.sha256()
+                with open(dst_path, "wb") as stream:
+                    for chunk in chunks:
+                        checksum.update(chunk)
+                        stream.write(chunk)
+
+                if checksum.hexdigest() != expected_checksum:
+                    raise RuntimeError(
+                        f"Checksum of '{path}' does not match. Expected"
+                        f" '{expected_checksum}', got"
+                        f" '{checksum.hexdigest()}'."
+                    )
+
+            if os.path.exists(output_dir):
+                shutil.rmtree(output_dir)
+            os.replace(build_dir, output_dir)
+        finally:
+            if os.path.exists(build_dir):
+                shutil.rmtree(build_dir)
+
+    log.info(
+        f"Client tree {delta_info['to_version']} rebuilt in {output_dir}"
+    )
+
+
+def get_package_output_path(output_dir: str, skip_zip: bool) -> str:
+    """Path to addon package zip or folder.
+
+    Args:
+        output_dir (str): Output directory path.
+        skip_zip (bool): Package is created as folder.
+
+    Returns:
+        str: Path to package output.
+
+    """
+    if skip_zip:
+        return os.path.join(output_dir, ADDON_NAME, ADDON_VERSION)
+    return os.path.join(output_dir, f"{ADDON_NAME}-{ADDON_VERSION}.zip")
 
 
 def main(
     output_dir: Optional[str] = None,
     skip_zip: Optional[bool] = False,
-    only_client: Optional[bool] = False
+    only_client: Optional[bool] = False,
+    verify_mode: str = DEFAULT_VERIFY_MODE,
+    download_workers: int = DOWNLOAD_WORKERS,
+    max_memory: int = DEFAULT_MAX_MEMORY,
+    jobs: int = DEFAULT_JOBS,
+    compression_rules: Optional[List[Tuple[str, str, Optional[int]]]] = None,
+    use_cache: bool = True,
+    use_hardlinks: bool = False,
+    deterministic: bool = False,
+    delta_from: Optional[str] = None,
+    legacy_configs: Optional[List[str]] = None,
+    use_ocioz: bool = False,
+    allow_context_references: bool = False,
 ):
     log: logging.Logger = logging.getLogger("create_package")
     log.info("Package creation started")
@@ -511,6 +3766,11 @@ def main(
     if not output_dir:
         output_dir = os.path.join(CURRENT_ROOT, "package")
 
+    if delta_from and (skip_zip or only_client):
+        raise RuntimeError(
+            "Delta package can be created only with zip package."
+        )
+
     client_dir: str = os.path.join(CLIENT_ROOT, ADDON_CLIENT_DIR)
     if not os.path.exists(client_dir):
         raise RuntimeError(
@@ -520,7 +3780,16 @@ def main(
     update_client_version(log)
 
     if only_client:
-        copy_client_code(output_dir, log)
+        copy_client_code(
+            output_dir,
+            log,
+            verify_mode,
+            download_workers,
+            use_hardlinks,
+            legacy_configs,
+            use_ocioz,
+            allow_context_references,
+        )
         return
 
     log.info(f"Preparing package for {ADDON_NAME}-{ADDON_VERSION}")
@@ -529,17 +3798,96 @@ def main(
         build_frontend()
 
     files_mapping: List[FileMapping] = []
-    files_mapping.extend(get_base_files_mapping())
+    base_files_mapping: List[FileMapping] = get_base_files_mapping()
+    files_mapping.extend(base_files_mapping)
 
-    files_mapping.append(
-        (get_client_zip_content(log), "private/client.zip")
-    )
+    rules = list(compression_rules or [])
+    rules.extend(DEFAULT_COMPRESSION_RULES)
+    compression_policy = CompressionPolicy(rules)
 
-    # Skip server zipping
-    if skip_zip:
-        copy_addon_package(output_dir, files_mapping, log)
+    manifest: Optional[BuildManifest] = None
+    output_path: str = get_package_output_path(output_dir, skip_zip)
+    client_archives: List[FileMapping]
+    if use_cache:
+        checksum_cache = ChecksumCache(cache_path=BUILD_CHECKSUMS_PATH)
+        client_inputs_hash = get_client_inputs_hash(
+            checksum_cache,
+            compression_policy,
+            deterministic,
+            legacy_configs,
+            use_ocioz,
+            allow_context_references,
+        )
+        package_inputs_hash = get_package_inputs_hash(
+            base_files_mapping,
+            client_inputs_hash,
+            skip_zip,
+            checksum_cache,
+            compression_policy,
+            deterministic,
+        )
+        checksum_cache.save()
+
+        manifest = BuildManifest()
+        if manifest.is_up_to_date(output_path, package_inputs_hash):
+            log.info(f"Package inputs did not change, skipping {output_path}")
+            if delta_from:
+                create_delta_package(output_dir, output_path, delta_from, log)
+            return
+
+        client_archives = get_cached_client_archives(
+            client_inputs_hash,
+            log,
+            verify_mode,
+            download_workers,
+            jobs,
+            compression_policy,
+            deterministic,
+            legacy_configs,
+            use_ocioz,
+            allow_context_references,
+        )
     else:
-        create_addon_package(output_dir, files_mapping, log)
+        client_archives = create_client_archives(
+            log,
+            verify_mode,
+            download_workers,
+            max_memory,
+            jobs,
+            compression_policy,
+            deterministic,
+            legacy_configs=legacy_configs,
+            use_ocioz=use_ocioz,
+            allow_context_references=allow_context_references,
+        )
+
+    files_mapping.extend(client_archives)
+    try:
+        # Skip server zipping
+        if skip_zip:
+            copy_addon_package(
+                output_dir, files_mapping, log, use_hardlinks
+            )
+        else:
+            create_addon_package(
+                output_dir,
+                files_mapping,
+                log,
+                jobs,
+                compression_policy,
+                deterministic,
+            )
+    finally:
+        for src, _ in client_archives:
+            if not isinstance(src, str):
+                src.close()
+
+    if manifest is not None:
+        manifest.set_output(output_path, package_inputs_hash)
+        manifest.save()
+
+    if delta_from:
+        create_delta_package(output_dir, output_path, delta_from, log)
 
     log.info("Package creation finished")
 
@@ -561,7 +3909,7 @@ if __name__ == "__main__":
         default=None,
         help=(
             "Directory path where package will be created"
-            " (Will be purged if already exists!)"
+            " (Other files in package directory are removed!)"
         )
     )
     parser.add_argument(
@@ -573,6 +3921,149 @@ if __name__ == "__main__":
             " Requires '-o', '--output' argument to be filled."
         )
     )
+    parser.add_argument(
+        "--verify",
+        dest="verify_mode",
+        choices=VERIFY_MODES,
+        default=DEFAULT_VERIFY_MODE,
+        help=(
+            "Verification of already downloaded files. 'full' always"
+            " calculates checksum, 'cached' calculates checksum only if file"
+            " changed since last verification, 'none' skips verification."
+        )
+    )
+    parser.add_argument(
+        "--download-workers",
+        dest="download_workers",
+        type=int,
+        default=DOWNLOAD_WORKERS,
+        help="Maximum number of parallel downloads."
+    )
+    parser.add_argument(
+        "--max-memory",
+        dest="max_memory",
+        type=parse_size,
+        default=DEFAULT_MAX_MEMORY,
+        help=(
+            "Maximum size of intermediate artifacts kept in memory"
+            " e.g. '256M'. Bigger artifacts are spooled to temporary files."
+        )
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        dest="jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help="Number of processes used to compress zip files."
+    )
+    parser.add_argument(
+        "--compression",
+        dest="compression_rules",
+        action="append",
+        type=parse_compression_rule,
+        default=None,
+        metavar="PATTERN=METHOD[:LEVEL]",
+        help=(
+            "Compression of zip members matching glob pattern, e.g."
+            " '*.spi3d=lzma' or '*.ocio=deflate:9'. Methods are"
+            f" {', '.join(COMPRESSION_METHODS)}. Can be used multiple times,"
+            " first matching rule is used."
+        )
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help=(
+            "Do not reuse artifacts of previous build when inputs"
+            " did not change."
+        )
+    )
+    parser.add_argument(
+        "--hardlink",
+        dest="use_hardlinks",
+        action="store_true",
+        help=(
+            "Use hardlinks instead of copies for '--skip-zip' and"
+            " '--only-client' outputs if source and output are on the same"
+            " filesystem."
+        )
+    )
+    parser.add_argument(
+        "--deterministic",
+        dest="deterministic",
+        action="store_true",
+        help=(
+            "Create reproducible zip files with sorted members and"
+            " normalized timestamps and permissions. Timestamp can be set"
+            " with 'SOURCE_DATE_EPOCH' environment variable."
+        )
+    )
+    parser.add_argument(
+        "--delta-from",
+        dest="delta_from",
+        default=None,
+        metavar="PACKAGE",
+        help=(
+            "Create also delta package with client files added or changed"
+            " since previous addon package zip."
+        )
+    )
+    parser.add_argument(
+        "--legacy-config",
+        dest="legacy_configs",
+        action="append",
+        default=None,
+        metavar="NAME",
+        help=(
+            "Folder of config from OpenColorIO-Configs zip to ship e.g."
+            " 'aces_1.2'. Can be used multiple times, all configs are"
+            " shipped if not set. Only files referenced by shipped configs"
+            " are included."
+        )
+    )
+    parser.add_argument(
+        "--ocioz",
+        dest="use_ocioz",
+        action="store_true",
+        help=(
+            "Ship each config from OpenColorIO-Configs zip as single"
+            " '.ocioz' archive with its LUTs. Requires OCIO 2.2+ to load"
+            " the configs."
+        )
+    )
+    parser.add_argument(
+        "--allow-context-references",
+        dest="allow_context_references",
+        action="store_true",
+        help=(
+            "Allow file references of configs from OpenColorIO-Configs zip"
+            " which are absolute or use context variables. All files in"
+            " folder of such config are shipped. References to missing"
+            " files always fail the build."
+        )
+    )
+    parser.add_argument(
+        "--apply-delta",
+        dest="apply_delta",
+        default=None,
+        metavar="DELTA",
+        help=(
+            "Rebuild full client tree from delta package and '--delta-base'"
+            " to directory defined by '-o', '--output'. Package is not"
+            " created."
+        )
+    )
+    parser.add_argument(
+        "--delta-base",
+        dest="delta_base",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Previous addon package zip or directory with its full client"
+            " tree used with '--apply-delta'."
+        )
+    )
     parser.add_argument(
         "--debug",
         dest="debug",
@@ -585,4 +4076,33 @@ if __name__ == "__main__":
     if args.debug:
         level = logging.DEBUG
     logging.basicConfig(level=level)
-    main(args.output_dir, args.skip_zip, args.only_client)
+    if args.apply_delta:
+        if not args.delta_base or not args.output_dir:
+            parser.error(
+                "'--apply-delta' requires '--delta-base' and '--output'."
+            )
+        apply_delta_package(
+            args.apply_delta,
+            args.delta_base,
+            args.output_dir,
+            logging.getLogger("create_package"),
+        )
+        sys.exit(0)
+
+    main(
+        args.output_dir,
+        args.skip_zip,
+        args.only_client,
+        args.verify_mode,
+        args.download_workers,
+        args.max_memory,
+        args.jobs,
+        args.compression_rules,
+        args.use_cache,
+        args.use_hardlinks,
+        args.deterministic,
+        args.delta_from,
+        args.legacy_configs,
+        args.use_ocioz,
+        args.allow_context_references,
+    )
@@ -1,5 +1,128 @@
+import os
+import json
+from typing import Any, Optional, Type
+
+from fastapi import Request, Response
+
 from ayon_server.addons import BaseServerAddon
+from ayon_server.api.dependencies import CurrentUser
+from ayon_server.exceptions import NotFoundException
+
+from .settings import OCIODistSettings, DEFAULT_VALUES
+from .bundles import create_bundle_response
+
+CONFIGS_INDEX_FILENAME = "configs_index.json"
 
 
 class OCIODistAddon(BaseServerAddon):
-    pass
+    settings_model: Type[OCIODistSettings] = OCIODistSettings
+
+    def initialize(self):
+        self.add_endpoint(
+            "bundles",
+            self.get_bundles,
+            method="GET",
+        )
+        self.add_endpoint(
+            "bundles/{bundle_name}",
+            self.get_bundle_archive,
+            method="GET",
+        )
+        self.add_endpoint(
+            "bundles/{bundle_name}",
+            self.head_bundle_archive,
+            method="HEAD",
+        )
+
+    def get_configs_index(self) -> dict[str, Any]:
+        """Index of config bundles created with addon package.
+
+        Returns:
+            dict[str, Any]: Index data, index without bundles is returned
+                if package does not contain index.
+        """
+        private_dir = self.get_private_dir()
+        if private_dir:
+            index_path = os.path.join(private_dir, CONFIGS_INDEX_FILENAME)
+            if os.path.exists(index_path):
+                with open(index_path, "r") as stream:
+                    return json.load(stream)
+        return {"version": 1, "bundles": {}}
+
+    async def get_default_settings(self):
+        settings_model_cls = self.get_settings_model()
+        values = dict(DEFAULT_VALUES)
+        values["bundles"] = [
+            {"name": bundle, "enabled": True}
+            for bundle in sorted(self.get_configs_index()["bundles"])
+        ]
+        return settings_model_cls(**values)
+
+    async def get_bundles(
+        self,
+        user: CurrentUser,
+        project_name: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """List config bundles with their enabled state.
+
+        Enabled state is taken from project settings if project name is
+        passed, studio settings are used otherwise.
+        """
+        if project_name:
+            settings = await self.get_project_settings(project_name)
+        else:
+            settings = await self.get_studio_settings()
+
+        disabled = {
+            bundle.name
+            for bundle in settings.bundles
+            if not bundle.enabled
+        }
+        bundles = []
+        for name, bundle_info in sorted(
+            self.get_configs_index()["bundles"].items()
+        ):
+            bundles.append({
+                "name": name,
+                "filename": bundle_info["filename"],
+                "sha256": bundle_info["sha256"],
+                "size": bundle_info["size"],
+                "files": bundle_info["files"],
+                "encodings": sorted(bundle_info.get("encodings") or {}),
+                "enabled": name not in disabled,
+            })
+        return {"bundles": bundles}
+
+    def _create_bundle_response(
+        self, request: Request, bundle_name: str, head: bool
+    ) -> Response:
+        bundle_info = self.get_configs_index()["bundles"].get(bundle_name)
+        private_dir = self.get_private_dir()
+        if bundle_info is None or not private_dir:
+            raise NotFoundException(f"Bundle '{bundle_name}' not found")
+        try:
+            return create_bundle_response(
+                private_dir, bundle_info, request.headers, head
+            )
+        except FileNotFoundError:
+            raise NotFoundException(
+                f"Archive of bundle '{bundle_name}' not found"
+            )
+
+    async def get_bundle_archive(
+        self,
+        user: CurrentUser,
+        request: Request,
+        bundle_name: str,
+    ) -> Response:
+        """Serve config bundle archive."""
+        return self._create_bundle_response(request, bundle_name, False)
+
+    async def head_bundle_archive(
+        self,
+        user: CurrentUser,
+        request: Request,
+        bundle_name: str,
+    ) -> Response:
+        """Headers of config bundle archive."""
+        return self._create_bundle_response(request, bundle_name, True)
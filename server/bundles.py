@@ -0,0 +1,237 @@
+"""Responses serving config bundle archives from private files.
+
+Archives are identified by strong ETag made from sha256 of their content.
+Conditional requests ('If-None-Match', 'If-Range') and single range
+requests are supported. Precompressed variants created at package time
+are served based on 'Accept-Encoding' so nothing is compressed per
+request.
+"""
+import os
+import re
+from typing import Any, Iterator, Mapping, Optional
+
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+
+# Preferred content encodings of precompressed variants
+ENCODINGS_PRIORITY = ("zstd", "gzip")
+CHUNK_SIZE = 1024 * 1024
+RANGE_REGEX = re.compile(r"^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$")
+
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+
+def get_etag(checksum: str) -> str:
+    return f'"{checksum}"'
+
+
+def parse_accept_encoding(header: Optional[str]) -> dict[str, float]:
+    """Parse 'Accept-Encoding' header to quality of each encoding.
+
+    Args:
+        header (Optional[str]): Value of header.
+
+    Returns:
+        dict[str, float]: Quality of encodings.
+    """
+    output = {}
+    for item in (header or "").split(","):
+        encoding, *params = item.strip().split(";")
+        encoding = encoding.strip().lower()
+        if not encoding:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        output[encoding] = quality
+    return output
+
+
+def select_variant(
+    bundle_info: dict[str, Any], accept_encoding: Optional[str]
+) -> tuple[dict[str, Any], Optional[str]]:
+    """Select archive variant based on 'Accept-Encoding' header.
+
+    Args:
+        bundle_info (dict[str, Any]): Bundle information from index.
+        accept_encoding (Optional[str]): Value of 'Accept-Encoding' header.
+
+    Returns:
+        tuple[dict[str, Any], Optional[str]]: Filename, sha256 and size of
+            variant and its content encoding. Encoding is None for
+            the archive itself.
+    """
+    qualities = parse_accept_encoding(accept_encoding)
+    variants = bundle_info.get("encodings") or {}
+    for encoding in ENCODINGS_PRIORITY:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if encoding in variants and quality > 0:
+            return variants[encoding], encoding
+    return bundle_info, None
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Check if 'If-None-Match' header matches ETag.
+
+    Args:
+        header (Optional[str]): Value of header.
+        etag (str): Strong ETag of content.
+
+    Returns:
+        bool: Header matches the ETag.
+    """
+    if not header:
+        return False
+    for value in header.split(","):
+        value = value.strip()
+        if value == "*" or value == etag:
+            return True
+    return False
+
+
+def if_range_matches(header: Optional[str], etag: str) -> bool:
+    """Check if 'If-Range' header matches ETag.
+
+    'If-Range' contains single entity tag which must be strongly equal to
+    ETag, '*' or list of tags are not valid. Dates are not supported, so
+    range is ignored for them and full content is sent.
+
+    Args:
+        header (Optional[str]): Value of header.
+        etag (str): Strong ETag of content.
+
+    Returns:
+        bool: Header matches the ETag.
+    """
+    return bool(header) and header.strip() == etag
+
+
+def parse_range(
+    header: Optional[str], size: int
+) -> Optional[tuple[int, int]]:
+    """Parse single range of 'Range' header.
+
+    Args:
+        header (Optional[str]): Value of header.
+        size (int): Size of content.
+
+    Returns:
+        Optional[tuple[int, int]]: Start and inclusive end of range, None
+            if header is not set or is not a single bytes range.
+
+    Raises:
+        RangeNotSatisfiable: Range is out of content.
+    """
+    if not header:
+        return None
+    match = RANGE_REGEX.match(header)
+    if match is None:
+        return None
+
+    start, end = match.groups()
+    if not start and not end:
+        return None
+
+    if not start:
+        length = int(end)
+        if length == 0:
+            raise RangeNotSatisfiable(header)
+        return max(size - length, 0), size - 1
+
+    start = int(start)
+    end = int(end) if end else size - 1
+    if start >= size or end < start:
+        raise RangeNotSatisfiable(header)
+    return start, min(end, size - 1)
+
+
+def _iter_file_range(path: str, start: int, end: int) -> Iterator[bytes]:
+    with open(path, "rb") as stream:
+        stream.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = stream.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def create_bundle_response(
+    private_dir: str,
+    bundle_info: dict[str, Any],
+    headers: Mapping[str, str],
+    head: bool = False,
+) -> Response:
+    """Create response with bundle archive.
+
+    Args:
+        private_dir (str): Private directory of addon.
+        bundle_info (dict[str, Any]): Bundle information from index.
+        headers (Mapping[str, str]): Request headers.
+        head (bool): Response to 'HEAD' request without body.
+
+    Returns:
+        Response: Full, partial or not modified response.
+
+    Raises:
+        FileNotFoundError: File of selected variant does not exist.
+    """
+    variant, encoding = select_variant(
+        bundle_info, headers.get("accept-encoding")
+    )
+    path = os.path.join(private_dir, variant["filename"])
+    # Streamed response would fail after headers are sent
+    if not os.path.isfile(path):
+        raise FileNotFoundError(path)
+    size = variant["size"]
+    etag = get_etag(variant["sha256"])
+    response_headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "no-cache",
+    }
+    if encoding is not None:
+        response_headers["Content-Encoding"] = encoding
+
+    if etag_matches(headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=response_headers)
+
+    status_code = 200
+    start, end = 0, size - 1
+    if_range = headers.get("if-range")
+    if not if_range or if_range_matches(if_range, etag):
+        try:
+            content_range = parse_range(headers.get("range"), size)
+        except RangeNotSatisfiable:
+            response_headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=response_headers)
+
+        if content_range is not None:
+            start, end = content_range
+            status_code = 206
+            response_headers["Content-Range"] = (
+                f"bytes {start}-{end}/{size}"
+            )
+
+    response_headers["Content-Length"] = str(end - start + 1)
+    if head:
+        return Response(
+            status_code=status_code,
+            headers=response_headers,
+            media_type="application/zip",
+        )
+    return StreamingResponse(
+        _iter_file_range(path, start, end),
+        status_code=status_code,
+        headers=response_headers,
+        media_type="application/zip",
+    )
@@ -0,0 +1,23 @@
+from ayon_server.settings import BaseSettingsModel, SettingsField
+
+
+class ConfigBundleModel(BaseSettingsModel):
+    _layout = "compact"
+    name: str = SettingsField("", title="Bundle")
+    enabled: bool = SettingsField(True, title="Enabled")
+
+
+class OCIODistSettings(BaseSettingsModel):
+    bundles: list[ConfigBundleModel] = SettingsField(
+        default_factory=list,
+        title="Config bundles",
+        description=(
+            "Config bundles (folders in OpenColorIOConfigs) installed"
+            " by client. Bundles which are not listed are enabled."
+        ),
+    )
+
+
+DEFAULT_VALUES = {
+    "bundles": [],
+}
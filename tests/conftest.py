@@ -0,0 +1,110 @@
+import os
+import sys
+import types
+import logging
+import threading
+import http.server
+import importlib.util
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLIENT_ROOT = os.path.join(REPO_ROOT, "client")
+
+for path in (REPO_ROOT, CLIENT_ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def _install_ayon_core_stubs():
+    """Minimal 'ayon_core' so client code can be imported without AYON."""
+    ayon_core = types.ModuleType("ayon_core")
+    addon = types.ModuleType("ayon_core.addon")
+    lib = types.ModuleType("ayon_core.lib")
+    settings = types.ModuleType("ayon_core.settings")
+
+    class AYONAddon:
+        pass
+
+    class Logger:
+        @staticmethod
+        def get_logger(name):
+            return logging.getLogger(name)
+
+    def get_launcher_local_dir(*args):
+        return os.path.join(
+            os.environ["AYON_OCIO_TEST_LOCAL_DIR"], *args
+        )
+
+    addon.AYONAddon = AYONAddon
+    lib.Logger = Logger
+    lib.get_launcher_local_dir = get_launcher_local_dir
+    settings.get_studio_settings = lambda: {}
+    settings.get_project_settings = lambda project_name: {}
+    ayon_core.addon = addon
+    ayon_core.lib = lib
+    ayon_core.settings = settings
+    sys.modules.update({
+        "ayon_core": ayon_core,
+        "ayon_core.addon": addon,
+        "ayon_core.lib": lib,
+        "ayon_core.settings": settings,
+    })
+
+
+if importlib.util.find_spec("ayon_core") is None:
+    _install_ayon_core_stubs()
+
+
+@pytest.fixture(autouse=True)
+def local_dirs(tmp_path, monkeypatch):
+    """Keep caches and stores of client code in temporary directory."""
+    monkeypatch.setenv("AYON_OCIO_TEST_LOCAL_DIR", str(tmp_path / "local"))
+    monkeypatch.setenv("AYON_OCIO_BUNDLES_ROOT", str(tmp_path / "bundles"))
+    monkeypatch.setenv(
+        "AYON_OCIO_CONFIG_CACHE_ROOT", str(tmp_path / "config_cache")
+    )
+    monkeypatch.setenv("AYON_OCIO_LUT_CACHE_ROOT", str(tmp_path / "luts"))
+    return tmp_path
+
+
+class _RequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.handle_func(self)
+
+    def do_HEAD(self):
+        self.server.handle_func(self)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    """Start local HTTP server with function handling requests.
+
+    Fixture returns function which gets request handling function, e.g.
+        'BaseHTTPRequestHandler' is passed to it, and returns base url of
+        server.
+    """
+    servers = []
+
+    def _start(handle_func):
+        server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), _RequestHandler
+        )
+        server.daemon_threads = True
+        server.handle_func = handle_func
+        thread = threading.Thread(
+            target=server.serve_forever, args=(0.05,), daemon=True
+        )
+        thread.start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    yield _start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
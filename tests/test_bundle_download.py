@@ -0,0 +1,230 @@
+import os
+import io
+import sys
+import gzip
+import types
+import hashlib
+import zipfile
+
+import pytest
+
+pytest.importorskip("requests")
+
+from ayon_ocio import distribution  # noqa: E402
+
+
+def _create_archive():
+    stream = io.BytesIO()
+    with zipfile.ZipFile(stream, "w") as zipf:
+        zipf.writestr("test/config.ocio", "ocio_profile_version: 2\n" * 500)
+    return stream.getvalue()
+
+
+ARCHIVE_CONTENT = _create_archive()
+GZIP_CONTENT = gzip.compress(ARCHIVE_CONTENT, mtime=0)
+
+
+def _get_info(filename, content):
+    return {
+        "filename": filename,
+        "sha256": hashlib.sha256(content).hexdigest(),
+        "size": len(content),
+    }
+
+
+@pytest.fixture
+def bundle_info():
+    info = _get_info("configs_test.zip", ARCHIVE_CONTENT)
+    info["encodings"] = {
+        "gzip": _get_info("configs_test.zip.gz", GZIP_CONTENT),
+    }
+    return info
+
+
+class BundlesServer:
+    """Bundles endpoint of server addon with Range and If-Range support.
+
+    Args:
+        broken_after (Optional[int]): Connection of first response is
+            closed after this number of bytes.
+    """
+    def __init__(self, broken_after=None, status_code=None):
+        self.requests = []
+        self._broken_after = broken_after
+        self._status_code = status_code
+
+    def __call__(self, handler):
+        headers = dict(handler.headers)
+        self.requests.append(headers)
+        if self._status_code is not None:
+            handler.send_response(self._status_code)
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+
+        content = ARCHIVE_CONTENT
+        response_headers = {}
+        if "gzip" in headers.get("Accept-Encoding", ""):
+            content = GZIP_CONTENT
+            response_headers["Content-Encoding"] = "gzip"
+        etag = f'"{hashlib.sha256(content).hexdigest()}"'
+        response_headers["ETag"] = etag
+
+        status_code = 200
+        start = 0
+        range_header = headers.get("Range")
+        if range_header and headers.get("If-Range") == etag:
+            start = int(range_header.split("=")[1].rstrip("-"))
+            if start >= len(content):
+                handler.send_response(416)
+                handler.send_header("Content-Length", "0")
+                handler.end_headers()
+                return
+            status_code = 206
+            response_headers["Content-Range"] = (
+                f"bytes {start}-{len(content) - 1}/{len(content)}"
+            )
+
+        body = content[start:]
+        handler.send_response(status_code)
+        for key, value in response_headers.items():
+            handler.send_header(key, value)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        if self._broken_after is not None:
+            body = body[:self._broken_after]
+            self._broken_after = None
+            handler.wfile.write(body)
+            handler.close_connection = True
+            return
+        handler.wfile.write(body)
+
+
+@pytest.fixture
+def ayon_api(monkeypatch):
+    module = types.ModuleType("ayon_api")
+    module.private_downloads = []
+
+    class Connection:
+        rest_url = None
+
+        def get_rest_url(self):
+            return self.rest_url
+
+        def get_headers(self):
+            return {"Authorization": "Bearer token"}
+
+    connection = Connection()
+
+    def download_addon_private_file(addon_name, version, filename, dst):
+        module.private_downloads.append(filename)
+        path = os.path.join(dst, filename)
+        with open(path, "wb") as stream:
+            stream.write(ARCHIVE_CONTENT)
+        return path
+
+    module.connection = connection
+    module.get_server_api_connection = lambda: connection
+    module.download_addon_private_file = download_addon_private_file
+    monkeypatch.setitem(sys.modules, "ayon_api", module)
+    return module
+
+
+def _start_server(http_server, ayon_api, server):
+    ayon_api.connection.rest_url = f"{http_server(server)}/api"
+
+
+def test_download_precompressed_variant(
+    http_server, ayon_api, bundle_info, tmp_path
+):
+    server = BundlesServer()
+    _start_server(http_server, ayon_api, server)
+
+    path = distribution._get_bundle_archive(
+        str(tmp_path), "test", bundle_info
+    )
+    with open(path, "rb") as stream:
+        assert stream.read() == ARCHIVE_CONTENT
+    assert os.listdir(tmp_path / "archives") == [os.path.basename(path)]
+    assert len(server.requests) == 1
+    assert server.requests[0]["Accept-Encoding"] == "gzip"
+    assert server.requests[0]["Authorization"] == "Bearer token"
+
+    # Verified archive in store is not downloaded again
+    distribution._get_bundle_archive(str(tmp_path), "test", bundle_info)
+    assert len(server.requests) == 1
+
+
+def test_download_resumes_partial_file(
+    http_server, ayon_api, bundle_info, tmp_path
+):
+    server = BundlesServer(broken_after=100)
+    _start_server(http_server, ayon_api, server)
+
+    with pytest.raises(Exception):
+        distribution._get_bundle_archive(str(tmp_path), "test", bundle_info)
+
+    path = distribution._get_bundle_archive(
+        str(tmp_path), "test", bundle_info
+    )
+    with open(path, "rb") as stream:
+        assert stream.read() == ARCHIVE_CONTENT
+    gzip_etag = f'"{bundle_info["encodings"]["gzip"]["sha256"]}"'
+    assert server.requests[1]["Range"] == "bytes=100-"
+    assert server.requests[1]["If-Range"] == gzip_etag
+
+
+def test_download_restarts_too_big_partial_file(
+    http_server, ayon_api, bundle_info, tmp_path
+):
+    server = BundlesServer()
+    _start_server(http_server, ayon_api, server)
+    gzip_info = bundle_info["encodings"]["gzip"]
+    part_path = tmp_path / "archives" / f"{gzip_info['sha256']}.part"
+    part_path.parent.mkdir()
+    part_path.write_bytes(b"x" * (gzip_info["size"] + 10))
+
+    path = distribution._get_bundle_archive(
+        str(tmp_path), "test", bundle_info
+    )
+    with open(path, "rb") as stream:
+        assert stream.read() == ARCHIVE_CONTENT
+    assert [request.get("Range") for request in server.requests] == [
+        f"bytes={gzip_info['size'] + 10}-", None
+    ]
+
+
+def test_download_checksum_mismatch(
+    http_server, ayon_api, bundle_info, tmp_path
+):
+    server = BundlesServer()
+    _start_server(http_server, ayon_api, server)
+    gzip_info = bundle_info["encodings"]["gzip"]
+    part_path = tmp_path / "archives" / f"{gzip_info['sha256']}.part"
+    part_path.parent.mkdir()
+    # Corrupted partial file of full size is not downloaded again
+    part_path.write_bytes(b"x" * gzip_info["size"])
+
+    with pytest.raises(RuntimeError, match="does not match"):
+        distribution._get_bundle_archive(str(tmp_path), "test", bundle_info)
+    assert not part_path.exists()
+
+    path = distribution._get_bundle_archive(
+        str(tmp_path), "test", bundle_info
+    )
+    with open(path, "rb") as stream:
+        assert stream.read() == ARCHIVE_CONTENT
+
+
+def test_download_without_bundles_endpoint(
+    http_server, ayon_api, bundle_info, tmp_path
+):
+    server = BundlesServer(status_code=404)
+    _start_server(http_server, ayon_api, server)
+
+    path = distribution._get_bundle_archive(
+        str(tmp_path), "test", bundle_info
+    )
+    with open(path, "rb") as stream:
+        assert stream.read() == ARCHIVE_CONTENT
+    assert ayon_api.private_downloads == ["configs_test.zip"]
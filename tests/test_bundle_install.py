@@ -0,0 +1,253 @@
+import io
+import os
+import zlib
+import hashlib
+import zipfile
+
+import pytest
+
+from ayon_ocio import distribution, integrity
+
+FILES = {
+    "test/config.ocio": b"ocio_profile_version: 2\n",
+    "test/luts/grade.cc": b"<ColorCorrection/>\n",
+}
+
+
+def _create_archive(files):
+    stream = io.BytesIO()
+    with zipfile.ZipFile(stream, "w") as zipf:
+        for name, content in files.items():
+            zipf.writestr(name, content)
+    return stream.getvalue()
+
+
+def _get_manifest(files, checksum):
+    return {
+        "sha256": checksum,
+        "files": {
+            name: [len(content), f"{zlib.crc32(content):08x}"]
+            for name, content in files.items()
+        },
+    }
+
+
+@pytest.fixture
+def configs(tmp_path, monkeypatch):
+    """Configs dir of client code in temporary directory.
+
+    Fixture returns function which gets content of bundle archive, adds
+        the bundle to configs index and returns bundle information.
+    """
+    config_root = tmp_path / "configs"
+    configs_dir = str(config_root / "OpenColorIOConfigs")
+    verified_dir = str(config_root / ".verified")
+    monkeypatch.setattr(distribution, "CONFIG_ROOT", str(config_root))
+    monkeypatch.setattr(distribution, "CONFIGS_DIR", configs_dir)
+    stamps_dir = str(config_root / ".bundles")
+    monkeypatch.setattr(distribution, "BUNDLE_STAMPS_DIR", stamps_dir)
+    monkeypatch.setattr(integrity, "BUNDLE_STAMPS_DIR", stamps_dir)
+    monkeypatch.setattr(distribution, "VERIFIED_STAMPS_DIR", verified_dir)
+    monkeypatch.setattr(integrity, "CONFIGS_DIR", configs_dir)
+    monkeypatch.setattr(integrity, "VERIFIED_STAMPS_DIR", verified_dir)
+    monkeypatch.setattr(
+        integrity, "_manifest_cache", {"manifest": {"bundles": {}}}
+    )
+    monkeypatch.setattr(distribution, "_installed_bundles", set())
+    index = {"bundles": {}}
+    monkeypatch.setattr(distribution, "get_configs_index", lambda: index)
+    monkeypatch.setattr(integrity, "get_configs_index", lambda: index)
+    archives = {}
+    monkeypatch.setattr(
+        distribution,
+        "_get_bundle_archive",
+        lambda store_dir, bundle, info: archives[info["sha256"]],
+    )
+
+    def _add_bundle(content, manifest_files=None, bundle="test"):
+        checksum = hashlib.sha256(content).hexdigest()
+        path = tmp_path / f"{checksum}.zip"
+        path.write_bytes(content)
+        archives[checksum] = str(path)
+        if manifest_files is not None:
+            manifest = integrity._manifest_cache["manifest"]
+            manifest["bundles"][bundle] = _get_manifest(
+                manifest_files, checksum
+            )
+        bundle_info = {"filename": f"configs_{bundle}.zip", "sha256": checksum}
+        index["bundles"][bundle] = bundle_info
+        return bundle_info
+
+    return _add_bundle
+
+
+def _read_installed(configs_dir):
+    output = {}
+    for root, _, filenames in os.walk(configs_dir):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            subpath = os.path.relpath(path, configs_dir)
+            with open(path, "rb") as stream:
+                output[subpath.replace("\\", "/")] = stream.read()
+    return output
+
+
+def test_install_verifies_and_stamps_bundle(configs):
+    bundle_info = configs(_create_archive(FILES), FILES)
+
+    distribution.install_config_bundle("test", bundle_info)
+
+    assert _read_installed(distribution.CONFIGS_DIR) == FILES
+    assert (
+        distribution._get_installed_checksum("test") == bundle_info["sha256"]
+    )
+    # Files were verified before swap, verification uses the stamp
+    assert integrity._get_verified_stamp("test") is not None
+    assert integrity.verify_config_install() == {}
+
+
+def test_reinstall_replaces_bundle_folder(configs):
+    old_info = configs(_create_archive(
+        dict(FILES, **{"test/luts/old.cc": b"old"})
+    ))
+    distribution.install_config_bundle("test", old_info)
+
+    new_info = configs(_create_archive(FILES), FILES)
+    distribution.install_config_bundle("test", new_info)
+
+    # Old files are removed with old folder, no temporary dirs are left
+    assert _read_installed(distribution.CONFIGS_DIR) == FILES
+    assert os.listdir(distribution.CONFIGS_DIR) == ["test"]
+
+
+def test_invalid_extraction_keeps_installed_bundle(configs):
+    bundle_info = configs(_create_archive(FILES), FILES)
+    distribution.install_config_bundle("test", bundle_info)
+
+    broken = dict(FILES, **{"test/config.ocio": b"broken"})
+    broken_info = configs(_create_archive(broken), FILES)
+    with pytest.raises(RuntimeError, match="test/config.ocio"):
+        distribution.install_config_bundle("test", broken_info)
+
+    assert _read_installed(distribution.CONFIGS_DIR) == FILES
+    assert os.listdir(distribution.CONFIGS_DIR) == ["test"]
+    assert (
+        distribution._get_installed_checksum("test") == bundle_info["sha256"]
+    )
+
+
+def test_repair_reinstalls_broken_bundle(configs):
+    bundle_info = configs(_create_archive(FILES), FILES)
+    distribution.install_config_bundle("test", bundle_info)
+    os.remove(os.path.join(distribution.CONFIGS_DIR, "test", "config.ocio"))
+
+    assert integrity.repair_config_install() == ["test"]
+
+    assert _read_installed(distribution.CONFIGS_DIR) == FILES
+
+
+def test_needs_config_maintenance(configs, monkeypatch):
+    bundle_info = configs(_create_archive(FILES), FILES)
+    assert not integrity.needs_config_maintenance()
+
+    distribution.install_config_bundle("test", bundle_info)
+    assert not integrity.needs_config_maintenance()
+
+    # Removed file invalidates stamp of verified bundle
+    os.remove(os.path.join(distribution.CONFIGS_DIR, "test", "config.ocio"))
+    assert integrity.needs_config_maintenance()
+    integrity.maintain_config_install()
+    assert not integrity.needs_config_maintenance()
+
+    # Bundle which is not in index anymore is removed by maintenance
+    configs(_create_archive({"old/config.ocio": b""}), bundle="old")
+    distribution.get_config_path("old/config.ocio")
+    integrity.get_configs_index()["bundles"].pop("old")
+    assert integrity.needs_config_maintenance()
+    integrity.maintain_config_install()
+    assert os.listdir(distribution.CONFIGS_DIR) == ["test"]
+
+    monkeypatch.setenv(distribution.PREFETCH_BUNDLES_ENV, "test")
+    assert integrity.needs_config_maintenance()
+
+
+def _add_sized_bundles(configs, names, size):
+    for name in names:
+        configs(
+            _create_archive({f"{name}/config.ocio": b"x" * size}),
+            bundle=name,
+        )
+
+
+def test_configs_are_installed_lazily(configs):
+    _add_sized_bundles(configs, ["first", "second"], 10)
+
+    distribution.prefetch_config_bundles()
+    assert not os.path.exists(distribution.CONFIGS_DIR)
+
+    path = distribution.get_config_path("first/config.ocio")
+
+    assert os.path.exists(path)
+    assert os.listdir(distribution.CONFIGS_DIR) == ["first"]
+
+
+def test_prefetch_bundles_from_environment(configs, monkeypatch):
+    _add_sized_bundles(configs, ["first", "second", "third"], 10)
+    monkeypatch.setenv(distribution.PREFETCH_BUNDLES_ENV, "first, third")
+
+    distribution.prefetch_config_bundles()
+
+    assert sorted(os.listdir(distribution.CONFIGS_DIR)) == [
+        "first", "third"
+    ]
+
+
+def test_resolve_config_path(configs, tmp_path):
+    _add_sized_bundles(configs, ["first"], 10)
+
+    path = distribution.resolve_config_path(
+        "{BUILTIN_OCIO_ROOT}/first/config.ocio"
+    )
+
+    assert path == os.path.join(
+        distribution.CONFIGS_DIR, "first", "config.ocio"
+    )
+    assert os.path.exists(path)
+    # Paths outside of configs dir are not changed
+    other_path = str(tmp_path / "studio" / "config.ocio")
+    assert distribution.resolve_config_path(other_path) == other_path
+
+
+def test_evict_least_recently_used_configs(configs, monkeypatch):
+    _add_sized_bundles(configs, ["first", "second", "third"], 1000)
+    monkeypatch.setenv(distribution.CONFIGS_MAX_SIZE_ENV, "2500")
+
+    for bundle in ("first", "second"):
+        distribution.get_config_path(f"{bundle}/config.ocio")
+        # Other processes used the bundles
+        distribution._installed_bundles.clear()
+    stamp_path = os.path.join(distribution.BUNDLE_STAMPS_DIR, "first")
+    os.utime(stamp_path, (0, 0))
+    distribution.ensure_config_bundles(["first"])
+    distribution._installed_bundles.clear()
+    # 'first' was used again, so 'second' is least recently used
+    os.utime(os.path.join(distribution.BUNDLE_STAMPS_DIR, "second"), (1, 1))
+
+    distribution.get_config_path("third/config.ocio")
+
+    assert sorted(os.listdir(distribution.CONFIGS_DIR)) == [
+        "first", "third"
+    ]
+    assert distribution._get_installed_checksum("second") is None
+
+
+def test_configs_used_by_process_are_not_evicted(configs, monkeypatch):
+    _add_sized_bundles(configs, ["first", "second"], 1000)
+    monkeypatch.setenv(distribution.CONFIGS_MAX_SIZE_ENV, "1500")
+
+    distribution.get_config_path("first/config.ocio")
+    distribution.get_config_path("second/config.ocio")
+
+    assert sorted(os.listdir(distribution.CONFIGS_DIR)) == [
+        "first", "second"
+    ]
@@ -0,0 +1,335 @@
+import os
+import sys
+import asyncio
+import gzip
+import json
+import types
+import hashlib
+import importlib.util
+from typing import Annotated, Optional
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi import APIRouter, Depends, FastAPI  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from pydantic import BaseModel, Field  # noqa: E402
+
+from conftest import REPO_ROOT  # noqa: E402
+
+ARCHIVE_CONTENT = b"PK" + bytes(range(256)) * 64
+OTHER_CONTENT = b"PK" + b"other" * 64
+ADDON_URL = "/api/addons/ayon_ocio/1.0.0"
+BUNDLE_URL = f"{ADDON_URL}/bundles/test"
+
+
+def _create_ayon_server_stubs():
+    """Minimal 'ayon_server' so server addon can be used without server.
+
+    Addon endpoints are added to router of addon, settings are taken from
+        values set on addon or from default settings.
+    """
+    ayon_server = types.ModuleType("ayon_server")
+    addons = types.ModuleType("ayon_server.addons")
+    api = types.ModuleType("ayon_server.api")
+    dependencies = types.ModuleType("ayon_server.api.dependencies")
+    exceptions = types.ModuleType("ayon_server.exceptions")
+    settings = types.ModuleType("ayon_server.settings")
+
+    class NotFoundException(Exception):
+        status = 404
+
+        def __init__(self, detail: str = "Not found"):
+            super().__init__(detail)
+            self.detail = detail
+
+    class BaseSettingsModel(BaseModel):
+        pass
+
+    class BaseServerAddon:
+        settings_model = None
+
+        def __init__(self, private_dir: Optional[str]):
+            self.router = APIRouter()
+            self.studio_values = None
+            self.project_values = {}
+            self._private_dir = private_dir
+            self.initialize()
+
+        def initialize(self):
+            pass
+
+        def add_endpoint(self, path, handler, *, method="GET", **kwargs):
+            self.router.add_api_route(f"/{path}", handler, methods=[method])
+
+        def get_private_dir(self) -> Optional[str]:
+            return self._private_dir
+
+        def get_settings_model(self):
+            return self.settings_model
+
+        async def get_studio_settings(self):
+            if self.studio_values is None:
+                return await self.get_default_settings()
+            return self.settings_model(**self.studio_values)
+
+        async def get_project_settings(self, project_name):
+            values = self.project_values.get(project_name)
+            if values is None:
+                return await self.get_studio_settings()
+            return self.settings_model(**values)
+
+    addons.BaseServerAddon = BaseServerAddon
+    dependencies.CurrentUser = Annotated[str, Depends(lambda: "admin")]
+    exceptions.NotFoundException = NotFoundException
+    settings.BaseSettingsModel = BaseSettingsModel
+    settings.SettingsField = Field
+    return {
+        "ayon_server": ayon_server,
+        "ayon_server.addons": addons,
+        "ayon_server.api": api,
+        "ayon_server.api.dependencies": dependencies,
+        "ayon_server.exceptions": exceptions,
+        "ayon_server.settings": settings,
+    }
+
+
+@pytest.fixture
+def server_addon_module(monkeypatch):
+    for name, module in _create_ayon_server_stubs().items():
+        monkeypatch.setitem(sys.modules, name, module)
+    server_dir = os.path.join(REPO_ROOT, "server")
+    spec = importlib.util.spec_from_file_location(
+        "ayon_ocio_server",
+        os.path.join(server_dir, "__init__.py"),
+        submodule_search_locations=[server_dir],
+    )
+    module = importlib.util.module_from_spec(spec)
+    for name in ("ayon_ocio_server.settings", "ayon_ocio_server.bundles"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    monkeypatch.setitem(sys.modules, "ayon_ocio_server", module)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _get_info(filename, content):
+    return {
+        "filename": filename,
+        "sha256": hashlib.sha256(content).hexdigest(),
+        "size": len(content),
+    }
+
+
+@pytest.fixture
+def bundle_info():
+    info = _get_info("configs_test.zip", ARCHIVE_CONTENT)
+    info["files"] = 1
+    info["encodings"] = {
+        "gzip": _get_info(
+            "configs_test.zip.gz", gzip.compress(ARCHIVE_CONTENT, mtime=0)
+        ),
+    }
+    return info
+
+
+@pytest.fixture
+def private_dir(tmp_path, server_addon_module, bundle_info):
+    other_info = _get_info("configs_other.zip", OTHER_CONTENT)
+    other_info["files"] = 1
+    (tmp_path / "configs_test.zip").write_bytes(ARCHIVE_CONTENT)
+    (tmp_path / "configs_test.zip.gz").write_bytes(
+        gzip.compress(ARCHIVE_CONTENT, mtime=0)
+    )
+    (tmp_path / "configs_other.zip").write_bytes(OTHER_CONTENT)
+    index_path = tmp_path / server_addon_module.CONFIGS_INDEX_FILENAME
+    index_path.write_text(json.dumps({
+        "version": 1,
+        "bundles": {"test": bundle_info, "other": other_info},
+    }))
+    return tmp_path
+
+
+@pytest.fixture
+def addon(server_addon_module, private_dir):
+    return server_addon_module.OCIODistAddon(str(private_dir))
+
+
+@pytest.fixture
+def client(addon, server_addon_module):
+    not_found_cls = sys.modules["ayon_server.exceptions"].NotFoundException
+    app = FastAPI()
+    app.include_router(addon.router, prefix=ADDON_URL)
+    app.add_exception_handler(
+        not_found_cls,
+        lambda request, exc: JSONResponse(
+            {"detail": exc.detail}, status_code=exc.status
+        ),
+    )
+    return TestClient(app)
+
+
+def _get_enabled(client, **params):
+    response = client.get(f"{ADDON_URL}/bundles", params=params)
+    assert response.status_code == 200
+    return {
+        bundle["name"]: bundle["enabled"]
+        for bundle in response.json()["bundles"]
+    }
+
+
+def test_list_bundles(client, bundle_info):
+    response = client.get(f"{ADDON_URL}/bundles")
+
+    assert response.status_code == 200
+    bundles = response.json()["bundles"]
+    assert [bundle["name"] for bundle in bundles] == ["other", "test"]
+    assert bundles[1] == {
+        "name": "test",
+        "filename": "configs_test.zip",
+        "sha256": bundle_info["sha256"],
+        "size": bundle_info["size"],
+        "files": 1,
+        "encodings": ["gzip"],
+        "enabled": True,
+    }
+
+
+def test_list_bundles_enabled_by_settings(client, addon):
+    addon.studio_values = {
+        "bundles": [{"name": "other", "enabled": False}],
+    }
+    addon.project_values["project"] = {
+        "bundles": [{"name": "test", "enabled": False}],
+    }
+
+    assert _get_enabled(client) == {"other": False, "test": True}
+    assert _get_enabled(client, project_name="project") == {
+        "other": True, "test": False
+    }
+    # Project without overrides uses studio settings
+    assert _get_enabled(client, project_name="shots") == {
+        "other": False, "test": True
+    }
+
+
+def test_default_settings_list_bundles(addon):
+    settings = asyncio.run(addon.get_default_settings())
+
+    assert [bundle.name for bundle in settings.bundles] == ["other", "test"]
+    assert all(bundle.enabled for bundle in settings.bundles)
+
+
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+def test_full_response(client, bundle_info):
+    response = client.get(BUNDLE_URL, headers=IDENTITY)
+    assert response.status_code == 200
+    assert response.content == ARCHIVE_CONTENT
+    assert response.headers["etag"] == f'"{bundle_info["sha256"]}"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert "content-encoding" not in response.headers
+
+
+def test_precompressed_variant(client, bundle_info):
+    response = client.get(
+        BUNDLE_URL, headers={"Accept-Encoding": "gzip"}
+    )
+    gzip_info = bundle_info["encodings"]["gzip"]
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == f'"{gzip_info["sha256"]}"'
+    assert response.headers["content-length"] == str(gzip_info["size"])
+    # Test client decodes content encoding
+    assert response.content == ARCHIVE_CONTENT
+
+
+def test_not_modified(client, bundle_info):
+    response = client.get(
+        BUNDLE_URL,
+        headers={**IDENTITY, "If-None-Match": f'"{bundle_info["sha256"]}"'},
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_range(client):
+    response = client.get(
+        BUNDLE_URL, headers={**IDENTITY, "Range": "bytes=100-"}
+    )
+    size = len(ARCHIVE_CONTENT)
+    assert response.status_code == 206
+    assert response.content == ARCHIVE_CONTENT[100:]
+    assert response.headers["content-range"] == f"bytes 100-{size - 1}/{size}"
+
+    response = client.get(
+        BUNDLE_URL, headers={**IDENTITY, "Range": "bytes=-10"}
+    )
+    assert response.status_code == 206
+    assert response.content == ARCHIVE_CONTENT[-10:]
+
+
+def test_range_not_satisfiable(client):
+    size = len(ARCHIVE_CONTENT)
+    response = client.get(
+        BUNDLE_URL, headers={**IDENTITY, "Range": f"bytes={size}-"}
+    )
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{size}"
+
+
+@pytest.mark.parametrize(
+    "if_range,status_code",
+    [
+        (None, 206),
+        ('"other"', 200),
+        ("*", 200),
+        ("Thu, 01 Jan 2026 00:00:00 GMT", 200),
+    ],
+)
+def test_if_range(client, bundle_info, if_range, status_code):
+    headers = {**IDENTITY, "Range": "bytes=10-19"}
+    headers["If-Range"] = if_range or f'"{bundle_info["sha256"]}"'
+    response = client.get(BUNDLE_URL, headers=headers)
+    assert response.status_code == status_code
+    if status_code == 206:
+        assert response.content == ARCHIVE_CONTENT[10:20]
+    else:
+        assert response.content == ARCHIVE_CONTENT
+
+
+def test_head(client):
+    response = client.head(BUNDLE_URL, headers=IDENTITY)
+    assert response.status_code == 200
+    assert response.headers["content-length"] == str(len(ARCHIVE_CONTENT))
+    assert response.content == b""
+
+
+def test_missing_file(client, private_dir):
+    os.remove(private_dir / "configs_test.zip")
+    response = client.get(BUNDLE_URL, headers=IDENTITY)
+    assert response.status_code == 404
+    assert response.json()["detail"] == (
+        "Archive of bundle 'test' not found"
+    )
+
+
+@pytest.mark.parametrize("method", ["GET", "HEAD"])
+def test_unknown_bundle(client, method):
+    response = client.request(
+        method, f"{ADDON_URL}/bundles/unknown", headers=IDENTITY
+    )
+    assert response.status_code == 404
+
+
+def test_package_without_private_dir(server_addon_module):
+    addon = server_addon_module.OCIODistAddon(None)
+    app = FastAPI()
+    app.include_router(addon.router, prefix=ADDON_URL)
+    client = TestClient(app)
+
+    response = client.get(f"{ADDON_URL}/bundles")
+    assert response.json() == {"bundles": []}
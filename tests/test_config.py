@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from ayon_ocio import config as ocio_config
+
+CONFIG_CONTENT = """ocio_profile_version: 2
+
+roles:
+  default: Raw
+
+colorspaces:
+  - !<ColorSpace>
+    name: Raw
+    family: Utility
+"""
+
+
+@pytest.fixture(autouse=True)
+def configs_cache(monkeypatch):
+    monkeypatch.setattr(ocio_config, "_configs_cache", {})
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.ocio"
+    path.write_text(CONFIG_CONTENT)
+    return path
+
+
+def _get_cached_configs():
+    cache_dir = ocio_config.get_config_cache_dir()
+    if not os.path.isdir(cache_dir):
+        return []
+    return sorted(
+        name for name in os.listdir(cache_dir) if name.endswith(".pickle")
+    )
+
+
+def _fail_parse(content):
+    raise AssertionError("Cached config was parsed again")
+
+
+def test_load_config(config_path):
+    config = ocio_config.load_config(str(config_path))
+
+    assert config.get_colorspace_name("RAW") == "Raw"
+    assert config.get_role_colorspace("default") == "Raw"
+    assert ocio_config.load_config(str(config_path)) is config
+
+
+def test_config_cached_on_disk(config_path, monkeypatch):
+    config = ocio_config.load_config(str(config_path))
+    assert len(_get_cached_configs()) == 1
+
+    # Other process loads parsed config from cache
+    monkeypatch.setattr(ocio_config, "_configs_cache", {})
+    monkeypatch.setattr(ocio_config, "parse_ocio_yaml", _fail_parse)
+    cached = ocio_config.load_config(str(config_path))
+
+    assert cached is not config
+    assert cached.get_colorspace_name("raw") == "Raw"
+
+
+def test_changed_size_invalidates_cache(config_path):
+    ocio_config.load_config(str(config_path))
+    file_stat = os.stat(config_path)
+
+    config_path.write_text(CONFIG_CONTENT.replace("Raw", "Linear"))
+    os.utime(config_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+    config = ocio_config.load_config(str(config_path))
+
+    assert config.get_colorspace_name("linear") == "Linear"
+    assert not config.has_colorspace("Raw")
+    assert len(_get_cached_configs()) == 2
+
+
+def test_changed_mtime_invalidates_cache(config_path):
+    ocio_config.load_config(str(config_path))
+    file_stat = os.stat(config_path)
+
+    # Same size, cache is valid until modification time changes
+    config_path.write_text(CONFIG_CONTENT.replace("Raw", "Log"))
+    os.utime(config_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+    assert ocio_config.load_config(str(config_path)).has_colorspace("Raw")
+
+    os.utime(config_path, ns=(
+        file_stat.st_atime_ns, file_stat.st_mtime_ns + 1_000_000_000
+    ))
+    config = ocio_config.load_config(str(config_path))
+
+    assert config.get_colorspace_name("log") == "Log"
+    assert not config.has_colorspace("Raw")
+    assert len(_get_cached_configs()) == 2
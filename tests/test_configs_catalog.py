@@ -0,0 +1,65 @@
+import io
+import zipfile
+
+import create_package
+
+CONFIG = """ocio_profile_version: 2.1
+name: studio-config-v1.0.0_aces-v1.3_ocio-v2.1
+roles:
+  scene_linear: ACEScg
+  color_timing: ACEScct
+shared_views:
+  - !<View> {name: Un-tone-mapped, view_transform: Un-tone-mapped,
+      display_colorspace: <USE_DISPLAY_NAME>}
+displays:
+  sRGB - Display:
+    - !<View> {name: ACES 1.0 - SDR Video, view_transform: SDR,
+        display_colorspace: sRGB - Display}
+    - !<View>
+      name: Raw
+      colorspace: Raw
+    - !<Views> [Un-tone-mapped]
+colorspaces:
+  - !<ColorSpace>
+    name: ACEScg
+    aliases: [lin_ap1]
+  - !<ColorSpace> {name: Raw, isdata: true}
+display_colorspaces:
+  - !<ColorSpace>
+    name: sRGB - Display
+"""
+
+
+def test_catalog_entry():
+    entry = create_package.get_config_catalog_entry(
+        io.BytesIO(CONFIG.encode("utf-8")), "aces_1.3\\config.ocio"
+    )
+
+    assert entry == {
+        "path": "aces_1.3/config.ocio",
+        "name": "studio-config-v1.0.0_aces-v1.3_ocio-v2.1",
+        "ocio_profile_version": "2.1",
+        "aces_version": "1.3",
+        "colorspaces": ["ACEScg", "Raw", "sRGB - Display"],
+        "roles": {"scene_linear": "ACEScg", "color_timing": "ACEScct"},
+        "displays": {
+            "sRGB - Display": [
+                "ACES 1.0 - SDR Video", "Raw", "Un-tone-mapped"
+            ],
+        },
+    }
+
+
+def test_catalog_entry_of_ocioz():
+    stream = io.BytesIO()
+    with zipfile.ZipFile(stream, "w") as zipf:
+        zipf.writestr(create_package.OCIOZ_CONFIG_NAME, CONFIG)
+
+    entry = create_package.get_config_catalog_entry(
+        stream, "legacy/config.ocioz"
+    )
+
+    assert entry["path"] == "legacy/config.ocioz"
+    assert entry["colorspaces"] == ["ACEScg", "Raw", "sRGB - Display"]
+    # Stream can be read again by following stages
+    assert stream.tell() == 0
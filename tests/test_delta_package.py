@@ -0,0 +1,148 @@
+import io
+import os
+import json
+import logging
+import zipfile
+
+import pytest
+
+import create_package
+
+log = logging.getLogger("test_delta_package")
+
+CLIENT_DIR = create_package.ADDON_CLIENT_DIR
+CONFIGS_SUBPATH = (
+    f"{CLIENT_DIR}/configs/{create_package.CONFIGS_FOLDER_NAME}"
+)
+
+BASE_FILES = {
+    f"{CLIENT_DIR}/__init__.py": b"# base\n",
+    f"{CLIENT_DIR}/version.py": b'__version__ = "1.0.0"\n',
+    f"{CLIENT_DIR}/removed.py": b"# removed in new version\n",
+    f"{CONFIGS_SUBPATH}/aces/config.ocio": b"ocio_profile_version: 2\n",
+    f"{CONFIGS_SUBPATH}/aces/luts/old.spi1d": b"old lut\n",
+}
+NEW_FILES = {
+    f"{CLIENT_DIR}/__init__.py": b"# base\n",
+    f"{CLIENT_DIR}/version.py": b'__version__ = "1.1.0"\n',
+    f"{CLIENT_DIR}/added.py": b"# added in new version\n",
+    f"{CONFIGS_SUBPATH}/aces/config.ocio": b"ocio_profile_version: 2\n",
+    f"{CONFIGS_SUBPATH}/aces/luts/new.spi1d": b"new lut\n",
+}
+
+
+def _create_archive(files):
+    stream = io.BytesIO()
+    with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for name, content in files.items():
+            zipf.writestr(name, content)
+    return stream.getvalue()
+
+
+def _create_package(path, version, files):
+    """Addon package with client archive and one config bundle."""
+    client_files = {}
+    bundle_files = {}
+    for name, content in files.items():
+        if name.startswith(f"{CONFIGS_SUBPATH}/"):
+            bundle_files[name[len(CONFIGS_SUBPATH) + 1:]] = content
+        else:
+            client_files[name] = content
+    bundle_filename = create_package.CONFIGS_ZIP_TEMPLATE.format(
+        bundle="aces"
+    )
+    with zipfile.ZipFile(path, "w") as zipf:
+        zipf.writestr("package.py", f'version = "{version}"\n')
+        zipf.writestr(
+            f"private/{create_package.CLIENT_ZIP_FILENAME}",
+            _create_archive(client_files),
+        )
+        zipf.writestr(
+            f"private/{bundle_filename}", _create_archive(bundle_files)
+        )
+    return str(path)
+
+
+def _read_tree(root):
+    output = {}
+    for path, sub_path in create_package.iter_files_in_subdir(str(root)):
+        with open(path, "rb") as stream:
+            output[sub_path.replace("\\", "/")] = stream.read()
+    return output
+
+
+@pytest.fixture
+def packages(tmp_path):
+    base_path = _create_package(
+        tmp_path / "base.zip", "1.0.0", BASE_FILES
+    )
+    new_path = _create_package(tmp_path / "new.zip", "1.1.0", NEW_FILES)
+    delta_path = create_package.create_delta_package(
+        str(tmp_path), new_path, base_path, log
+    )
+    return base_path, delta_path
+
+
+def test_delta_round_trip(packages, tmp_path):
+    base_path, delta_path = packages
+    with zipfile.ZipFile(delta_path) as zipf:
+        delta_names = set(zipf.namelist())
+        delta_info = json.loads(
+            zipf.read(create_package.DELTA_MANIFEST_FILENAME)
+        )
+
+    assert delta_info["removed"] == [
+        f"{CONFIGS_SUBPATH}/aces/luts/old.spi1d",
+        f"{CLIENT_DIR}/removed.py",
+    ]
+
+    # Unchanged files are taken from base
+    assert f"files/{CLIENT_DIR}/__init__.py" not in delta_names
+    assert f"files/{CLIENT_DIR}/added.py" in delta_names
+
+    output_dir = tmp_path / "client"
+    create_package.apply_delta_package(
+        delta_path, base_path, str(output_dir), log
+    )
+
+    # Removed files are not in rebuilt tree
+    assert _read_tree(output_dir) == NEW_FILES
+
+
+def test_delta_applied_to_client_tree(packages, tmp_path):
+    _, delta_path = packages
+    base_dir = tmp_path / "base"
+    for name, content in BASE_FILES.items():
+        path = base_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+    output_dir = tmp_path / "client"
+    create_package.apply_delta_package(
+        delta_path, str(base_dir), str(output_dir), log
+    )
+
+    assert _read_tree(output_dir) == NEW_FILES
+
+
+def test_delta_rejects_wrong_base(packages, tmp_path):
+    _, delta_path = packages
+    base_files = dict(BASE_FILES)
+    base_files[f"{CLIENT_DIR}/__init__.py"] = b"# other base\n"
+    wrong_base_path = _create_package(
+        tmp_path / "wrong.zip", "1.0.0", base_files
+    )
+    output_dir = tmp_path / "client"
+    output_dir.mkdir()
+    (output_dir / "existing.txt").write_bytes(b"existing")
+
+    with pytest.raises(RuntimeError, match="does not match"):
+        create_package.apply_delta_package(
+            delta_path, wrong_base_path, str(output_dir), log
+        )
+
+    # Output is replaced only by valid tree
+    assert _read_tree(output_dir) == {"existing.txt": b"existing"}
+    assert [
+        name for name in os.listdir(tmp_path) if name.startswith(".delta_")
+    ] == []
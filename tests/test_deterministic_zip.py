@@ -0,0 +1,41 @@
+import io
+import os
+import zipfile
+
+import create_package
+
+FILES = {
+    "b/second.txt": b"second" * 100,
+    "a.txt": b"first" * 100,
+    "b/a/third.txt": b"third" * 100,
+}
+
+
+def _write(zip_cls, target, names):
+    with zip_cls(target, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for name in names:
+            zipf.writestr(name, FILES[name])
+
+
+def test_sorted_zip_file(tmp_path):
+    target = tmp_path / "sorted.zip"
+
+    _write(create_package.SortedZipFile, str(target), list(FILES))
+
+    # Same as deterministic zip file written in sorted order
+    expected = io.BytesIO()
+    _write(create_package.DeterministicZipFile, expected, sorted(FILES))
+    assert target.read_bytes() == expected.getvalue()
+    # Temporary zip file is removed
+    assert os.listdir(tmp_path) == ["sorted.zip"]
+
+
+def test_sorted_zip_file_to_stream():
+    stream = io.BytesIO()
+
+    _write(create_package.SortedZipFile, stream, list(FILES))
+
+    stream.seek(0)
+    with zipfile.ZipFile(stream) as zipf:
+        assert zipf.namelist() == sorted(FILES)
+        assert zipf.testzip() is None
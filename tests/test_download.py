@@ -0,0 +1,357 @@
+import os
+import hashlib
+import logging
+
+import pytest
+
+import create_package
+
+CONTENT = bytes(range(256)) * 1024
+CHECKSUM = hashlib.sha256(CONTENT).hexdigest()
+log = logging.getLogger("test_download")
+
+
+class FileServer:
+    """Serve content with range requests and scripted failures.
+
+    Args:
+        behaviors (list[str]): Behavior of each request, last behavior is
+            used for all following requests. 'ok' sends content, 'broken'
+            closes connection in the middle of content, 'ignore_range'
+            sends whole content on range request, 'wrong_range' sends
+            content from start as partial response, 'wrong' sends
+            different content and other values are status codes.
+    """
+    def __init__(self, *behaviors):
+        self.behaviors = list(behaviors) or ["ok"]
+        self.requests = []
+
+    def __call__(self, handler):
+        self.requests.append(dict(handler.headers))
+        behavior = self.behaviors[0]
+        if len(self.behaviors) > 1:
+            self.behaviors.pop(0)
+
+        if behavior.isdigit():
+            handler.send_response(int(behavior))
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+
+        content = CONTENT
+        if behavior == "wrong":
+            content = bytes(reversed(CONTENT))
+
+        status_code = 200
+        start = 0
+        range_header = handler.headers.get("Range")
+        if range_header and behavior != "ignore_range":
+            start = int(range_header.split("=")[1].rstrip("-"))
+            if start >= len(content):
+                handler.send_response(416)
+                handler.send_header("Content-Length", "0")
+                handler.end_headers()
+                return
+            status_code = 206
+
+        if behavior == "wrong_range":
+            start = 0
+        body = content[start:]
+        handler.send_response(status_code)
+        if status_code == 206:
+            handler.send_header(
+                "Content-Range",
+                f"bytes {start}-{len(content) - 1}/{len(content)}"
+            )
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        if behavior == "broken":
+            body = body[:len(body) // 2]
+            handler.close_connection = True
+        handler.wfile.write(body)
+
+
+@pytest.fixture
+def checksum_cache(tmp_path):
+    return create_package.ChecksumCache(
+        cache_path=str(tmp_path / "checksums.json")
+    )
+
+
+def _download(
+    url, filepath, checksum_cache, checksum=CHECKSUM, retries=5, **kwargs
+):
+    create_package.download_file(
+        url,
+        str(filepath),
+        checksum,
+        checksum_cache,
+        log,
+        retries=retries,
+        timeout=5.0,
+        backoff=0.0,
+        **kwargs
+    )
+
+
+def test_download(http_server, checksum_cache, tmp_path):
+    server = FileServer("ok")
+    url = f"{http_server(server)}/file.zip"
+    filepath = tmp_path / "file.zip"
+
+    _download(url, filepath, checksum_cache)
+
+    assert filepath.read_bytes() == CONTENT
+    assert not os.path.exists(f"{filepath}.part")
+    assert checksum_cache.is_valid(str(filepath), CHECKSUM)
+    assert len(server.requests) == 1
+
+
+def test_resume_broken_download(http_server, checksum_cache, tmp_path):
+    server = FileServer("broken", "broken", "ok")
+    url = f"{http_server(server)}/file.zip"
+    filepath = tmp_path / "file.zip"
+
+    _download(url, filepath, checksum_cache)
+
+    assert filepath.read_bytes() == CONTENT
+    ranges = [request.get("Range") for request in server.requests]
+    half = len(CONTENT) // 2
+    assert ranges == [
+        None,
+        f"bytes={half}-",
+        f"bytes={half + (len(CONTENT) - half) // 2}-",
+    ]
+
+
+def test_resume_of_previous_partial_file(
+    http_server, checksum_cache, tmp_path
+):
+    server = FileServer("ok")
+    url = f"{http_server(server)}/file.zip"
+    filepath = tmp_path / "file.zip"
+    with open(f"{filepath}.part", "wb") as stream:
+        stream.write(CONTENT[:1000])
+
+    _download(url, filepath, checksum_cache)
+
+    assert filepath.read_bytes() == CONTENT
+    assert server.requests[0]["Range"] == "bytes=1000-"
+
+
+def test_server_ignores_range(http_server, checksum_cache, tmp_path):
+    server = FileServer("ignore_range")
+    url = f"{http_server(server)}/file.zip"
+    filepath = tmp_path / "file.zip"
+    with open(f"{filepath}.part", "wb") as stream:
+        stream.write(CONTENT[:1000])
+
+    _download(url, filepath, checksum_cache)
+
+    assert filepath.read_bytes() == CONTENT
+
+
+def test_complete_partial_file(http_server, checksum_cache, tmp_path):
+    server = FileServer("ok")
+    url = f"{http_server(server)}/file.zip"
+    filepath = tmp_path / "file.zip"
+    with open(f"{filepath}.part", "wb") as stream:
+        stream.write(CONTENT)
+
+    _download(url, filepath, checksum_cache)
+
+    assert filepath.read_bytes() == CONTENT
+    assert server.requests[0]["Range"] == f"bytes={len(CONTENT)}-"
+
+
+def test_retry_server_error(http_server, checksum_cache, tmp_path):
+    server = FileServer("500", "503", "ok")
+    url = f"{http_server(server)}/file.zip"
+    filepath = tmp_path / "file.zip"
+
+    _download(url, filepath, checksum_cache)
+
+    assert filepath.read_bytes() == CONTENT
+    assert len(server.requests) == 3
+
+
+def test_fail_after_retries(http_server, checksum_cache, tmp_path):
+    server = FileServer("500")
+    url = f"{http_server(server)}/file.zip"
+    filepath = tmp_path / "file.zip"
+
+    with pytest.raises(RuntimeError, match="after 3 attempts"):
+        _download(url, filepath, checksum_cache, retries=3)
+
+    assert len(server.requests) == 3
+    assert not filepath.exists()
+
+
+def test_fail_after_max_attempts_with_progress(
+    http_server, checksum_cache, tmp_path
+):
+    # Each attempt downloads half of remaining content
+    server = FileServer("broken")
+    url = f"{http_server(server)}/file.zip"
+    filepath = tmp_path / "file.zip"
+
+    with pytest.raises(RuntimeError, match="after 6 attempts"):
+        _download(url, filepath, checksum_cache, retries=2, max_attempts=6)
+
+    assert len(server.requests) == 6
+    assert not filepath.exists()
+
+
+def test_wrong_content_range_discards_partial_file(
+    http_server, checksum_cache, tmp_path
+):
+    server = FileServer("wrong_range", "ok")
+    url = f"{http_server(server)}/file.zip"
+    filepath = tmp_path / "file.zip"
+    with open(f"{filepath}.part", "wb") as stream:
+        stream.write(CONTENT[:1000])
+
+    _download(url, filepath, checksum_cache)
+
+    assert filepath.read_bytes() == CONTENT
+    # Partial file was discarded and whole file downloaded again
+    assert [request.get("Range") for request in server.requests] == [
+        "bytes=1000-", None
+    ]
+
+
+def test_client_error_is_not_retried(http_server, checksum_cache, tmp_path):
+    server = FileServer("404")
+    url = f"{http_server(server)}/file.zip"
+    filepath = tmp_path / "file.zip"
+
+    with pytest.raises(create_package.DownloadError):
+        _download(url, filepath, checksum_cache)
+
+    assert len(server.requests) == 1
+
+
+def test_checksum_mismatch(http_server, checksum_cache, tmp_path):
+    server = FileServer("wrong")
+    url = f"{http_server(server)}/file.zip"
+    filepath = tmp_path / "file.zip"
+
+    with pytest.raises(RuntimeError, match="Checksum does not match"):
+        _download(url, filepath, checksum_cache, retries=2)
+
+    # Invalid partial file is not resumed
+    assert [request.get("Range") for request in server.requests] == [
+        None, None
+    ]
+    assert not filepath.exists()
+    assert not os.path.exists(f"{filepath}.part")
+
+
+def test_checksum_mismatch_is_retried(http_server, checksum_cache, tmp_path):
+    server = FileServer("wrong", "ok")
+    url = f"{http_server(server)}/file.zip"
+    filepath = tmp_path / "file.zip"
+
+    _download(url, filepath, checksum_cache)
+
+    assert filepath.read_bytes() == CONTENT
+
+
+def test_ensure_downloaded_skips_valid_file(
+    http_server, checksum_cache, tmp_path
+):
+    server = FileServer("ok")
+    url = f"{http_server(server)}/file.zip"
+    filepath = tmp_path / "file.zip"
+    filepath.write_bytes(CONTENT)
+
+    path = create_package.ensure_downloaded(
+        url, str(filepath), CHECKSUM, checksum_cache, log
+    )
+
+    assert path == str(filepath)
+    assert server.requests == []
+
+
+def test_ensure_downloaded_uses_download_cache(
+    http_server, checksum_cache, tmp_path
+):
+    server = FileServer("ok")
+    url = f"{http_server(server)}/file.zip"
+    download_cache = create_package.DownloadCache(
+        str(tmp_path / "cache"), 1024 ** 3
+    )
+
+    for dirname in ("first", "second"):
+        filepath = tmp_path / dirname / "file.zip"
+        filepath.parent.mkdir()
+        create_package.ensure_downloaded(
+            url,
+            str(filepath),
+            CHECKSUM,
+            checksum_cache,
+            log,
+            download_cache,
+        )
+        assert filepath.read_bytes() == CONTENT
+
+    # Second checkout got the file from download cache
+    assert len(server.requests) == 1
+
+
+def _publish(download_cache, tmp_path, content):
+    filepath = tmp_path / "src" / hashlib.md5(content).hexdigest()
+    filepath.parent.mkdir(exist_ok=True)
+    filepath.write_bytes(content)
+    checksum = hashlib.sha256(content).hexdigest()
+    download_cache.publish(str(filepath), checksum)
+    return checksum
+
+
+def _set_last_use(download_cache, checksum, atime_ns):
+    path = download_cache.get_path(checksum)
+    os.utime(path, ns=(atime_ns, os.stat(path).st_mtime_ns))
+
+
+def _get_cached(download_cache, checksums):
+    return [
+        checksum
+        for checksum in checksums
+        if os.path.exists(download_cache.get_path(checksum))
+    ]
+
+
+def test_download_cache_evicts_least_recently_used(
+    checksum_cache, tmp_path
+):
+    download_cache = create_package.DownloadCache(
+        str(tmp_path / "cache"), 250
+    )
+    first = _publish(download_cache, tmp_path, b"1" * 100)
+    second = _publish(download_cache, tmp_path, b"2" * 100)
+    _set_last_use(download_cache, first, 1_000_000_000)
+    _set_last_use(download_cache, second, 2_000_000_000)
+
+    # Fetch marks file as used
+    assert download_cache.fetch(
+        first, str(tmp_path / "fetched"), checksum_cache
+    )
+    third = _publish(download_cache, tmp_path, b"3" * 100)
+
+    assert _get_cached(download_cache, [first, second, third]) == [
+        first, third
+    ]
+
+
+def test_download_cache_keeps_published_file(tmp_path):
+    download_cache = create_package.DownloadCache(
+        str(tmp_path / "cache"), 150
+    )
+    first = _publish(download_cache, tmp_path, b"1" * 100)
+    # Used later than the published file
+    _set_last_use(download_cache, first, 3_000_000_000_000_000_000)
+
+    # Just published file is kept even when it does not fit the cache
+    second = _publish(download_cache, tmp_path, b"2" * 200)
+
+    assert _get_cached(download_cache, [first, second]) == [second]
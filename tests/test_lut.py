@@ -0,0 +1,191 @@
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ayon_ocio import lut  # noqa: E402
+
+SPI1D = """Version 1
+From -0.5 1.5
+Length 3
+Components 1
+{
+    0.0
+    0.5
+    1.0
+}
+"""
+SPI3D = "SPILUT 1.0\n3 3\n2 2 2\n" + "".join(
+    f"{r} {g} {b} {r * 0.5:.1f} {g * 0.25:.2f} {b:.1f}\n"
+    for r in range(2)
+    for g in range(2)
+    for b in range(2)
+)
+CUBE_3D = """# Comment
+TITLE "test"
+LUT_3D_SIZE 2
+DOMAIN_MIN 0 0 0
+DOMAIN_MAX 2 2 2
+0 0 0
+1 0 0
+0 1 0
+1 1 0
+0 0 1
+1 0 1
+0 1 1
+1 1 1 # White
+"""
+CUBE_1D = """LUT_1D_SIZE 2
+LUT_1D_INPUT_RANGE 0.0 4.0
+0 0 0
+1 2 3
+"""
+CSP_1D = """CSPLUTV100
+1D
+
+BEGIN METADATA
+test
+END METADATA
+
+2
+0.0 1.0
+0.0 1.0
+2
+0.0 1.0
+0.0 1.0
+2
+0.0 1.0
+0.0 1.0
+
+2
+0.0 0.0 0.0
+1.0 0.5 0.25
+"""
+
+
+@pytest.fixture(autouse=True)
+def luts_cache(monkeypatch):
+    monkeypatch.setattr(lut, "_luts_cache", {})
+
+
+def test_parse_spi1d():
+    parsed = lut.parse_spi1d(SPI1D)
+
+    assert parsed.dimensions == 1
+    # Single component is used for all channels
+    np.testing.assert_array_equal(
+        parsed.table, [[0.0] * 3, [0.5] * 3, [1.0] * 3]
+    )
+    np.testing.assert_array_equal(parsed.domain_min, [-0.5] * 3)
+    np.testing.assert_array_equal(parsed.domain_max, [1.5] * 3)
+
+
+def test_parse_spi1d_invalid_length():
+    with pytest.raises(RuntimeError, match="Expected 4 values"):
+        lut.parse_spi1d(SPI1D.replace("Length 3", "Length 4"))
+
+
+def test_parse_spi3d():
+    parsed = lut.parse_spi3d(SPI3D)
+
+    assert parsed.dimensions == 3
+    assert parsed.table.shape == (2, 2, 2, 3)
+    np.testing.assert_array_equal(parsed.table[1, 0, 1], [0.5, 0.0, 1.0])
+    np.testing.assert_array_equal(parsed.table[0, 1, 0], [0.0, 0.25, 0.0])
+
+
+def test_parse_spi3d_invalid_header():
+    with pytest.raises(RuntimeError, match="header"):
+        lut.parse_spi3d(SPI3D.replace("SPILUT", "LUT"))
+
+
+def test_parse_cube_3d():
+    parsed = lut.parse_cube(CUBE_3D)
+
+    assert parsed.dimensions == 3
+    # Table is indexed by red, green and blue, red changes fastest in data
+    for red in range(2):
+        for green in range(2):
+            for blue in range(2):
+                np.testing.assert_array_equal(
+                    parsed.table[red, green, blue], [red, green, blue]
+                )
+    np.testing.assert_array_equal(parsed.domain_max, [2.0] * 3)
+
+
+def test_parse_cube_1d():
+    parsed = lut.parse_cube(CUBE_1D)
+
+    assert parsed.dimensions == 1
+    np.testing.assert_array_equal(parsed.table, [[0, 0, 0], [1, 2, 3]])
+    np.testing.assert_array_equal(parsed.domain_max, [4.0] * 3)
+
+
+def test_parse_cube_without_size():
+    with pytest.raises(RuntimeError, match="size"):
+        lut.parse_cube("0 0 0\n1 1 1\n")
+
+
+def test_parse_csp_1d():
+    parsed = lut.parse_csp(CSP_1D)
+
+    assert parsed.dimensions == 1
+    # Identity prelut does not change table
+    np.testing.assert_allclose(
+        parsed.table, [[0.0, 0.0, 0.0], [1.0, 0.5, 0.25]]
+    )
+
+
+def test_parse_csp_invalid_type():
+    with pytest.raises(RuntimeError, match="2D"):
+        lut.parse_csp(CSP_1D.replace("1D", "2D", 1))
+
+
+def _get_cached_tables(cache_dir):
+    return sorted(
+        name for name in os.listdir(cache_dir) if name.endswith(".npy")
+    )
+
+
+def test_load_lut_uses_cache(tmp_path, monkeypatch):
+    lut_path = tmp_path / "test.spi1d"
+    lut_path.write_text(SPI1D)
+    cache_dir = lut.get_lut_cache_dir()
+
+    loaded = lut.load_lut(str(lut_path))
+
+    assert isinstance(loaded.table, np.memmap)
+    assert len(_get_cached_tables(cache_dir)) == 1
+    # Other process loads parsed LUT from cache
+    monkeypatch.setattr(lut, "_luts_cache", {})
+
+    def _parse(content):
+        raise AssertionError("Cached LUT was parsed again")
+
+    monkeypatch.setitem(lut.LUT_PARSERS, ".spi1d", _parse)
+    cached = lut.load_lut(str(lut_path))
+    np.testing.assert_array_equal(cached.table, loaded.table)
+
+
+def test_changed_lut_invalidates_cache(tmp_path):
+    lut_path = tmp_path / "test.spi1d"
+    lut_path.write_text(SPI1D)
+    cache_dir = lut.get_lut_cache_dir()
+    loaded = lut.load_lut(str(lut_path))
+    file_stat = os.stat(lut_path)
+
+    # Same size, content changed, modification time is kept
+    lut_path.write_text(SPI1D.replace("0.5", "0.7"))
+    os.utime(lut_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+    assert lut.load_lut(str(lut_path)) is loaded
+
+    os.utime(lut_path, ns=(
+        file_stat.st_atime_ns, file_stat.st_mtime_ns + 1_000_000_000
+    ))
+    changed = lut.load_lut(str(lut_path))
+
+    np.testing.assert_allclose(changed.table[1], [0.7] * 3)
+    np.testing.assert_allclose(loaded.table[1], [0.5] * 3)
+    # Parsed LUT is cached by checksum of content
+    assert len(_get_cached_tables(cache_dir)) == 2
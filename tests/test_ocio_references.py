@@ -0,0 +1,151 @@
+import io
+import logging
+import zipfile
+
+import pytest
+
+import create_package
+
+log = logging.getLogger("test_ocio_references")
+
+FLOW_CONFIG = """ocio_profile_version: 1
+search_path: "luts:$SHOW/luts"
+colorspaces:
+  - !<ColorSpace>
+    name: linear
+    to_reference: !<GroupTransform>
+      children:
+        - !<FileTransform> {src: first.spi1d,
+            interpolation: linear}
+        - !<FileTransform> {
+            interpolation: linear, src: "second file.spi3d"}
+        - !<FileTransform>
+          src: third.cube
+          interpolation: linear
+looks:
+  - !<Look>
+    name: grade
+    process_space: linear
+    transform: !<FileTransform> {src: grade.cc}
+"""
+
+CONTEXT_CONFIG = """ocio_profile_version: 1
+search_path: luts
+colorspaces:
+  - !<ColorSpace>
+    name: linear
+    from_reference: !<FileTransform> {src: first.spi1d}
+    to_reference: !<FileTransform> {src: $SHOT.cc}
+"""
+
+ABSOLUTE_CONFIG = """ocio_profile_version: 1
+colorspaces:
+  - !<ColorSpace>
+    name: linear
+    to_reference: !<FileTransform> {src: /studio/luts/grade.cc}
+"""
+
+
+def _create_zip(files):
+    stream = io.BytesIO()
+    with zipfile.ZipFile(stream, "w") as zipf:
+        for name, content in files.items():
+            zipf.writestr(name, content)
+    stream.seek(0)
+    return zipfile.ZipFile(stream)
+
+
+def test_multiline_flow_mappings():
+    ocio_zip = _create_zip({
+        "configs/flow/config.ocio": FLOW_CONFIG,
+        "configs/flow/luts/first.spi1d": "",
+        "configs/flow/luts/second file.spi3d": "",
+        "configs/flow/luts/third.cube": "",
+        "configs/flow/luts/grade.cc": "",
+        "configs/flow/luts/unused.spi1d": "",
+    })
+
+    references = create_package.get_ocio_references(ocio_zip, log)
+
+    assert references == {
+        "configs/flow/config.ocio": {
+            "configs/flow/luts/first.spi1d",
+            "configs/flow/luts/second file.spi3d",
+            "configs/flow/luts/third.cube",
+            "configs/flow/luts/grade.cc",
+        },
+    }
+
+
+def _create_shot_zip(content):
+    return _create_zip({
+        "configs/shot/config.ocio": content,
+        "configs/shot/luts/first.spi1d": "",
+        "configs/shot/luts/other.spi1d": "",
+        "configs/other/config.ocio": "ocio_profile_version: 1\n",
+        "configs/other/unused.spi1d": "",
+    })
+
+
+@pytest.mark.parametrize(
+    "content,unresolved",
+    [
+        (CONTEXT_CONFIG, "$SHOT.cc"),
+        (ABSOLUTE_CONFIG, "/studio/luts/grade.cc"),
+        (CONTEXT_CONFIG.replace("$SHOT", "missing"), "missing.cc"),
+    ],
+)
+def test_unresolved_references_fail(content, unresolved):
+    ocio_zip = _create_shot_zip(content)
+
+    with pytest.raises(RuntimeError) as exc_info:
+        create_package.get_ocio_references(ocio_zip, log)
+
+    assert f"configs/shot/config.ocio: {unresolved}" in str(exc_info.value)
+
+
+def test_all_unresolved_references_are_listed():
+    content = CONTEXT_CONFIG.replace(
+        "{src: first.spi1d}", "{src: missing.spi1d}"
+    )
+    ocio_zip = _create_shot_zip(content)
+
+    with pytest.raises(RuntimeError) as exc_info:
+        create_package.get_ocio_references(ocio_zip, log)
+
+    message = str(exc_info.value)
+    assert "configs/shot/config.ocio: $SHOT.cc" in message
+    assert "configs/shot/config.ocio: missing.spi1d" in message
+
+
+@pytest.mark.parametrize("content", [CONTEXT_CONFIG, ABSOLUTE_CONFIG])
+def test_allowed_context_references_keep_config_files(caplog, content):
+    ocio_zip = _create_shot_zip(content)
+
+    with caplog.at_level(logging.WARNING):
+        references = create_package.get_ocio_references(
+            ocio_zip, log, allow_context_references=True
+        )
+
+    assert references["configs/shot/config.ocio"] == {
+        "configs/shot/luts/first.spi1d",
+        "configs/shot/luts/other.spi1d",
+    }
+    assert references["configs/other/config.ocio"] == set()
+    assert "configs/shot/config.ocio" in caplog.text
+
+
+def test_missing_file_fails_with_allowed_context_references():
+    ocio_zip = _create_shot_zip(CONTEXT_CONFIG.replace("$SHOT", "missing"))
+
+    with pytest.raises(RuntimeError, match="missing.cc"):
+        create_package.get_ocio_references(
+            ocio_zip, log, allow_context_references=True
+        )
+
+
+def test_missing_legacy_config():
+    ocio_zip = _create_zip({"configs/flow/config.ocio": FLOW_CONFIG})
+
+    with pytest.raises(RuntimeError, match="missing"):
+        create_package.get_ocio_references(ocio_zip, log, ["missing"])
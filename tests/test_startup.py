@@ -0,0 +1,116 @@
+import sys
+import threading
+import importlib
+import contextlib
+
+import pytest
+
+_opened_paths = []
+_recording = []
+
+
+def _audit_hook(event, args):
+    if _recording and event == "open":
+        _opened_paths.append(str(args[0]))
+
+
+sys.addaudithook(_audit_hook)
+
+
+@contextlib.contextmanager
+def record_opened_files():
+    _opened_paths.clear()
+    _recording.append(True)
+    try:
+        yield _opened_paths
+    finally:
+        _recording.clear()
+
+
+def _remove_addon_modules():
+    for name in list(sys.modules):
+        if name == "ayon_ocio" or name.startswith("ayon_ocio."):
+            sys.modules.pop(name)
+
+
+@pytest.fixture
+def fresh_addon():
+    _remove_addon_modules()
+    yield
+    _remove_addon_modules()
+
+
+def test_import_does_not_load_submodules(fresh_addon):
+    with record_opened_files() as opened:
+        importlib.import_module("ayon_ocio")
+
+    loaded = {
+        name for name in sys.modules if name.startswith("ayon_ocio.")
+    }
+    assert loaded == {"ayon_ocio.version"}
+    # Only python modules of addon are read
+    assert [
+        path for path in opened if not path.endswith((".py", ".pyc"))
+    ] == []
+
+
+def test_environment_resolution_does_not_wait_for_maintenance(
+    fresh_addon, monkeypatch
+):
+    ayon_ocio = importlib.import_module("ayon_ocio")
+    integrity = importlib.import_module("ayon_ocio.integrity")
+    # Prefetched bundles are installed by maintenance
+    monkeypatch.setenv("AYON_OCIO_PREFETCH_BUNDLES", "*")
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def _maintain_config_install():
+        started.set()
+        release.wait(10)
+        return []
+
+    monkeypatch.setattr(
+        integrity, "maintain_config_install", _maintain_config_install
+    )
+
+    addon = ayon_ocio.OCIODistAddon()
+    environments = addon.get_global_environments()
+    assert environments["BUILTIN_OCIO_ROOT"].endswith("OpenColorIOConfigs")
+    # Environment is resolved while maintenance is still running
+    assert started.wait(10)
+    thread = integrity.start_config_maintenance()
+    assert thread.is_alive()
+    release.set()
+    thread.join(10)
+    assert not thread.is_alive()
+
+
+def test_memoized_environment_resolution_without_io(
+    fresh_addon, monkeypatch
+):
+    ayon_ocio = importlib.import_module("ayon_ocio")
+    distribution = importlib.import_module("ayon_ocio.distribution")
+    integrity = importlib.import_module("ayon_ocio.integrity")
+
+    install_calls = []
+    monkeypatch.delenv("AYON_OCIO_PREFETCH_BUNDLES", raising=False)
+    monkeypatch.setattr(
+        distribution,
+        "ensure_config_bundles",
+        lambda *args: install_calls.append(args),
+    )
+
+    addon = ayon_ocio.OCIODistAddon()
+    environments = addon.get_global_environments()
+    with record_opened_files() as opened:
+        for _ in range(10):
+            assert addon.get_global_environments() == environments
+            assert ayon_ocio.get_ocio_config_path() == (
+                environments["BUILTIN_OCIO_ROOT"]
+            )
+
+    assert opened == []
+    # Nothing is installed and intact install does not need maintenance
+    assert install_calls == []
+    assert integrity._maintenance_threads == {}
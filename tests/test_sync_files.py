@@ -0,0 +1,123 @@
+import os
+import logging
+
+import pytest
+
+import create_package
+
+log = logging.getLogger("test_sync_files")
+
+
+@pytest.fixture
+def src_dir(tmp_path):
+    files = {
+        "config.ocio": b"ocio_profile_version: 2\n",
+        "luts/first.spi1d": b"first\n",
+        "luts/second.spi1d": b"second\n",
+    }
+    for name, content in files.items():
+        path = tmp_path / "src" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    return tmp_path / "src"
+
+
+def _get_mapping(src_dir):
+    return [
+        (str(path), str(path.relative_to(src_dir)))
+        for path in sorted(src_dir.rglob("*"))
+        if path.is_file()
+    ]
+
+
+@pytest.fixture
+def copied_paths(monkeypatch):
+    """Destination paths of source files copied by sync."""
+    output = []
+    fast_copy_file = create_package._fast_copy_file
+
+    def _fast_copy_file(src_path, dst_path, use_hardlinks):
+        output.append(os.path.basename(dst_path))
+        fast_copy_file(src_path, dst_path, use_hardlinks)
+
+    monkeypatch.setattr(create_package, "_fast_copy_file", _fast_copy_file)
+    return output
+
+
+def test_sync_copies_only_changed_files(src_dir, tmp_path, copied_paths):
+    output_dir = tmp_path / "output"
+    create_package.sync_files_mapping(
+        _get_mapping(src_dir), str(output_dir), log
+    )
+    assert sorted(copied_paths) == [
+        "config.ocio", "first.spi1d", "second.spi1d"
+    ]
+
+    copied_paths.clear()
+    (src_dir / "luts" / "first.spi1d").write_bytes(b"changed\n")
+    os.remove(src_dir / "luts" / "second.spi1d")
+    create_package.sync_files_mapping(
+        _get_mapping(src_dir), str(output_dir), log
+    )
+
+    assert copied_paths == ["first.spi1d"]
+    assert (output_dir / "luts" / "first.spi1d").read_bytes() == (
+        b"changed\n"
+    )
+    # Stale file is removed
+    assert sorted(
+        str(path.relative_to(output_dir)).replace("\\", "/")
+        for path in output_dir.rglob("*")
+        if path.is_file()
+    ) == ["config.ocio", "luts/first.spi1d"]
+
+
+def test_sync_removes_empty_directories(src_dir, tmp_path):
+    output_dir = tmp_path / "output"
+    create_package.sync_files_mapping(
+        _get_mapping(src_dir), str(output_dir), log
+    )
+
+    create_package.sync_files_mapping(
+        [(str(src_dir / "config.ocio"), "config.ocio")],
+        str(output_dir),
+        log,
+    )
+
+    assert os.listdir(output_dir) == ["config.ocio"]
+
+
+def test_fast_copy_file_hardlink(src_dir, tmp_path):
+    src_path = src_dir / "config.ocio"
+    dst_path = tmp_path / "config.ocio"
+
+    create_package._fast_copy_file(str(src_path), str(dst_path), True)
+
+    assert os.path.samefile(src_path, dst_path)
+    # Temporary link is replaced to destination
+    assert sorted(os.listdir(tmp_path)) == ["config.ocio", "src"]
+
+
+@pytest.mark.parametrize("copy_file_range_fails", [False, True])
+def test_fast_copy_file_fallback(
+    src_dir, tmp_path, monkeypatch, copy_file_range_fails
+):
+    def _fail(*args):
+        raise OSError("Not supported")
+
+    # Hardlinks are not supported by filesystem
+    monkeypatch.setattr(os, "link", _fail)
+    if copy_file_range_fails:
+        monkeypatch.setattr(create_package, "_copy_file_range", _fail)
+    src_path = src_dir / "config.ocio"
+    dst_path = tmp_path / "config.ocio"
+    dst_path.write_bytes(b"previous")
+
+    create_package._fast_copy_file(str(src_path), str(dst_path), True)
+
+    assert not os.path.samefile(src_path, dst_path)
+    assert dst_path.read_bytes() == src_path.read_bytes()
+    assert (
+        os.stat(dst_path).st_mtime_ns == os.stat(src_path).st_mtime_ns
+    )
+    assert not os.path.exists(f"{dst_path}.tmp")
@@ -0,0 +1,269 @@
+"""Accuracy of color transforms against reference values from OCIO.
+
+Reference values are stored in 'data/transforms_reference.json' so tests
+do not require PyOpenColorIO. Run this module as a script with
+PyOpenColorIO installed to create the reference values again.
+"""
+import os
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# Client code is importable also when module is run as script
+import conftest  # noqa: E402
+from ayon_ocio import transforms  # noqa: E402
+
+REFERENCE_PATH = os.path.join(
+    conftest.REPO_ROOT, "tests", "data", "transforms_reference.json"
+)
+# Values outside of LUT domains are included to test clamping
+PIXELS = [
+    [0.0, 0.0, 0.0],
+    [1.0, 1.0, 1.0],
+    [0.18, 0.18, 0.18],
+    [0.5, 0.25, 0.75],
+    [0.9, 0.1, 0.4],
+    [0.33, 0.66, 0.01],
+    [0.05, 0.95, 0.6],
+    [0.72, 0.41, 0.13],
+    [-0.05, 0.5, 1.05],
+    [1.2, -0.1, 0.3],
+    [0.01, 0.02, 0.03],
+    [0.6, 0.6, 0.2],
+]
+MATRIX = [
+    0.6, 0.3, 0.1, 0.0,
+    0.2, 0.7, 0.1, 0.0,
+    0.05, 0.1, 0.85, 0.0,
+    0.0, 0.0, 0.0, 1.0,
+]
+MATRIX_OFFSET = [0.01, 0.02, 0.03, 0.0]
+LOG_PARAMS = {
+    "base": 10.0,
+    "log_side_slope": 0.29,
+    "log_side_offset": 0.6,
+    "lin_side_slope": 1.0,
+    "lin_side_offset": 0.01,
+}
+
+
+def _lut3d_value(red, green, blue):
+    return (
+        red ** 0.8 * 0.9 + blue * 0.05,
+        green ** 1.2 * 0.85 + red * 0.1,
+        blue * 0.7 + green * 0.2 + red * red * 0.05,
+    )
+
+
+def _lut1d_value(value, channel):
+    return [value ** 0.45, value ** 0.6 * 0.9, value * value * 0.8][channel]
+
+
+def write_luts(dirpath):
+    """Write LUT files used by test cases."""
+    size = 9
+    grid = [index / (size - 1) for index in range(size)]
+
+    lines = ["LUT_3D_SIZE 9"]
+    for blue in grid:
+        for green in grid:
+            for red in grid:
+                values = _lut3d_value(red, green, blue)
+                lines.append(" ".join(f"{v:.8f}" for v in values))
+    with open(os.path.join(dirpath, "test.cube"), "w") as stream:
+        stream.write("\n".join(lines) + "\n")
+
+    lines = ["SPILUT 1.0", "3 3", "9 9 9"]
+    for red_idx, red in enumerate(grid):
+        for green_idx, green in enumerate(grid):
+            for blue_idx, blue in enumerate(grid):
+                values = " ".join(
+                    f"{v:.8f}" for v in _lut3d_value(red, green, blue)
+                )
+                lines.append(f"{red_idx} {green_idx} {blue_idx} {values}")
+    with open(os.path.join(dirpath, "test.spi3d"), "w") as stream:
+        stream.write("\n".join(lines) + "\n")
+
+    length = 17
+    lines = [
+        "Version 1",
+        "From -0.125 1.125",
+        f"Length {length}",
+        "Components 3",
+        "{",
+    ]
+    for index in range(length):
+        value = max(-0.125 + 1.25 * index / (length - 1), 0.0)
+        lines.append(
+            " ".join(f"{_lut1d_value(value, c):.8f}" for c in range(3))
+        )
+    lines.append("}")
+    with open(os.path.join(dirpath, "test.spi1d"), "w") as stream:
+        stream.write("\n".join(lines) + "\n")
+
+    # 3D CSP LUT with non-linear prelut shaper
+    lines = ["CSPLUTV100", "3D", ""]
+    for _ in range(3):
+        lines.extend(["3", "0.0 0.25 1.0", "0.0 0.5 1.0"])
+    lines.extend(["", "5 5 5"])
+    csp_grid = [index / 4 for index in range(5)]
+    for blue in csp_grid:
+        for green in csp_grid:
+            for red in csp_grid:
+                lines.append(
+                    " ".join(
+                        f"{v:.8f}" for v in _lut3d_value(red, green, blue)
+                    )
+                )
+    with open(os.path.join(dirpath, "test.csp"), "w") as stream:
+        stream.write("\n".join(lines) + "\n")
+
+
+def create_transforms(dirpath):
+    """Transforms of test cases by name."""
+    def _lut(filename, *args, **kwargs):
+        return transforms.LUTTransform(
+            os.path.join(dirpath, filename), *args, **kwargs
+        )
+
+    matrix = transforms.MatrixTransform(MATRIX, MATRIX_OFFSET)
+    return {
+        "cube_tetrahedral": _lut("test.cube", "tetrahedral"),
+        "cube_trilinear": _lut("test.cube", "trilinear"),
+        "spi3d_tetrahedral": _lut("test.spi3d", "tetrahedral"),
+        "spi3d_trilinear": _lut("test.spi3d", "trilinear"),
+        "csp_trilinear": _lut("test.csp", "linear"),
+        "spi1d": _lut("test.spi1d"),
+        "spi1d_inverse": _lut("test.spi1d", inverse=True),
+        "matrix": matrix,
+        "matrix_inverse": transforms.MatrixTransform(
+            MATRIX, MATRIX_OFFSET, inverse=True
+        ),
+        "log_affine": transforms.LogTransform(**LOG_PARAMS),
+        "log_affine_inverse": transforms.LogTransform(
+            **LOG_PARAMS, inverse=True
+        ),
+        "group": transforms.GroupTransform(
+            [matrix, _lut("test.cube", "tetrahedral")]
+        ),
+        "group_inverse": transforms.GroupTransform(
+            [matrix, transforms.LogTransform(2.0)], inverse=True
+        ),
+    }
+
+
+def create_ocio_transforms(ocio):
+    """Equivalent OCIO transforms of test cases by name."""
+    inverse = ocio.TRANSFORM_DIR_INVERSE
+    tetrahedral = ocio.INTERP_TETRAHEDRAL
+    linear = ocio.INTERP_LINEAR
+
+    def _log_affine(direction=ocio.TRANSFORM_DIR_FORWARD):
+        transform = ocio.LogAffineTransform()
+        transform.setBase(LOG_PARAMS["base"])
+        transform.setLogSideSlopeValue([LOG_PARAMS["log_side_slope"]] * 3)
+        transform.setLogSideOffsetValue([LOG_PARAMS["log_side_offset"]] * 3)
+        transform.setLinSideSlopeValue([LOG_PARAMS["lin_side_slope"]] * 3)
+        transform.setLinSideOffsetValue([LOG_PARAMS["lin_side_offset"]] * 3)
+        transform.setDirection(direction)
+        return transform
+
+    matrix = ocio.MatrixTransform(MATRIX, MATRIX_OFFSET)
+    return {
+        "cube_tetrahedral": ocio.FileTransform(
+            "test.cube", interpolation=tetrahedral
+        ),
+        "cube_trilinear": ocio.FileTransform(
+            "test.cube", interpolation=linear
+        ),
+        "spi3d_tetrahedral": ocio.FileTransform(
+            "test.spi3d", interpolation=tetrahedral
+        ),
+        "spi3d_trilinear": ocio.FileTransform(
+            "test.spi3d", interpolation=linear
+        ),
+        "csp_trilinear": ocio.FileTransform(
+            "test.csp", interpolation=linear
+        ),
+        "spi1d": ocio.FileTransform("test.spi1d", interpolation=linear),
+        "spi1d_inverse": ocio.FileTransform(
+            "test.spi1d", interpolation=linear, direction=inverse
+        ),
+        "matrix": matrix,
+        "matrix_inverse": ocio.MatrixTransform(
+            MATRIX, MATRIX_OFFSET, direction=inverse
+        ),
+        "log_affine": _log_affine(),
+        "log_affine_inverse": _log_affine(inverse),
+        "group": ocio.GroupTransform([
+            matrix,
+            ocio.FileTransform("test.cube", interpolation=tetrahedral),
+        ]),
+        "group_inverse": ocio.GroupTransform(
+            [matrix, ocio.LogTransform(2.0)], direction=inverse
+        ),
+    }
+
+
+def create_references(dirpath):
+    """Apply OCIO transforms of test cases to test pixels."""
+    import PyOpenColorIO as ocio
+
+    write_luts(dirpath)
+    config = ocio.Config.CreateRaw()
+    config.setSearchPath(dirpath)
+    output = {}
+    for name, transform in create_ocio_transforms(ocio).items():
+        processor = config.getProcessor(transform)
+        cpu_processor = processor.getDefaultCPUProcessor()
+        pixels = np.array(PIXELS, dtype=np.float32)
+        cpu_processor.applyRGB(pixels)
+        output[name] = [[float(v) for v in pixel] for pixel in pixels]
+    return output
+
+
+REFERENCES = {}
+if os.path.exists(REFERENCE_PATH):
+    with open(REFERENCE_PATH, "r") as _stream:
+        REFERENCES = json.load(_stream)
+
+
+@pytest.fixture(scope="module")
+def test_transforms(tmp_path_factory):
+    dirpath = str(tmp_path_factory.mktemp("luts"))
+    write_luts(dirpath)
+    return create_transforms(dirpath)
+
+
+@pytest.mark.parametrize("name", sorted(REFERENCES))
+def test_transform_matches_ocio(test_transforms, name):
+    image = np.array(PIXELS, dtype=np.float32).reshape(3, 4, 3)
+    output = transforms.apply_transform(image, test_transforms[name])
+    expected = np.array(REFERENCES[name], dtype=np.float32).reshape(3, 4, 3)
+    np.testing.assert_allclose(output, expected, rtol=1e-5, atol=1e-5)
+
+
+def test_all_transforms_have_references(test_transforms):
+    assert set(test_transforms) == set(REFERENCES)
+
+
+def test_chunked_processing(test_transforms):
+    image = np.array(PIXELS, dtype=np.float32).reshape(3, 4, 3)
+    transform = test_transforms["group"]
+    expected = transforms.apply_transform(image, transform)
+    output = transforms.apply_transform(
+        image, transform, chunk_size=5, max_workers=3
+    )
+    np.testing.assert_array_equal(output, expected)
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        references = create_references(tmp_dir)
+    os.makedirs(os.path.dirname(REFERENCE_PATH), exist_ok=True)
+    with open(REFERENCE_PATH, "w") as stream:
+        json.dump(references, stream, indent=4, sort_keys=True)
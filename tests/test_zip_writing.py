@@ -0,0 +1,174 @@
+import io
+import os
+import logging
+import zipfile
+
+import pytest
+
+import create_package
+
+TEXT_CONTENT = b"ocio_profile_version: 2\n" * 2000
+# Incompressible content, deflated member is bigger than the file
+RANDOM_CONTENT = os.urandom(64 * 1024)
+
+
+@pytest.fixture
+def sources(tmp_path):
+    """Files of each kind of source in files mapping."""
+    files = {
+        "config.ocio": TEXT_CONTENT,
+        "luts/noise.spi3d": RANDOM_CONTENT,
+        "nested.zip": TEXT_CONTENT,
+        "empty.txt": b"",
+    }
+    for name, content in files.items():
+        path = tmp_path / "src" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+    members_path = str(tmp_path / "members.zip")
+    with zipfile.ZipFile(members_path, "w") as zipf:
+        zipf.writestr(
+            "deflated.ocio", TEXT_CONTENT, compress_type=zipfile.ZIP_DEFLATED
+        )
+        zipf.writestr(
+            "stored.spi1d", RANDOM_CONTENT, compress_type=zipfile.ZIP_STORED
+        )
+    return str(tmp_path / "src"), members_path
+
+
+def _get_files_mapping(src_dir, members_path):
+    mapping = [
+        (os.path.join(src_dir, os.path.normpath(name)), f"configs/{name}")
+        for name in (
+            "config.ocio", "luts/noise.spi3d", "nested.zip", "empty.txt"
+        )
+    ]
+    with zipfile.ZipFile(members_path) as zipf:
+        infos = zipf.infolist()
+    mapping.extend(
+        (create_package.ZipMember(members_path, info), info.filename)
+        for info in infos
+    )
+    mapping.append((io.BytesIO(TEXT_CONTENT), "stream.ocio"))
+    return mapping
+
+
+def _write(sources, jobs):
+    # Stored members of other zip files are copied without recompression
+    policy = create_package.CompressionPolicy([
+        ("*.zip", "store", None),
+        ("*.spi1d", "store", None),
+    ])
+    stream = io.BytesIO()
+    with create_package.DeterministicZipFile(
+        stream, "w", zipfile.ZIP_DEFLATED
+    ) as zipf:
+        create_package.write_files_mapping(
+            zipf, _get_files_mapping(*sources), jobs, policy
+        )
+    return stream.getvalue()
+
+
+def test_parallel_compression_is_byte_identical(sources):
+    expected = _write(sources, 1)
+
+    assert _write(sources, 3) == expected
+
+    with zipfile.ZipFile(io.BytesIO(expected)) as zipf:
+        assert zipf.testzip() is None
+        infos = {info.filename: info for info in zipf.infolist()}
+    # Nested archives are stored, raw members keep their compression
+    assert infos["configs/nested.zip"].compress_type == zipfile.ZIP_STORED
+    assert infos["stored.spi1d"].compress_type == zipfile.ZIP_STORED
+    assert infos["deflated.ocio"].compress_type == zipfile.ZIP_DEFLATED
+    noise_info = infos["configs/luts/noise.spi3d"]
+    assert noise_info.compress_size > noise_info.file_size
+
+
+@pytest.mark.parametrize(
+    "compress_type", [zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2]
+)
+def test_write_zip_member_copies_raw_data(tmp_path, compress_type):
+    src_path = str(tmp_path / "src.zip")
+    with zipfile.ZipFile(src_path, "w", compress_type) as zipf:
+        zipf.writestr("configs/config.ocio", TEXT_CONTENT)
+    with zipfile.ZipFile(src_path) as zipf:
+        src_info = zipf.getinfo("configs/config.ocio")
+    member = create_package.ZipMember(src_path, src_info)
+    src_raw = b"".join(member.iter_raw_chunks())
+
+    dst_path = str(tmp_path / "dst.zip")
+    with create_package.ZipFileLongPaths(dst_path, "w") as zipf:
+        zipf.write_zip_member(member, "renamed/config.ocio")
+
+    with zipfile.ZipFile(dst_path) as zipf:
+        assert zipf.testzip() is None
+        info = zipf.getinfo("renamed/config.ocio")
+        assert zipf.read(info) == TEXT_CONTENT
+    dst_member = create_package.ZipMember(dst_path, info)
+    assert info.CRC == src_info.CRC
+    assert info.compress_type == compress_type
+    assert info.compress_size == src_info.compress_size
+    # Compressed data are copied, not compressed again
+    assert b"".join(dst_member.iter_raw_chunks()) == src_raw
+
+
+def test_compression_policy_routing():
+    policy = create_package.CompressionPolicy([
+        ("*.zip", "store", None),
+        ("configs/*.ocio", "lzma", None),
+        ("*.ocio", "deflate", 9),
+    ])
+
+    assert policy.get_compression("nested.zip") == (
+        "*.zip", zipfile.ZIP_STORED, None
+    )
+    # First matching rule is used, Windows separators are normalized
+    assert policy.get_compression("configs\\config.ocio") == (
+        "configs/*.ocio", zipfile.ZIP_LZMA, None
+    )
+    assert policy.get_compression("other/config.ocio") == (
+        "*.ocio", zipfile.ZIP_DEFLATED, 9
+    )
+    assert policy.get_compression("luts/lut.spi3d") == ("*", None, None)
+
+
+def test_compression_policy_invalid_method():
+    with pytest.raises(ValueError, match="zstd"):
+        create_package.CompressionPolicy([("*.ocio", "zstd", None)])
+
+
+def test_compression_report_totals(sources, caplog):
+    # Files of source directory
+    files_mapping = _get_files_mapping(*sources)[:4]
+    policy = create_package.CompressionPolicy([
+        ("*.zip", "store", None),
+        ("*.ocio", "deflate", 9),
+    ])
+    stream = io.BytesIO()
+    with create_package.DeterministicZipFile(
+        stream, "w", zipfile.ZIP_DEFLATED
+    ) as zipf:
+        report = create_package.write_files_mapping(
+            zipf, files_mapping, 1, policy
+        )
+        infos = list(zipf.infolist())
+
+    expected = {}
+    for info in infos:
+        pattern = policy.get_compression(info.filename)[0]
+        stats = expected.setdefault(pattern, [0, 0, 0])
+        stats[0] += 1
+        stats[1] += info.file_size
+        stats[2] += info.compress_size
+    assert {
+        pattern: stats[:3] for pattern, stats in report._stats.items()
+    } == expected
+    assert expected["*.ocio"][0] == 1
+    assert expected["*"][0] == 2
+
+    with caplog.at_level(logging.INFO):
+        report.log(logging.getLogger("test_zip_writing"), "Client")
+    assert "Client compression report" in caplog.text
+    assert "*.zip" in caplog.text